@@ -0,0 +1,131 @@
+# Pre-aggregated prediction analytics for the admin reports.
+#
+# Two rollup tables are updated in the same transaction as every saved prediction, so the admin
+# charts read a few thousand pre-counted rows instead of parsing the input_data of every row in
+# user_predictions:
+#   rollup_role_daily      predictions per UTC day, user cohort (month the user registered) and role
+#   rollup_feature_daily   predictions per UTC day, feature and encoded answer
+# When the tables are first created they are backfilled from user_predictions.
+
+import sqlite3
+from collections import Counter
+
+from features import FEATURES
+from history import decode_inputs
+
+DB_PATH = 'career_predictor.db'
+UNKNOWN_COHORT = 'unknown'
+
+ROLE_UPSERT = '''
+    INSERT INTO rollup_role_daily (day, cohort, role, predictions) VALUES (?, ?, ?, ?)
+    ON CONFLICT (day, cohort, role) DO UPDATE SET predictions = predictions + excluded.predictions
+'''
+FEATURE_UPSERT = '''
+    INSERT INTO rollup_feature_daily (day, feature, value, predictions) VALUES (?, ?, ?, ?)
+    ON CONFLICT (day, feature, value) DO UPDATE SET predictions = predictions + excluded.predictions
+'''
+
+def init_analytics_tables(db_path=DB_PATH):
+    """Create the rollup tables, backfilling them from user_predictions when they are new"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_role_daily'").fetchone()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS rollup_role_daily (
+        day TEXT NOT NULL,
+        cohort TEXT NOT NULL,
+        role TEXT NOT NULL,
+        predictions INTEGER NOT NULL,
+        PRIMARY KEY (day, cohort, role)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS rollup_feature_daily (
+        day TEXT NOT NULL,
+        feature TEXT NOT NULL,
+        value INTEGER NOT NULL,
+        predictions INTEGER NOT NULL,
+        PRIMARY KEY (day, feature, value)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_rollup_feature_daily_feature '
+                   'ON rollup_feature_daily (feature, day)')
+    if not exists:
+        rebuild_rollups(cursor)
+
+    conn.commit()
+    conn.close()
+
+def user_cohort(cursor, user_id):
+    """The month the user registered ('YYYY-MM')"""
+    row = cursor.execute("SELECT strftime('%Y-%m', created_at) FROM users WHERE id = ?", (user_id,)).fetchone()
+    return row[0] if row and row[0] else UNKNOWN_COHORT
+
+def record_prediction_rollups(cursor, user_id, role, input_data, created_at):
+    """Count one new prediction in the rollups; call inside the transaction that inserts it"""
+    day = str(created_at)[:10]
+    cursor.execute(ROLE_UPSERT, (day, user_cohort(cursor, user_id), role, 1))
+    cursor.executemany(FEATURE_UPSERT, [(day, field, int(value), 1)
+                                        for field, value in decode_inputs(input_data).items()])
+
+def rebuild_rollups(cursor):
+    """Recount both rollups from the full prediction history"""
+    cursor.execute('DELETE FROM rollup_role_daily')
+    cursor.execute('DELETE FROM rollup_feature_daily')
+    roles = Counter()
+    answers = Counter()
+    history = cursor.connection.execute('''
+        SELECT substr(p.created_at, 1, 10), COALESCE(strftime('%Y-%m', u.created_at), ?), p.prediction_result,
+               p.input_data
+        FROM user_predictions p LEFT JOIN users u ON u.id = p.user_id
+    ''', (UNKNOWN_COHORT,))
+    for day, cohort, role, input_data in history:
+        roles[day, cohort, role] += 1
+        for field, value in decode_inputs(input_data).items():
+            answers[day, field, int(value)] += 1
+    cursor.executemany(ROLE_UPSERT, [key + (count,) for key, count in roles.items()])
+    cursor.executemany(FEATURE_UPSERT, [key + (count,) for key, count in answers.items()])
+
+def roles_by_day(conn, since):
+    """Predictions per day and role from `since` (YYYY-MM-DD), as a day x role DataFrame"""
+    import pandas as pd
+    df = pd.read_sql_query('''
+        SELECT day, role, SUM(predictions) AS predictions FROM rollup_role_daily
+        WHERE day >= ? GROUP BY day, role
+    ''', conn, params=(since,))
+    if df.empty:
+        return df
+    return df.pivot(index='day', columns='role', values='predictions').fillna(0).astype(int)
+
+def roles_by_cohort(conn, since):
+    """Share of each role among the predictions of each registration cohort, as a cohort x role DataFrame"""
+    import pandas as pd
+    df = pd.read_sql_query('''
+        SELECT cohort, role, SUM(predictions) AS predictions FROM rollup_role_daily
+        WHERE day >= ? GROUP BY cohort, role
+    ''', conn, params=(since,))
+    if df.empty:
+        return df
+    counts = df.pivot(index='cohort', columns='role', values='predictions').fillna(0)
+    return counts.div(counts.sum(axis=1), axis=0).round(3)
+
+def feature_by_day(conn, field, since):
+    """Daily answers to one feature: the mean for numbers and flags, the share of each answer for categories"""
+    import pandas as pd
+    from sensitivity import value_label
+    df = pd.read_sql_query('''
+        SELECT day, value, predictions FROM rollup_feature_daily
+        WHERE feature = ? AND day >= ?
+    ''', conn, params=(field, since))
+    if df.empty:
+        return df
+    _, _, encoding, allowed = next(f for f in FEATURES if f[0] == field)
+    if encoding != 'category':
+        df['total'] = df['value'] * df['predictions']
+        daily = df.groupby('day')[['total', 'predictions']].sum()
+        return (daily['total'] / daily['predictions']).round(3).to_frame('mean')
+    df['answer'] = [value_label(encoding, allowed, value) for value in df['value']]
+    counts = df.pivot_table(index='day', columns='answer', values='predictions', aggfunc='sum').fillna(0)
+    return counts.div(counts.sum(axis=1), axis=0).round(3)
@@ -0,0 +1,128 @@
+# Admin analytics read from the rollup tables versus computed from raw prediction history.
+#
+# Fills a temporary database with users in 12 registration cohorts and --rows predictions over
+# two years, counted into the rollups by the same write-path function the app uses. Then times:
+#   - the write path: one prediction insert with and without the rollup upserts
+#   - the three admin queries (roles per day, roles by cohort, one answer's trend) from the rollups
+#   - the same results computed from user_predictions, parsing input_data row by row
+#
+#   python benchmarks/bench_analytics.py --rows 200000
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import datetime
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from features import encode_features, to_frame
+from analytics import init_analytics_tables, record_prediction_rollups, roles_by_day, roles_by_cohort, feature_by_day
+from history import decode_inputs
+from load_test import random_profile
+
+ROLES = ["Software Developer", "Web Developer", "UX Designer", "Database Developer", "Technical Support",
+         "Network Security Engineer"]
+INSERT = 'INSERT INTO user_predictions (user_id, prediction_result, input_data, created_at) VALUES (?, ?, ?, ?)'
+
+def create(db_path, users):
+    conn = sqlite3.connect(db_path)
+    conn.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, created_at TIMESTAMP)')
+    conn.execute('''CREATE TABLE user_predictions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+                    prediction_result TEXT, input_data TEXT, created_at TIMESTAMP)''')
+    conn.executemany('INSERT INTO users (id, created_at) VALUES (?, ?)',
+                     [(i, f"2024-{1 + i % 12:02d}-01 00:00:00") for i in range(1, users + 1)])
+    conn.commit()
+    conn.close()
+    init_analytics_tables(db_path)
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def raw_reports(conn, since, field):
+    """The admin reports computed from user_predictions directly"""
+    from collections import Counter
+    by_day, by_cohort, answers = Counter(), Counter(), Counter()
+    rows = conn.execute('''
+        SELECT substr(p.created_at, 1, 10), strftime('%Y-%m', u.created_at), p.prediction_result, p.input_data
+        FROM user_predictions p LEFT JOIN users u ON u.id = p.user_id WHERE p.created_at >= ?
+    ''', (since,))
+    for day, cohort, role, input_data in rows:
+        by_day[day, role] += 1
+        by_cohort[cohort, role] += 1
+        answers[day, decode_inputs(input_data).get(field)] += 1
+    return by_day, by_cohort, answers
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--days", type=int, default=365, help="report window")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # Answers in the exact format save_prediction stores
+    profiles = [to_frame([encode_features(random_profile(rng))]).to_dict() for _ in range(500)]
+    start = datetime.datetime(2024, 1, 1)
+    step = datetime.timedelta(days=730) / args.rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "analytics.db")
+        create(db_path, args.users)
+        conn = sqlite3.connect(db_path)
+
+        started = time.perf_counter()
+        cursor = conn.cursor()
+        for i in range(args.rows):
+            user_id = rng.randint(1, args.users)
+            role = rng.choice(ROLES)
+            input_data = profiles[i % len(profiles)]
+            created_at = (start + step * i).strftime('%Y-%m-%d %H:%M:%S')
+            cursor.execute(INSERT, (user_id, role, str(input_data), created_at))
+            record_prediction_rollups(cursor, user_id, role, input_data, created_at)
+            if i % 1000 == 999:
+                conn.commit()
+        conn.commit()
+        print(f"{args.rows:,} predictions with rollups in {time.perf_counter() - started:.0f}s; rollup rows: "
+              f"{conn.execute('SELECT COUNT(*) FROM rollup_role_daily').fetchone()[0]:,} role, "
+              f"{conn.execute('SELECT COUNT(*) FROM rollup_feature_daily').fetchone()[0]:,} answer")
+
+        now = (start + step * args.rows).strftime('%Y-%m-%d %H:%M:%S')
+        input_data = profiles[0]
+
+        def save(with_rollups):
+            cursor.execute(INSERT, (1, ROLES[0], str(input_data), now))
+            if with_rollups:
+                record_prediction_rollups(cursor, 1, ROLES[0], input_data, now)
+            conn.commit()
+
+        print(f"save one prediction: {median_ms(lambda: save(False), 200):.3f} ms without rollups, "
+              f"{median_ms(lambda: save(True), 200):.3f} ms with")
+
+        since = (start + step * args.rows - datetime.timedelta(days=args.days)).strftime('%Y-%m-%d')
+        field = 'coding_skills_rating'
+
+        def rollup_reports():
+            roles_by_day(conn, since)
+            roles_by_cohort(conn, since)
+            feature_by_day(conn, field, since)
+
+        rollup_ms = median_ms(rollup_reports, 10)
+        raw_ms = median_ms(lambda: raw_reports(conn, since, field), 1)
+        print(f"admin reports over the last {args.days} days: {rollup_ms:.1f} ms from rollups, "
+              f"{raw_ms:,.0f} ms from raw history ({raw_ms / rollup_ms:,.0f}x)")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Single-row predictions from concurrent callers: one model call per caller vs the batching scheduler.
+#
+# Each caller thread repeatedly predicts one random profile, the way a Streamlit session or a
+# service request thread does. Reports throughput, latency percentiles and the batch sizes the
+# scheduler formed at each concurrency level.
+#
+#   python benchmarks/bench_batching.py --concurrency 1 8 32 --requests 300
+
+import sys
+import time
+import random
+import argparse
+import threading
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from features import encode_features, to_frame
+from inference import BatchScheduler
+from load_test import random_profile
+
+def run(predict_one, concurrency, requests, rows):
+    latencies = []
+    lock = threading.Lock()
+
+    def caller(offset):
+        local = []
+        for i in range(requests):
+            row = rows[(offset + i) % len(rows)]
+            started = time.perf_counter()
+            predict_one(row)
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=caller, args=(n * 17,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=300, help="predictions per caller")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    import joblib
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = joblib.load(ROOT / "job_role_model.pkl")
+    rng = random.Random(0)
+    rows = [encode_features(random_profile(rng)) for _ in range(500)]
+
+    print(f"{'callers':>8} {'mode':<10}{'pred/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'mean batch':>12}")
+    for concurrency in args.concurrency:
+        direct = run(lambda row: model.predict(to_frame([row])), concurrency, args.requests, rows)
+        print(f"{concurrency:>8} {'direct':<10}{direct['throughput']:>10,.0f}{direct['p50_ms']:>10.2f}{direct['p95_ms']:>10.2f}{1:>12}")
+
+        scheduler = BatchScheduler(model, args.max_wait_ms, args.max_batch_size)
+        batched = run(lambda row: scheduler.predict([row]), concurrency, args.requests, rows)
+        mean_batch = scheduler.stats()['mean_batch_rows']
+        print(f"{concurrency:>8} {'batched':<10}{batched['throughput']:>10,.0f}{batched['p50_ms']:>10.2f}{batched['p95_ms']:>10.2f}{mean_batch:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Loading the training data from the CSV versus the columnar cache in dataset.py.
+#
+# For each scale, writes the training CSV repeated that many times to a temporary directory, then
+# times in fresh child processes, after their imports (median of --repeat runs):
+#   - csv     pd.read_csv + features.encode_training_frame, what load_training_data did before
+#   - build   the first dataset.load_encoded, which hashes the file and writes the cache
+#   - cached  a later dataset.load_encoded, which memory-maps the cache
+#   - frame   a later dataset.load_frame, the raw columns as typed category / integer columns
+#
+#   python benchmarks/bench_dataset.py --scales 1 10 100
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = '''
+import sys, time, json
+import pandas as pd
+from features import encode_training_frame
+from dataset import load_encoded, load_frame
+mode, path, cache = sys.argv[1:]
+started = time.perf_counter()
+if mode == "csv":
+    X, y = encode_training_frame(pd.read_csv(path))
+elif mode == "frame":
+    X = load_frame(path, cache)
+else:
+    X, y = load_encoded(path, cache)
+print(json.dumps({"ms": (time.perf_counter() - started) * 1000, "rows": len(X)}))
+'''
+
+def run(mode, path, cache):
+    output = subprocess.run([sys.executable, "-c", CHILD, mode, path, cache], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    source = (ROOT / "data" / "mldata.csv").read_text(encoding="utf-8")
+    header, body = source.split("\n", 1)
+    body = body.rstrip("\n") + "\n"
+    print(f"{'rows':>10}{'CSV MB':>8}{'csv ms':>9}{'build ms':>10}{'cached ms':>11}{'frame ms':>10}{'speedup':>9}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mldata.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(header + "\n" + body * scale)
+            cache = os.path.join(tmp, "cache")
+            median = lambda mode: sorted(run(mode, path, cache)["ms"] for _ in range(args.repeat))[args.repeat // 2]
+            csv_ms = median("csv")
+            build = run("cached", path, cache)
+            cached_ms, frame_ms = median("cached"), median("frame")
+            print(f"{build['rows']:>10,}{os.path.getsize(path) / 1e6:>8.1f}{csv_ms:>9.0f}{build['ms']:>10.0f}"
+                  f"{cached_ms:>11.0f}{frame_ms:>10.0f}{csv_ms / cached_ms:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
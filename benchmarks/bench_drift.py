@@ -0,0 +1,67 @@
+# Cost of the input drift monitor (drift.py) on the prediction path.
+#
+# First times DriftMonitor.observe() alone for batches of 1, 8 and 64 rows, and one flush of a full
+# set of histograms to a temporary database. Then runs the bench_batching.py callers against the
+# batching scheduler without and with a monitor attached; throughput and latency should not move,
+# since the scheduler counts the rows only after it has answered the callers.
+#
+#   python benchmarks/bench_drift.py --concurrency 1 8 32 --requests 300
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from features import encode_features
+from inference import BatchScheduler
+from drift import DriftMonitor
+from load_test import random_profile
+from bench_batching import run
+
+def time_observe(monitor, rows, batch, repeats=20000):
+    batches = [rows[i:i + batch] for i in range(0, len(rows) - batch + 1, batch)]
+    started = time.perf_counter()
+    for i in range(repeats):
+        monitor.observe(batches[i % len(batches)])
+    return (time.perf_counter() - started) / repeats * 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=300, help="predictions per caller")
+    args = parser.parse_args()
+
+    import joblib
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = joblib.load(ROOT / "job_role_model.pkl")
+    rng = random.Random(0)
+    rows = [encode_features(random_profile(rng)) for _ in range(500)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Flushed by hand below, never by the background thread
+        monitor = DriftMonitor(os.path.join(tmp, "drift.db"), flush_seconds=3600)
+        for batch in (1, 8, 64):
+            print(f"observe() {batch:>3} rows: {time_observe(monitor, rows, batch):6.1f} us")
+        started = time.perf_counter()
+        monitor.flush()
+        print(f"flush() of {monitor.observed:,} rows: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        print(f"\n{'callers':>8} {'monitor':<9}{'pred/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for concurrency in args.concurrency:
+            for attached in (None, monitor):
+                scheduler = BatchScheduler(model, monitor=attached)
+                result = run(lambda row: scheduler.predict([row]), concurrency, args.requests, rows)
+                mode = "on" if attached else "off"
+                print(f"{concurrency:>8} {mode:<9}{result['throughput']:>10,.0f}{result['p50_ms']:>10.2f}"
+                      f"{result['p95_ms']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
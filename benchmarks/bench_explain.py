@@ -0,0 +1,55 @@
+# Cost of a decision-path explanation per prediction.
+#
+# Compares the leaf-cached TreeExplainer (first visit to a leaf and repeat visits) with calling
+# scikit-learn's decision_path on a one-row DataFrame, over random valid profiles.
+#
+#   python benchmarks/bench_explain.py --rows 2000
+
+import sys
+import time
+import random
+import argparse
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from features import encode_features, to_frame
+from explain import TreeExplainer
+from load_test import random_profile
+
+def per_row_us(fn, rows):
+    started = time.perf_counter()
+    for row in rows:
+        fn(row)
+    return (time.perf_counter() - started) * 1e6 / len(rows)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--model", default=str(ROOT / "job_role_model.pkl"))
+    args = parser.parse_args()
+
+    import joblib
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = joblib.load(args.model)
+    rng = random.Random(0)
+    rows = [encode_features(random_profile(rng)) for _ in range(args.rows)]
+
+    explainer = TreeExplainer(model)
+    first = per_row_us(explainer.explain, rows)
+    leaves = len(explainer._cache)
+    repeat = per_row_us(explainer.explain, rows)
+    walk = per_row_us(explainer.leaf, rows)
+    sklearn_path = per_row_us(lambda row: model.decision_path(to_frame([row])), rows[:300])
+
+    print(f"{args.rows} profiles reached {leaves} distinct leaves")
+    print(f"{'tree walk only':<34}{walk:>9.1f} us/prediction")
+    print(f"{'explain, first pass (builds leaves)':<34}{first:>9.1f} us/prediction")
+    print(f"{'explain, leaf cache warm':<34}{repeat:>9.1f} us/prediction")
+    print(f"{'sklearn decision_path, one row':<34}{sklearn_path:>9.1f} us/prediction")
+
+if __name__ == "__main__":
+    main()
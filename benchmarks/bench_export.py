@@ -0,0 +1,70 @@
+# Peak memory and throughput of export.py as the prediction table grows.
+#
+# For each size, fills a temporary database with that many predictions (answers in the format
+# save_prediction stores), runs export.py in a child process and reports its wall time and peak RSS.
+# With streaming, peak RSS should stay the same from the smallest to the largest table.
+#
+#   python benchmarks/bench_export.py --rows 50000 500000 --format csv parquet
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from features import encode_features, to_frame
+from load_test import random_profile
+
+def fill(db_path, rows):
+    rng = random.Random(0)
+    profiles = [str(to_frame([encode_features(random_profile(rng))]).to_dict()) for _ in range(500)]
+    conn = sqlite3.connect(db_path)
+    conn.execute('''CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT, email TEXT,
+                    password_hash TEXT, created_at TIMESTAMP, full_name TEXT)''')
+    conn.execute('''CREATE TABLE user_predictions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+                    prediction_result TEXT, input_data TEXT, created_at TIMESTAMP)''')
+    users = max(1, rows // 100)
+    conn.executemany('INSERT INTO users (username, email, password_hash, created_at, full_name) VALUES (?, ?, ?, ?, ?)',
+                     ((f"user{i}", f"user{i}@example.com", "x" * 64, "2025-01-01 00:00:00", f"User {i}")
+                      for i in range(users)))
+    conn.executemany('INSERT INTO user_predictions (user_id, prediction_result, input_data, created_at) VALUES (?, ?, ?, ?)',
+                     ((1 + i % users, "Software Developer", profiles[i % len(profiles)],
+                       f"2025-{1 + i % 12:02d}-{1 + i % 28:02d} 12:00:00") for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 500_000])
+    parser.add_argument("--format", nargs="+", default=["csv", "parquet"])
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'db MB':>8}{'export s':>10}{'rows/s':>10}{'peak RSS MB':>13}{'output MB':>11}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "history.db")
+            out_dir = os.path.join(tmp, "exports")
+            fill(db_path, rows)
+            started = time.perf_counter()
+            child = subprocess.Popen([sys.executable, str(ROOT / "export.py"), "--db", db_path, "--out", out_dir,
+                                      "--chunk-rows", str(args.chunk_rows), "--format", *args.format],
+                                     cwd=ROOT, stdout=subprocess.DEVNULL)
+            # wait4 returns the resource usage of this child alone (ru_maxrss in KB on Linux)
+            _, status, usage = os.wait4(child.pid, 0)
+            elapsed = time.perf_counter() - started
+            if status:
+                raise SystemExit(f"export.py failed with status {status}")
+            output = sum(f.stat().st_size for f in Path(out_dir).rglob("part-*"))
+            print(f"{rows:>10,}{os.path.getsize(db_path) / 1e6:>8.0f}{elapsed:>10.1f}{rows / elapsed:>10,.0f}"
+                  f"{usage.ru_maxrss / 1024:>13.0f}{output / 1e6:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Per-page latency of the prediction history at 1M predictions for one user.
+#
+# Fills a temporary database with --rows predictions for one user (plus other users' rows
+# interleaved, and answers as long as the real ones), then times loading one page at increasing
+# depths with history.fetch_page (keyset on created_at, id) and with LIMIT/OFFSET for comparison.
+#
+#   python benchmarks/bench_history.py --rows 1000000
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import datetime
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from history import PAGE_SIZE, init_history_index, fetch_page
+
+USER_ID = 1
+OFFSET_SQL = '''
+    SELECT id, prediction_result, created_at FROM user_predictions
+    WHERE user_id = ?
+    ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?
+'''
+
+def fill(db_path, rows, other_users):
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+    CREATE TABLE user_predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        prediction_result TEXT,
+        input_data TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    answers = "{" + ", ".join(f"'question {i}': {{0: {i % 10}}}" for i in range(21)) + "}"
+    answers += " " * max(0, 690 - len(answers))
+    roles = ["Software Developer", "Web Developer", "UX Designer", "Database Developer"]
+    start = datetime.datetime(2020, 1, 1)
+
+    def records():
+        for i in range(rows):
+            # A few predictions share a timestamp, so the id tie-break matters
+            created_at = (start + datetime.timedelta(seconds=i // 3 * 60)).strftime('%Y-%m-%d %H:%M:%S')
+            yield USER_ID, roles[i % len(roles)], answers, created_at
+            for other in range(other_users):
+                yield 2 + other, roles[i % len(roles)], answers, created_at
+
+    conn.executemany('INSERT INTO user_predictions (user_id, prediction_result, input_data, created_at) '
+                     'VALUES (?, ?, ?, ?)', records())
+    conn.commit()
+    conn.close()
+    init_history_index(db_path)
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000, help="predictions of the benchmarked user")
+    parser.add_argument("--other-users", type=int, default=1, help="users whose rows are interleaved")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "history.db")
+        started = time.perf_counter()
+        fill(db_path, args.rows, args.other_users)
+        size = os.path.getsize(db_path)
+        print(f"{args.rows:,} predictions for user {USER_ID} ({size / 1e6:,.0f} MB) in {time.perf_counter() - started:.0f}s")
+
+        conn = sqlite3.connect(db_path)
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT id, prediction_result, created_at FROM user_predictions "
+                            "WHERE user_id = ? AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT ?",
+                            (USER_ID, '2030-01-01', 0, PAGE_SIZE)).fetchall()
+        print("keyset plan:", "; ".join(row[-1] for row in plan))
+
+        print(f"{'depth (rows)':>14}{'keyset ms':>11}{'offset ms':>11}")
+        depths = [d for d in (0, 1_000, 10_000, 100_000, 500_000, args.rows - PAGE_SIZE) if 0 <= d < args.rows]
+        for depth in depths:
+            # The cursor a user would hold after paging down to this depth
+            after = None
+            if depth:
+                row = conn.execute(OFFSET_SQL, (USER_ID, 1, depth - 1)).fetchone()
+                after = (row[2], row[0])
+            keyset = median_ms(lambda: fetch_page(conn, USER_ID, after), args.repeat)
+            offset = median_ms(lambda: conn.execute(OFFSET_SQL, (USER_ID, PAGE_SIZE, depth)).fetchall(),
+                               max(3, args.repeat // 5))
+            rows, _ = fetch_page(conn, USER_ID, after)
+            assert rows == conn.execute(OFFSET_SQL, (USER_ID, PAGE_SIZE, depth)).fetchall()
+            print(f"{depth:>14,}{keyset:>11.3f}{offset:>11.2f}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
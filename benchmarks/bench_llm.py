@@ -0,0 +1,70 @@
+# Offline benchmark of the career content generation path.
+#
+# Runs the nine generations of one prediction (3 related careers x roadmap/projects/resources)
+# through an offline transport and reports sequential, concurrent, cached and streaming timings.
+#
+#   CAREERPATH_LLM_SYNTHETIC_TTFT=0.4 CAREERPATH_LLM_SYNTHETIC_TPS=200 python benchmarks/bench_llm.py --mode synthetic
+#   CAREERPATH_LLM_REPLAY_LATENCY=1 python benchmarks/bench_llm.py --mode replay --fixtures llm_fixtures
+
+import sys
+import time
+import argparse
+import functools
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prompts import SECTIONS, build_request
+from llm_transport import build_client
+
+DEFAULT_ROLES = ["Full Stack Developer", "Frontend Developer", "Backend Developer"]
+
+def generate(client, section, job_role):
+    """One blocking generation, as done by the get_* functions in ui.py"""
+    response = client.chat.completions.create(**build_request(section, job_role))
+    return response.choices[0].message.content
+
+def first_token_latency(client, section, job_role):
+    """Time to first token and total time of one streamed generation"""
+    started = time.perf_counter()
+    ttft = None
+    for chunk in client.chat.completions.create(stream=True, **build_request(section, job_role)):
+        if ttft is None and chunk.choices and chunk.choices[0].delta.content:
+            ttft = time.perf_counter() - started
+    return ttft or 0.0, time.perf_counter() - started
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {(time.perf_counter() - started) * 1000:10.1f} ms")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=["replay", "synthetic"], default="synthetic")
+    parser.add_argument("--fixtures", default=None, help="fixture directory for replay mode")
+    parser.add_argument("--roles", nargs="+", default=DEFAULT_ROLES)
+    parser.add_argument("--workers", type=int, default=9)
+    args = parser.parse_args()
+
+    client = build_client(mode=args.mode, fixture_dir=args.fixtures)
+    jobs = [(section, role) for role in args.roles for section in SECTIONS]
+    print(f"{len(jobs)} generations via {args.mode} transport")
+
+    timed("sequential", lambda: [generate(client, s, r) for s, r in jobs])
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        timed(f"concurrent ({args.workers} workers)", lambda: list(pool.map(lambda job: generate(client, *job), jobs)))
+
+    # st.cache_data keys on the function arguments; an LRU cache shows the same hit/miss split
+    cached = functools.lru_cache(maxsize=None)(lambda s, r: generate(client, s, r))
+    timed("cache cold", lambda: [cached(s, r) for s, r in jobs])
+    timed("cache warm", lambda: [cached(s, r) for s, r in jobs])
+
+    ttfts = [first_token_latency(client, s, r) for s, r in jobs]
+    print(f"{'stream first token (mean)':<28} {sum(t for t, _ in ttfts) / len(ttfts) * 1000:10.1f} ms")
+    print(f"{'stream total (mean)':<28} {sum(t for _, t in ttfts) / len(ttfts) * 1000:10.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Latency and recall of the profiles-like-you index at the shipped size and at larger scales.
+#
+# Builds the index from data/mldata.csv and from datasets --scale times larger (each answer column
+# resampled independently from the real one, the hardest case for the blocks since no profiles
+# cluster), saves each to a temporary file and memory-maps it back the way the app does. Reports
+# build time, artifact size, load time, query latency, candidates ranked per query and recall
+# against a full scan.
+#
+#   python benchmarks/bench_neighbors.py --scale 1 10 100 --queries 500
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import joblib
+
+from features import encode_features, load_training_data
+from neighbors import NeighborIndex, build_index
+from load_test import random_profile
+
+def scaled(codes, roles, scale, rng):
+    if scale == 1:
+        return codes, roles
+    size = len(codes) * scale
+    columns = [codes[rng.integers(0, len(codes), size), i] for i in range(codes.shape[1])]
+    return np.stack(columns, axis=1), roles[rng.integers(0, len(roles), size)]
+
+def run(codes, roles, classes, queries, k):
+    started = time.perf_counter()
+    index = build_index(codes, roles, classes)
+    build_s = time.perf_counter() - started
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "neighbors_index.joblib")
+        joblib.dump(index, path)
+        size = os.path.getsize(path)
+        started = time.perf_counter()
+        loaded = NeighborIndex.load(path)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        samples = []
+        candidates = []
+        exact = 0
+        for row in queries:
+            started = time.perf_counter()
+            _, _, is_exact = loaded.nearest(row, k)
+            samples.append((time.perf_counter() - started) * 1e6)
+            exact += is_exact
+            candidates.append(len(loaded._candidates(np.asarray(row, dtype=np.int8))) if loaded.blocks else len(loaded))
+
+        # Recall: share of returned profiles at least as close as the k-th profile of a full scan
+        recall = []
+        for row in queries[:100]:
+            _, distances, _ = loaded.nearest(row, k)
+            full = np.sort((loaded.codes != np.asarray(row, dtype=np.int8)).sum(axis=1))[k - 1]
+            recall.append(float((distances <= full).mean()))
+        scan = []
+        for row in queries[:50]:
+            started = time.perf_counter()
+            np.argsort((loaded.codes != np.asarray(row, dtype=np.int8)).sum(axis=1, dtype=np.int8), kind='stable')[:k]
+            scan.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return {
+        'rows': len(codes),
+        'blocks': len(index['blocks']),
+        'build_s': build_s,
+        'bytes': size,
+        'load_ms': load_ms,
+        'p50_us': samples[len(samples) // 2],
+        'p95_us': samples[int(len(samples) * 0.95)],
+        'scan_us': float(np.median(scan)),
+        'candidates': int(np.median(candidates)),
+        'exact': exact / len(queries),
+        'recall': float(np.mean(recall)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        X, y = load_training_data(str(ROOT / "data" / "mldata.csv"))
+    classes, roles = np.unique(y.astype(str), return_inverse=True)
+    codes = X.to_numpy().astype(np.int8)
+    rng = random.Random(0)
+    queries = [encode_features(random_profile(rng)) for _ in range(args.queries)]
+
+    print(f"{'rows':>10}{'blocks':>8}{'build s':>9}{'bytes':>13}{'load ms':>9}{'p50 us':>9}{'p95 us':>9}"
+          f"{'scan us':>10}{'cands':>8}{'exact':>7}{'recall':>8}")
+    for scale in args.scale:
+        data, labels = scaled(codes, roles, scale, np.random.default_rng(scale))
+        r = run(data, labels, classes, queries, args.k)
+        print(f"{r['rows']:>10,}{r['blocks']:>8}{r['build_s']:>9.2f}{r['bytes']:>13,}{r['load_ms']:>9.1f}"
+              f"{r['p50_us']:>9.0f}{r['p95_us']:>9.0f}{r['scan_us']:>10.0f}{r['candidates']:>8}"
+              f"{r['exact']:>7.2f}{r['recall']:>8.3f}")
+
+if __name__ == "__main__":
+    main()
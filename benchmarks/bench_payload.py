@@ -0,0 +1,64 @@
+# Bytes sent to the browser per rerun, with the stylesheet linked as a static asset vs inlined.
+#
+# Each variant renders the page in a fresh interpreter (static serving is a server option, read
+# once at startup) and sums the serialized size of every ForwardMsg the script run produces.
+#
+#   python benchmarks/bench_payload.py --pages landing login demo
+
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DRIVER = """
+import json
+from streamlit import config
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.testing.v1 import AppTest
+
+sizes = []
+_enqueue = ForwardMsgQueue.enqueue
+def enqueue(self, msg):
+    sizes.append(msg.ByteSize())
+    return _enqueue(self, msg)
+ForwardMsgQueue.enqueue = enqueue
+config.set_option("server.enableStaticServing", {static_serving!r})
+
+at = AppTest.from_file({ui!r}, default_timeout=120)
+at.session_state["page"] = {page!r}
+at.run()
+per_run = []
+for _ in range({runs}):
+    sizes.clear()
+    at.run()
+    per_run.append(sum(sizes))
+print(json.dumps({{"bytes": sum(per_run) / len(per_run), "errors": [e.message for e in at.exception]}}))
+"""
+
+def measure(page, static_serving, runs):
+    code = DRIVER.format(ui=str(ROOT / "ui.py"), page=page, runs=runs, static_serving=static_serving)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if result["errors"]:
+        raise RuntimeError(result["errors"])
+    return result["bytes"]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", nargs="+", default=["landing", "login", "demo"])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'page':<10}{'inline CSS':>14}{'static CSS':>14}{'saved':>12}")
+    for page in args.pages:
+        inline = measure(page, False, args.runs)
+        static = measure(page, True, args.runs)
+        print(f"{page:<10}{inline:>12,.0f} B{static:>12,.0f} B{inline - static:>10,.0f} B")
+
+if __name__ == "__main__":
+    main()
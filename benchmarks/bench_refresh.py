@@ -0,0 +1,92 @@
+# Incremental refresh (refresh_model.py) versus retraining on everything, as feedback accumulates.
+#
+# Trains the incremental model on data/mldata.csv (or, with --training-rows, on that many synthetic
+# profiles, to show that a refresh does not grow with the training data either), then adds feedback in growing batches to a
+# temporary database: synthetic profiles (synthetic.py) saved the way save_prediction stores
+# answers, each labelled with its synthetic role. After each batch it times a refresh, which learns
+# only that batch, and a full retrain (the model trained again, then every feedback row so far).
+# Refresh time should follow the batch size; full retrain time follows the total.
+#
+#   python benchmarks/bench_refresh.py --batches 20000 20000 20000 20000 20000
+#   python benchmarks/bench_refresh.py --training-rows 1000000 --batches 20000 20000
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+from features import FEATURE_COLUMNS, TRAINING_DATA
+from feedback import init_feedback_table
+from refresh_model import init_model, refresh
+import synthetic
+from train_chunked import encoding_plan, encode_chunk
+
+def saved_answers(row):
+    """Encoded answers in the format save_prediction stores (str of the one-row frame's to_dict())"""
+    return "{" + ", ".join(f"'{column}': {{0: {value}}}" for column, value in zip(FEATURE_COLUMNS, row)) + "}"
+
+def add_feedback(conn, generator, plan, roles, rows, seed):
+    """Insert `rows` synthetic predictions, each with feedback naming its synthetic role"""
+    first = conn.execute('SELECT COALESCE(MAX(id), 0) FROM user_predictions').fetchone()[0] + 1
+    for chunk in synthetic.generate(generator, rows, seed):
+        X, y = encode_chunk(chunk, plan, roles)
+        ids = range(first, first + len(X))
+        first += len(X)
+        conn.executemany('INSERT INTO user_predictions (id, user_id, prediction_result, input_data, created_at) '
+                         'VALUES (?, 1, ?, ?, ?)',
+                         ((i, roles[0], saved_answers(row), '2026-01-01 00:00:00') for i, row in zip(ids, X.tolist())))
+        conn.executemany('INSERT INTO prediction_feedback (prediction_id, user_id, predicted_role, role, created_at) '
+                         'VALUES (?, 1, ?, ?, ?)',
+                         ((i, roles[0], roles[role], '2026-01-01 00:00:00') for i, role in zip(ids, y.tolist())))
+    conn.commit()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, nargs="+", default=[20_000] * 5)
+    parser.add_argument("--training-rows", type=int, default=0,
+                        help="train on this many synthetic profiles instead of data/mldata.csv")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    generator = synthetic.fit()
+    plan, roles = encoding_plan()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "feedback.db")
+        model_path = os.path.join(tmp, "refreshed.pkl")
+        full_path = os.path.join(tmp, "full.pkl")
+        conn = sqlite3.connect(db_path)
+        conn.execute('''CREATE TABLE user_predictions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER,
+                        prediction_result TEXT, input_data TEXT, created_at TIMESTAMP)''')
+        conn.commit()
+        init_feedback_table(db_path)
+        data = TRAINING_DATA
+        if args.training_rows:
+            data = os.path.join(tmp, "training.csv.gz")
+            synthetic.write(generator, args.training_rows, data)
+        init_model(model_path, data)
+
+        print(f"{'new rows':>10}{'total':>10}{'refresh s':>11}{'full s':>9}{'holdout before':>16}{'after':>8}")
+        total = 0
+        for seed, batch in enumerate(args.batches, start=1):
+            add_feedback(conn, generator, plan, roles, batch, seed)
+            total += batch
+            report = refresh(model_path, db_path)
+
+            started = time.perf_counter()
+            init_model(full_path, data)
+            refresh(full_path, db_path)
+            full_s = time.perf_counter() - started
+            print(f"{batch:>10,}{total:>10,}{report['seconds']:>11.2f}{full_s:>9.2f}{report['before']:>16.4f}"
+                  f"{report['after']:>8.4f}  {report['status']}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Reruns and server time per prediction for the prediction form, under a simulated set of sessions.
+#
+# Each simulated session edits K inputs and then predicts once. Before the form/fragment layout
+# every edit reran the whole script; now edits stay in the browser until submit, and the submit
+# reruns only the prediction fragment. Script costs are measured with Streamlit's AppTest and the
+# span timings from profiling.py (AppTest itself always executes full reruns, so the fragment cost
+# is taken from the fragment's own span).
+# After the prediction, each session reruns the page --reruns times with the same inputs, as any
+# other interaction does. The results are re-rendered from the session's prediction_result record,
+# so those reruns should make no model calls and no guide lookups, where the results used to vanish
+# and cost a second prediction.
+#
+#   python benchmarks/bench_reruns.py --sessions 20 --edits 10 --reruns 5
+
+import os
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+os.environ["CAREERPATH_TIMINGS"] = "1"
+os.environ.setdefault("CAREERPATH_TIMING_LOG", os.devnull)
+os.environ.setdefault("CAREERPATH_LLM_MODE", "synthetic")
+
+from streamlit.testing.v1 import AppTest
+
+def run_timed(at):
+    """Run the app once; returns (script ms from the span log, process CPU ms)"""
+    cpu = time.process_time()
+    at.run()
+    cpu_ms = (time.process_time() - cpu) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at.session_state["last_rerun_timings"], cpu_ms
+
+def fragment_ms(timings, name):
+    return sum(s['ms'] for s in timings['spans'] if s['name'] == f"fragment:{name}")
+
+GUIDES = ('get_career_roadmap', 'get_project_ideas', 'get_learning_resources')
+
+def work(timings):
+    """(model predictions, generated-guide lookups) made during one rerun"""
+    spans = timings['spans']
+    return (sum(s['name'] == 'model.predict' for s in spans), sum(s['name'] in GUIDES for s in spans))
+
+def simulate_session(rng, edits, reruns):
+    at = AppTest.from_file(str(ROOT / "ui.py"), default_timeout=120)
+    at.run()
+    at.session_state["page"] = "demo"
+    idle, idle_cpu = run_timed(at)
+
+    for _ in range(edits):
+        slider = rng.choice(list(at.slider))
+        slider.set_value(rng.randint(slider.min, slider.max))
+
+    next(b for b in at.button if "Predict" in b.label).click()
+    submit, submit_cpu = run_timed(at)
+    kept = []
+    for _ in range(reruns):
+        kept.append(run_timed(at)[0])
+        if not any("Recommended" in s.value for s in at.success):
+            raise RuntimeError("the results did not survive a rerun")
+    return {
+        'submit_work': work(submit),
+        'kept_ms': sum(t['total_ms'] for t in kept) / max(len(kept), 1),
+        'kept_work': tuple(sum(w) for w in zip(*(work(t) for t in kept))) if kept else (0, 0),
+        'full_rerun_ms': idle['total_ms'],
+        'full_rerun_cpu_ms': idle_cpu,
+        'submit_full_ms': submit['total_ms'],
+        'submit_fragment_ms': fragment_ms(submit, 'prediction_form'),
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--edits", type=int, default=10, help="input edits before each prediction")
+    parser.add_argument("--reruns", type=int, default=5, help="reruns with the same inputs after each prediction")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = [simulate_session(rng, args.edits, args.reruns) for _ in range(args.sessions)]
+    mean = lambda key: sum(r[key] for r in results) / len(results)
+
+    before_ms = args.edits * mean('full_rerun_ms') + mean('submit_full_ms')
+    after_ms = mean('submit_fragment_ms')
+    print(f"{args.sessions} sessions, {args.edits} input edits per prediction")
+    print(f"full-page rerun: {mean('full_rerun_ms'):.1f} ms script / {mean('full_rerun_cpu_ms'):.1f} ms process CPU")
+    print(f"{'':<24}{'reruns/prediction':>20}{'server ms/session':>20}")
+    print(f"{'per-widget reruns':<24}{args.edits + 1:>20}{before_ms:>20.1f}")
+    print(f"{'form + fragment':<24}{1:>20}{after_ms:>20.1f}")
+
+    predictions, lookups = results[0]['submit_work']
+    kept_predictions = sum(r['kept_work'][0] for r in results)
+    kept_lookups = sum(r['kept_work'][1] for r in results)
+    print(f"\nafter each prediction, {args.reruns} reruns with the same inputs:")
+    print(f"  results kept in the session: {mean('kept_ms'):.1f} ms script per rerun, "
+          f"{kept_predictions} model calls and {kept_lookups} guide lookups in {args.sessions * args.reruns} reruns")
+    print(f"  predicting again instead: {mean('submit_fragment_ms'):.1f} ms, {predictions} model call and "
+          f"{lookups} guide lookups each (plus a saved prediction when logged in)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# Cold-start benchmark for ui.py with an import-time regression budget.
+#
+# Renders one page in a fresh interpreter started with `-X importtime`, then reports which heavy
+# libraries were imported and the cumulative import time spent while rendering. Exits non-zero
+# when a page imports a library it must not need or exceeds its import budget, so it can run in CI.
+#
+#   python benchmarks/bench_startup.py                       # landing and login pages
+#   python benchmarks/bench_startup.py --pages demo --budget-ms 3000
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["pandas", "numpy", "sklearn", "joblib", "openai", "pyarrow"]
+
+# Libraries each page may not import; pages not listed here are only measured
+FORBIDDEN = {
+    "landing": ["sklearn", "joblib", "openai", "pandas"],
+    "login": ["sklearn", "joblib", "openai", "pandas"],
+    "register": ["sklearn", "joblib", "openai", "pandas"],
+}
+
+MARKER = "--- bench_startup: render ---"
+
+DRIVER = """
+import sys, json, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({ui!r}, default_timeout=120)
+at.session_state["page"] = {page!r}
+print({marker!r}, file=sys.stderr, flush=True)
+started = time.perf_counter()
+at.run()
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "page": {page!r},
+    "render_ms": elapsed_ms,
+    "errors": [e.message for e in at.exception],
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+def parse_importtime(stderr):
+    """Cumulative microseconds of top-level imports made after the render marker"""
+    seen_marker = False
+    total_us = 0
+    top = []
+    for line in stderr.splitlines():
+        if line.strip() == MARKER:
+            seen_marker = True
+            continue
+        if not seen_marker or not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        # Only top-level entries (no extra indentation) so nested imports are not counted twice
+        if raw_name.startswith("  "):
+            continue
+        total_us += int(cumulative_us)
+        top.append((int(cumulative_us), raw_name.strip()))
+    return total_us, sorted(top, reverse=True)[:8]
+
+def measure(page):
+    code = DRIVER.format(ui=str(ROOT / "ui.py"), page=page, marker=MARKER, heavy=HEAVY_MODULES)
+    env = dict(os.environ, CAREERPATH_LLM_MODE=os.environ.get("CAREERPATH_LLM_MODE", "live"))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["import_us"], result["top_imports"] = parse_importtime(proc.stderr)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", nargs="+", default=["landing", "login"])
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="max import time while rendering a page")
+    args = parser.parse_args()
+
+    failed = False
+    for page in args.pages:
+        result = measure(page)
+        import_ms = result["import_us"] / 1000
+        forbidden = [m for m in result["heavy"] if m in FORBIDDEN.get(page, [])]
+        over_budget = import_ms > args.budget_ms
+        status = "FAIL" if forbidden or over_budget or result["errors"] else "ok"
+        failed = failed or status == "FAIL"
+
+        print(f"[{status}] {page}: render {result['render_ms']:.0f} ms, imports {import_ms:.0f} ms "
+              f"(budget {args.budget_ms:.0f} ms), heavy modules: {', '.join(result['heavy']) or 'none'}")
+        for cumulative_us, name in result["top_imports"]:
+            print(f"         {cumulative_us / 1000:8.1f} ms  {name}")
+        if forbidden:
+            print(f"         must not import: {', '.join(forbidden)}")
+        for error in result["errors"]:
+            print(f"         error: {error}")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
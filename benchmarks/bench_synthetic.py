@@ -0,0 +1,65 @@
+# Throughput, peak memory and fidelity of the synthetic profile generator (synthetic.py).
+#
+# For each row count and output format, runs synthetic.py in a child process and reports its wall
+# time, rows/s, peak RSS and file size. With streaming, peak RSS should not grow with the row
+# count. Then compares the smallest generated file with data/mldata.csv: the largest difference
+# (total variation distance) in how often an answer occurs, overall and within each job role.
+#
+#   python benchmarks/bench_synthetic.py --rows 1000000 10000000 --format csv.gz parquet
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from features import TRAINING_DATA, TARGET
+
+def total_variation(real, synthetic):
+    difference = real.sub(synthetic, fill_value=0).abs()
+    return 0.5 * (difference.sum() if difference.ndim == 1 else difference.sum(axis=1).max())
+
+def fidelity(path):
+    import pandas as pd
+    from dataset import read_source
+    real = pd.read_csv(ROOT / TRAINING_DATA).astype(str)
+    synthetic = read_source(path).astype(str)
+    overall = max(total_variation(real[c].value_counts(normalize=True), synthetic[c].value_counts(normalize=True))
+                  for c in real.columns)
+    by_role = max(total_variation(pd.crosstab(real[TARGET], real[c], normalize='index'),
+                                  pd.crosstab(synthetic[TARGET], synthetic[c], normalize='index'))
+                  for c in real.columns if c != TARGET)
+    return overall, by_role
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--format", nargs="+", default=["csv.gz", "parquet"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>12}{'format':>9}{'seconds':>9}{'rows/s':>11}{'peak RSS MB':>13}{'file MB':>9}")
+        for rows in args.rows:
+            for fmt in args.format:
+                path = os.path.join(tmp, f"synthetic-{rows}.{fmt}")
+                started = time.perf_counter()
+                child = subprocess.Popen([sys.executable, str(ROOT / "synthetic.py"), "--rows", str(rows),
+                                          "--out", path], cwd=ROOT, stdout=subprocess.DEVNULL)
+                # wait4 returns the resource usage of this child alone (ru_maxrss in KB on Linux)
+                _, status, usage = os.wait4(child.pid, 0)
+                elapsed = time.perf_counter() - started
+                if status:
+                    raise SystemExit(f"synthetic.py failed with status {status}")
+                print(f"{rows:>12,}{fmt:>9}{elapsed:>9.1f}{rows / elapsed:>11,.0f}{usage.ru_maxrss / 1024:>13.0f}"
+                      f"{os.path.getsize(path) / 1e6:>9.1f}")
+        overall, by_role = fidelity(os.path.join(tmp, f"synthetic-{min(args.rows)}.{args.format[0]}"))
+        print(f"largest answer-frequency difference from data/mldata.csv: {overall:.4f} overall, "
+              f"{by_role:.4f} within a role")
+
+if __name__ == "__main__":
+    main()
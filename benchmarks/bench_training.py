@@ -0,0 +1,63 @@
+# Chunked versus in-memory training (train_chunked.py) as the dataset grows.
+#
+# For each size, writes that many synthetic profiles (synthetic.py) to a temporary file, then trains
+# each learner in a child process both ways: streamed in chunks, and the notebook's way with the
+# whole file loaded at once. Reports time, test accuracy on the same held-out rows and the child's
+# peak RSS. Chunked peak RSS should stay flat as rows grow; in-memory grows with the file.
+#
+#   python benchmarks/bench_training.py --rows 500000 2000000 --learner nb sgd hgb --format csv.gz
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import synthetic
+
+def train(path, learner, in_memory, tmp):
+    report_path = os.path.join(tmp, "report.json")
+    command = [sys.executable, str(ROOT / "train_chunked.py"), "--data", path, "--learner", learner,
+               "--output", os.path.join(tmp, "model.pkl"), "--report", report_path]
+    child = subprocess.Popen(command + (["--in-memory"] if in_memory else []), cwd=ROOT, stdout=subprocess.DEVNULL)
+    started = time.perf_counter()
+    # wait4 returns the resource usage of this child alone (ru_maxrss in KB on Linux)
+    _, status, usage = os.wait4(child.pid, 0)
+    elapsed = time.perf_counter() - started
+    if status:
+        return None
+    with open(report_path, encoding="utf-8") as f:
+        report = json.load(f)
+    return dict(report, seconds=elapsed, peak_rss_mb=usage.ru_maxrss / 1024)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[500_000, 2_000_000])
+    parser.add_argument("--learner", nargs="+", default=["nb", "sgd"], help="nb, sgd and/or hgb (slowest)")
+    parser.add_argument("--format", default="csv.gz", help="csv, csv.gz, parquet or feather")
+    args = parser.parse_args()
+
+    model = synthetic.fit()
+    print(f"{'rows':>11}{'learner':>9}{'mode':>11}{'seconds':>9}{'accuracy':>10}{'peak RSS MB':>13}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"synthetic.{args.format}")
+            synthetic.write(model, rows, path)
+            for learner in args.learner:
+                for in_memory in (False, True):
+                    mode = "in-memory" if in_memory else "chunked"
+                    result = train(path, learner, in_memory, tmp)
+                    if result is None:
+                        print(f"{rows:>11,}{learner:>9}{mode:>11}   failed (out of memory?)")
+                        continue
+                    print(f"{rows:>11,}{learner:>9}{mode:>11}{result['seconds']:>9.1f}{result['accuracy']:>10.4f}"
+                          f"{result['peak_rss_mb']:>13.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Load test for the HTTP inference service (service.py).
+#
+# Sends random valid profiles from concurrent client threads for a fixed duration and reports
+# throughput, latency percentiles and errors. Standard library only, like the service.
+#
+#   python service.py --workers 4 --quiet &
+#   python benchmarks/load_test.py --concurrency 16 --duration 10
+#   python benchmarks/load_test.py --endpoint batch --batch-size 100
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from features import FEATURES
+
+def random_profile(rng):
+    """One random record that passes the feature schema"""
+    record = {}
+    for field, _, encoding, allowed in FEATURES:
+        if encoding == 'number':
+            record[field] = rng.randint(*allowed)
+        elif encoding == 'flag':
+            record[field] = rng.choice(["yes", "no"])
+        else:
+            record[field] = rng.choice(list(allowed))
+    return record
+
+def build_payload(endpoint, rng, batch_size, k):
+    if endpoint == 'predict':
+        return '/predict', {'features': random_profile(rng)}
+    if endpoint == 'top-k':
+        return '/predict/top-k', {'features': random_profile(rng), 'k': k}
+    return '/predict/batch', {'instances': [random_profile(rng) for _ in range(batch_size)]}
+
+def wait_until_ready(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/readyz')
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+def client_loop(args, seed, deadline, latencies, errors, lock):
+    rng = random.Random(seed)
+    # Payloads are built up front so the client measures the service, not JSON encoding
+    payloads = [build_payload(args.endpoint, rng, args.batch_size, args.k) for _ in range(50)]
+    payloads = [(path, json.dumps(body)) for path, body in payloads]
+    local_latencies = []
+    local_errors = 0
+    i = 0
+    while time.monotonic() < deadline:
+        path, body = payloads[i % len(payloads)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            conn = http.client.HTTPConnection(args.host, args.port, timeout=10)
+            conn.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            if response.status != 200:
+                local_errors += 1
+                continue
+        except OSError:
+            local_errors += 1
+            continue
+        local_latencies.append(time.perf_counter() - started)
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--endpoint", choices=["predict", "top-k", "batch"], default="predict")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("-k", type=int, default=3)
+    args = parser.parse_args()
+
+    if not wait_until_ready(args.host, args.port, timeout=30):
+        sys.exit(f"Service at {args.host}:{args.port} is not ready")
+
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+    threads = [threading.Thread(target=client_loop, args=(args, seed, deadline, latencies, errors, lock))
+               for seed in range(args.concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    if not latencies:
+        sys.exit(f"No successful requests ({errors[0]} errors)")
+    latencies.sort()
+    rows_per_request = args.batch_size if args.endpoint == 'batch' else 1
+    print(f"endpoint={args.endpoint} concurrency={args.concurrency} duration={elapsed:.1f}s")
+    print(f"requests: {len(latencies)} ok, {errors[0]} errors")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} req/s ({len(latencies) * rows_per_request / elapsed:,.0f} predictions/s)")
+    print(f"latency ms: p50 {percentile(latencies, 0.5) * 1000:.2f}  p95 {percentile(latencies, 0.95) * 1000:.2f}  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f}  max {latencies[-1] * 1000:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# Build the static assets served by Streamlit (server.enableStaticServing in .streamlit/config.toml).
+# Usage: python build_assets.py
+
+import re
+from pathlib import Path
+
+SOURCE_CSS = Path('assets/styles.css')
+OUTPUT_CSS = Path('static/styles.min.css')
+
+# Quoted strings (e.g. the inline SVG data URL) are copied untouched
+STRING_PATTERN = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    parts = STRING_PATTERN.split(css)
+    for i in range(0, len(parts), 2):
+        code = re.sub(r'\s+', ' ', parts[i])
+        code = re.sub(r'\s*([{};,>])\s*', r'\1', code)
+        code = re.sub(r':\s+', ':', code)
+        parts[i] = code.replace(';}', '}')
+    return ''.join(parts).strip()
+
+def build_css():
+    """Minify assets/styles.css into static/styles.min.css"""
+    css = SOURCE_CSS.read_text(encoding='utf-8')
+    minified = minify_css(css)
+    OUTPUT_CSS.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_CSS.write_text(minified + "\n", encoding='utf-8')
+    return len(css.encode()), len(minified.encode())
+
+if __name__ == "__main__":
+    source_bytes, minified_bytes = build_css()
+    print(f"{SOURCE_CSS} ({source_bytes:,} bytes) -> {OUTPUT_CSS} ({minified_bytes:,} bytes)")
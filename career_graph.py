@@ -0,0 +1,125 @@
+# Related-careers graph built from the model's behaviour and the training data.
+#
+# Offline job: weighs how related every pair of predictable roles is using three signals, each
+# scaled so its strongest off-diagonal pair scores 1:
+#   - confusion: how often the model predicts one role for profiles of the other, on the notebook's
+#     held-out test split (symmetrized)
+#   - probability: how often both roles get probability for the same training profile
+#     (predict_proba co-occurrence); a fully grown tree gives every profile a single role, in
+#     which case this signal is empty and its weight goes to the other two
+#   - centroid: how close the average answers of the two roles' training profiles are
+# The combined weights are stored as an adjacency table (career_graph.json: role -> related roles,
+# strongest first), so the app looks up a role's related careers with one dictionary access.
+# Environment variables:
+#   CAREERPATH_CAREER_GRAPH_PATH   adjacency table (default career_graph.json; the static
+#                                  RELATED_CAREERS in ui.py are used for roles it does not cover)
+#   CAREERPATH_RELATED_CACHED_ONLY 1 = once the server has any LLM-written guides, show only related
+#                                  roles among them, so predictions stop triggering new LLM calls
+#                                  (until then the ranked roles are shown and generated; default 0)
+#
+#   python career_graph.py                  # writes career_graph.json from the served model
+
+import os
+import json
+import argparse
+import warnings
+
+GRAPH_PATH = os.getenv("CAREERPATH_CAREER_GRAPH_PATH", "career_graph.json")
+SIGNAL_WEIGHTS = {'confusion': 0.4, 'probability': 0.3, 'centroid': 0.3}
+MAX_RELATED = 5
+CACHED_ONLY = os.getenv("CAREERPATH_RELATED_CACHED_ONLY", "0") == "1"
+
+def _scaled(matrix):
+    """Symmetric, zero-diagonal copy scaled so the largest entry is 1 (None when all zero)"""
+    import numpy as np
+    matrix = (matrix + matrix.T) / 2
+    np.fill_diagonal(matrix, 0)
+    peak = matrix.max()
+    return matrix / peak if peak > 0 else None
+
+def confusion_signal(y_true, y_pred, classes):
+    """Share of each role's profiles predicted as the other role"""
+    from sklearn.metrics import confusion_matrix
+    matrix = confusion_matrix(y_true, y_pred, labels=classes).astype(float)
+    matrix /= matrix.sum(axis=1, keepdims=True).clip(min=1)
+    return _scaled(matrix)
+
+def probability_signal(probabilities):
+    """Cosine similarity of the roles' probability columns over all profiles"""
+    import numpy as np
+    products = probabilities.T @ probabilities
+    norms = np.sqrt(np.diag(products)).clip(min=1e-12)
+    return _scaled(products / np.outer(norms, norms))
+
+def centroid_signal(X, y, classes):
+    """Closeness of the roles' mean standardized answers"""
+    import numpy as np
+    values = X.to_numpy(dtype=float)
+    values = (values - values.mean(axis=0)) / values.std(axis=0).clip(min=1e-12)
+    centroids = np.stack([values[(y == role).to_numpy()].mean(axis=0) for role in classes])
+    distances = np.linalg.norm(centroids[:, None, :] - centroids[None, :, :], axis=2)
+    return _scaled(distances.max() - distances)
+
+def build_graph(signals, classes, weights=SIGNAL_WEIGHTS, max_related=MAX_RELATED):
+    """Adjacency table from the weighted sum of the non-empty signals"""
+    used = {name: weights[name] for name, matrix in signals.items() if matrix is not None and weights.get(name)}
+    total = sum(used.values())
+    combined = sum(signals[name] * (weight / total) for name, weight in used.items())
+    related = {}
+    for i, role in enumerate(classes):
+        ranked = sorted((j for j in range(len(classes)) if j != i), key=lambda j: -combined[i, j])
+        related[role] = [[classes[j], round(float(combined[i, j]), 4)] for j in ranked[:max_related]]
+    return {'signals': {name: round(weight / total, 4) for name, weight in used.items()}, 'related': related}
+
+def load_career_graph(path=GRAPH_PATH):
+    """Role -> [[related role, weight], ...], or an empty dict when the table has not been built"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)['related']
+    except FileNotFoundError:
+        return {}
+
+def related_roles(graph, role, count=3, available=None):
+    """The count most related roles; only those in `available` (e.g. roles with cached guides) when it has any"""
+    ranked = [other for other, _ in graph.get(role, [])]
+    if available:
+        return [other for other in ranked if other in available][:count]
+    return ranked[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the related-careers adjacency table")
+    parser.add_argument("--data", default="data/mldata.csv")
+    parser.add_argument("--model", default=None, help="model artifact (default: CAREERPATH_MODEL_PATH)")
+    parser.add_argument("--output", default=GRAPH_PATH)
+    parser.add_argument("--max-related", type=int, default=MAX_RELATED)
+    args = parser.parse_args()
+
+    import joblib
+    from sklearn.model_selection import train_test_split
+    from features import load_training_data
+    from inference import MODEL_PATH
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = joblib.load(args.model or MODEL_PATH)
+        X, y = load_training_data(args.data)
+    y = y.astype(str)
+    classes = [str(c) for c in model.classes_]
+    _, x_test, _, y_test = train_test_split(X, y, test_size=0.20, random_state=42)
+
+    signals = {
+        'confusion': confusion_signal(y_test, model.predict(x_test).astype(str), classes),
+        'probability': probability_signal(model.predict_proba(X)),
+        'centroid': centroid_signal(X, y, classes),
+    }
+    for name, matrix in signals.items():
+        print(f"{name:<12}{'empty, skipped' if matrix is None else 'used'}")
+    graph = build_graph(signals, classes, max_related=args.max_related)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(graph, f, indent=1)
+    for role in classes:
+        print(f"{role:<44}" + ", ".join(f"{other} ({weight:.2f})" for other, weight in graph['related'][role][:3]))
+    print(f"Saved {args.output}")
+
+if __name__ == "__main__":
+    main()
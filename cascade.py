@@ -0,0 +1,84 @@
+# Confidence-based model cascade: a cheap decision tree first, an ensemble for the hard cases.
+#
+# CascadeModel looks like a scikit-learn classifier (classes_, predict_proba, predict), so it can
+# be served anywhere job_role_model.pkl is, including the batching scheduler. Rows whose top tree
+# probability clears the threshold keep the tree's answer; the rest are re-scored by the ensemble.
+# The threshold is tuned offline by train_cascade.py.
+
+import threading
+
+class CascadeModel:
+    """Tree predictions, escalated to the ensemble when the tree is not confident enough"""
+
+    def __init__(self, tree, ensemble, threshold, report=None):
+        if list(tree.classes_) != list(ensemble.classes_):
+            raise ValueError("tree and ensemble were trained on different job roles")
+        self.tree = tree
+        self.ensemble = ensemble
+        self.threshold = threshold
+        self.classes_ = tree.classes_
+        self.report = report or {}
+        self._init_counters()
+
+    def _init_counters(self):
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.escalated = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ('_lock', 'rows', 'escalated'):
+            state.pop(key)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_counters()
+
+    def predict_proba(self, X):
+        probabilities = self.tree.predict_proba(X)
+        hard = probabilities.max(axis=1) < self.threshold
+        escalated = int(hard.sum())
+        if escalated:
+            probabilities[hard] = self.ensemble.predict_proba(X[hard])
+        with self._lock:
+            self.rows += len(probabilities)
+            self.escalated += escalated
+        return probabilities
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def stats(self):
+        """Rows scored since load and the share escalated to the ensemble"""
+        with self._lock:
+            return {
+                'cascade_threshold': self.threshold,
+                'cascade_rows': self.rows,
+                'cascade_escalated': self.escalated,
+                'escalation_rate': round(self.escalated / self.rows, 4) if self.rows else None,
+            }
+
+def cascade_accuracy(tree_proba, ensemble_proba, y, classes, threshold):
+    """Accuracy and escalation rate of the cascade at one threshold, from precomputed probabilities"""
+    hard = tree_proba.max(axis=1) < threshold
+    predicted = classes[tree_proba.argmax(axis=1)]
+    predicted[hard] = classes[ensemble_proba[hard].argmax(axis=1)]
+    return float((predicted == y).mean()), float(hard.mean())
+
+def tune_threshold(tree_proba, ensemble_proba, y, classes, target_accuracy):
+    """Lowest-escalation threshold whose accuracy reaches the target (else the most accurate one)"""
+    import numpy as np
+    y = np.asarray(y)
+    # Only the distinct tree confidences change the outcome; above the largest everything escalates
+    candidates = sorted(set(np.round(tree_proba.max(axis=1), 6))) + [1.000001]
+    table = []
+    for threshold in [0.0] + candidates:
+        accuracy, escalation = cascade_accuracy(tree_proba, ensemble_proba, y, classes, threshold)
+        table.append({'threshold': float(threshold), 'accuracy': accuracy, 'escalation_rate': escalation})
+    reaching = [row for row in table if row['accuracy'] >= target_accuracy]
+    if reaching:
+        best = min(reaching, key=lambda row: (row['escalation_rate'], -row['accuracy']))
+    else:
+        best = max(table, key=lambda row: (row['accuracy'], -row['escalation_rate']))
+    return best, table
@@ -0,0 +1,11 @@
+# Current UTC time for the timestamps the app stores and queries.
+#
+# SQLite rows keep naive UTC times ('YYYY-MM-DD HH:MM:SS', the CURRENT_TIMESTAMP format), so utcnow()
+# returns a naive datetime; it reads the clock through an aware datetime, since datetime.utcnow()
+# is deprecated from Python 3.12.
+
+import datetime
+
+def utcnow():
+    """The current UTC time as a naive datetime"""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,170 @@
+# Typed columnar cache for the training CSV.
+#
+# Parsing data/mldata.csv means inferring 16 string columns and re-encoding them on every run. The
+# first load converts the file once into a cache directory of NumPy columns that later loads
+# memory-map:
+#   - every raw column, strings as int8/int16 category codes plus their categories, numbers in the
+#     smallest integer type that holds them (load_frame)
+#   - the encoded training matrix (int8, in model column order) and the job role codes, as
+#     features.encode_training_frame produces them (load_encoded, used by load_training_data)
+# The directory name holds the SHA-256 of the CSV, so editing or replacing the file builds a new
+# cache and removes the old one. A small index remembers each file's size, mtime and digest, so an
+# unchanged file is not re-hashed on every load. Bump CACHE_VERSION when the encoding in
+# features.py changes. Parquet and Feather files (e.g. from synthetic.py) are read the same way when
+# pyarrow is installed. Environment variables:
+#   CAREERPATH_DATASET_CACHE   cache directory (default .dataset_cache)
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+
+import numpy as np
+
+CACHE_DIR = os.getenv("CAREERPATH_DATASET_CACHE", ".dataset_cache")
+CACHE_VERSION = 1
+
+def _atomic_json(path, payload):
+    """Write to a temporary file of this writer's own, then rename it over path"""
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=1)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def file_digest(path, cache_dir=CACHE_DIR):
+    """SHA-256 of the file, recomputed only when its size or modification time changed"""
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    index_path = os.path.join(cache_dir, 'index.json')
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+    except (FileNotFoundError, ValueError):
+        index = {}
+    entry = index.get(key)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['sha256']
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    index[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+    os.makedirs(cache_dir, exist_ok=True)
+    _atomic_json(index_path, index)
+    return index[key]['sha256']
+
+def _smallest_int(values):
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if len(values) == 0 or (values.min() >= info.min and values.max() <= info.max):
+            return values.astype(dtype)
+    return values.astype(np.int64)
+
+def read_source(path):
+    """The source file as a DataFrame: CSV (optionally compressed), Parquet or Feather"""
+    import pandas as pd
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    elif path.endswith('.feather'):
+        df = pd.read_feather(path)
+    else:
+        return pd.read_csv(path)
+    # Category columns back to strings, so they are encoded exactly like the same values read from a CSV
+    return df.astype({name: object for name in df.columns if isinstance(df[name].dtype, pd.CategoricalDtype)})
+
+def _build(path, directory, digest):
+    """Parse the source file once and write its columns and encoded training matrix"""
+    import pandas as pd
+    from features import FEATURE_COLUMNS, TARGET, encode_training_frame
+
+    df = read_source(path)
+    columns = []
+    for i, name in enumerate(df.columns):
+        column = df[name]
+        if pd.api.types.is_integer_dtype(column):
+            np.save(os.path.join(directory, f"column_{i}.npy"), _smallest_int(column.to_numpy()))
+            columns.append({'name': name, 'categories': None})
+        else:
+            categorical = column.astype('category')
+            np.save(os.path.join(directory, f"column_{i}.npy"), _smallest_int(categorical.cat.codes.to_numpy()))
+            columns.append({'name': name, 'categories': [str(c) for c in categorical.cat.categories]})
+
+    X, y = encode_training_frame(df)
+    encoded = X.to_numpy()
+    if encoded.min() < -128 or encoded.max() > 127:
+        raise ValueError("encoded features do not fit int8")
+    roles = y.astype('category')
+    np.save(os.path.join(directory, "features.npy"), encoded.astype(np.int8))
+    np.save(os.path.join(directory, "target.npy"), _smallest_int(roles.cat.codes.to_numpy()))
+    _atomic_json(os.path.join(directory, "meta.json"), {
+        'version': CACHE_VERSION,
+        'source': os.path.abspath(path),
+        'sha256': digest,
+        'rows': len(df),
+        'columns': columns,
+        'feature_columns': FEATURE_COLUMNS,
+        'target': TARGET,
+        'classes': [str(c) for c in roles.cat.categories],
+    })
+
+def cache_directory(path, cache_dir=CACHE_DIR):
+    """The cache of this exact file content, built on first use"""
+    digest = file_digest(path, cache_dir)
+    # Caches of one source file share this prefix, whatever its content
+    name = os.path.basename(path)
+    prefix = f"{name}-{hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:8]}-"
+    directory = os.path.join(cache_dir, f"{prefix}v{CACHE_VERSION}-{digest[:16]}")
+    if os.path.exists(os.path.join(directory, "meta.json")):
+        return directory
+
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{name}-", dir=cache_dir)
+    try:
+        _build(path, staging, digest)
+        try:
+            os.rename(staging, directory)
+        except OSError:
+            # Another process finished the same cache first
+            shutil.rmtree(staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    # Caches of earlier versions of the same file are stale now
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(prefix) and os.path.join(cache_dir, entry) != directory:
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+    return directory
+
+def _meta(directory):
+    with open(os.path.join(directory, "meta.json"), encoding='utf-8') as f:
+        return json.load(f)
+
+def load_frame(path, cache_dir=CACHE_DIR):
+    """The raw CSV as a typed DataFrame: strings as category, numbers as small integers"""
+    import pandas as pd
+    directory = cache_directory(path, cache_dir)
+    data = {}
+    for i, column in enumerate(_meta(directory)['columns']):
+        values = np.load(os.path.join(directory, f"column_{i}.npy"), mmap_mode='r')
+        if column['categories'] is None:
+            data[column['name']] = values
+        else:
+            data[column['name']] = pd.Categorical.from_codes(values, column['categories'])
+    return pd.DataFrame(data)
+
+def load_encoded(path, cache_dir=CACHE_DIR):
+    """(encoded features as int8 in model column order, job roles); the same values load_training_data read"""
+    import pandas as pd
+    directory = cache_directory(path, cache_dir)
+    meta = _meta(directory)
+    X = pd.DataFrame(np.load(os.path.join(directory, "features.npy"), mmap_mode='r'),
+                     columns=meta['feature_columns'], copy=False)
+    codes = np.load(os.path.join(directory, "target.npy"))
+    # Roles as plain strings, like the CSV column, so callers can compare them with numpy arrays
+    y = pd.Series(np.asarray(meta['classes'], dtype=object)[codes], name=meta['target'])
+    return X, y
@@ -0,0 +1,269 @@
+# Input drift: how far live prediction inputs have moved from the training distribution.
+#
+# The batching scheduler (inference.py) hands every answered request's encoded rows to
+# DriftMonitor.observe(), after the callers already have their predictions. The monitor keeps one
+# fixed-size histogram per feature (features x BINS counts, encoded values above the last bin share
+# it), so memory does not grow with traffic and an update costs one bincount per batch.
+# A background thread adds the counts to drift_histograms, per UTC hour, every FLUSH_SECONDS and
+# when the process exits; service workers and the app all add to the same rows.
+# drift_report() compares the live histograms of a time window with the training histograms:
+#   PSI   population stability index, sum (live - train) * ln(live / train) over the shares
+#   KL    Kullback-Leibler divergence of the live shares from the training shares
+# A feature is "warn" from PSI_WARN and "alert" from PSI_ALERT (the usual 0.1 / 0.25), once it has
+# MIN_ROWS live rows. What-if variants (sensitivity.py) are synthetic inputs and are not observed.
+# Environment variables:
+#   CAREERPATH_DRIFT_MONITOR         set to 0 to turn the monitor off (default on)
+#   CAREERPATH_DRIFT_REFERENCE       training histograms (default drift_reference.json; computed from
+#                                    the training data when the file is missing)
+#   CAREERPATH_DRIFT_FLUSH_SECONDS   how often counts are written to the database (default 60)
+#
+#   python drift.py                          # writes drift_reference.json after a model is exported
+#   python drift.py --report --hours 24      # exits with status 1 when a feature is in alert
+
+import os
+import json
+import time
+import atexit
+import sqlite3
+import argparse
+import datetime
+import threading
+import warnings
+
+import numpy as np
+
+from features import FEATURE_FIELDS, TRAINING_DATA
+from clock import utcnow
+
+DB_PATH = 'career_predictor.db'
+
+DRIFT_MONITOR = os.getenv("CAREERPATH_DRIFT_MONITOR", "1") not in ("0", "false", "no", "")
+DRIFT_REFERENCE = os.getenv("CAREERPATH_DRIFT_REFERENCE", "drift_reference.json")
+FLUSH_SECONDS = float(os.getenv("CAREERPATH_DRIFT_FLUSH_SECONDS", "60"))
+
+# Histogram bins per feature; every encoded answer fits (the widest, the book types, has 31 values)
+BINS = 64
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+MIN_ROWS = 100
+# Share given to empty bins, so PSI and KL stay finite
+EPSILON = 1e-4
+
+HISTOGRAM_UPSERT = '''
+    INSERT INTO drift_histograms (hour, feature, value, count) VALUES (?, ?, ?, ?)
+    ON CONFLICT (hour, feature, value) DO UPDATE SET count = count + excluded.count
+'''
+
+def init_drift_table(db_path=DB_PATH):
+    """Create the drift_histograms table"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS drift_histograms (
+        hour TEXT NOT NULL,
+        feature TEXT NOT NULL,
+        value INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (hour, feature, value)
+    ) WITHOUT ROWID
+    ''')
+
+    conn.commit()
+    conn.close()
+
+def histograms(codes):
+    """Per-feature value counts of an encoded matrix, as a features x BINS array"""
+    codes = np.clip(np.asarray(codes, dtype=np.int64), 0, BINS - 1)
+    offsets = np.arange(codes.shape[1]) * BINS
+    return np.bincount((codes + offsets).ravel(), minlength=codes.shape[1] * BINS).reshape(-1, BINS)
+
+def build_reference(path=TRAINING_DATA):
+    """Training histograms of every feature"""
+    from features import load_training_data
+    X, _ = load_training_data(path)
+    counts = histograms(X.to_numpy())
+    return {'data': path, 'rows': len(X), 'bins': BINS,
+            'features': {field: counts[i].tolist() for i, field in enumerate(FEATURE_FIELDS)}}
+
+def load_reference(path=DRIFT_REFERENCE):
+    """The exported training histograms, or ones computed from the training data when there is no file"""
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return build_reference()
+
+def _hour(now=None):
+    return (now or utcnow()).strftime('%Y-%m-%d %H')
+
+class DriftMonitor:
+    """Fixed-size per-feature histograms of live inputs, flushed to drift_histograms in the background"""
+
+    def __init__(self, db_path=DB_PATH, flush_seconds=FLUSH_SECONDS):
+        self.db_path = db_path
+        self.flush_seconds = flush_seconds
+        self._counts = np.zeros((len(FEATURE_FIELDS), BINS), dtype=np.int64)
+        self._flat = self._counts.reshape(-1)
+        self._offsets = np.arange(len(FEATURE_FIELDS)) * BINS
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.observed = 0
+        self.pending = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        init_drift_table(db_path)
+        self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def observe(self, rows):
+        """Count encoded rows; never raises"""
+        try:
+            bins = np.clip(np.asarray(rows, dtype=np.int64), 0, BINS - 1) + self._offsets
+        except (TypeError, ValueError):
+            return
+        counts = np.bincount(bins.ravel(), minlength=self._flat.size)
+        with self._lock:
+            self._flat += counts
+            self.observed += len(bins)
+            self.pending += len(bins)
+
+    def flush(self):
+        """Add the counts since the last flush to the current hour's rows"""
+        with self._flush_lock:
+            with self._lock:
+                if not self.pending:
+                    return
+                counts = self._counts.copy()
+                self._counts[:] = 0
+                pending, self.pending = self.pending, 0
+            hour = _hour()
+            features, values = np.nonzero(counts)
+            records = [(hour, FEATURE_FIELDS[f], int(v), int(counts[f, v])) for f, v in zip(features, values)]
+            try:
+                conn = sqlite3.connect(self.db_path, timeout=30)
+                try:
+                    conn.executemany(HISTOGRAM_UPSERT, records)
+                    conn.commit()
+                finally:
+                    conn.close()
+                self.flushes += 1
+            except sqlite3.Error:
+                # Keep the counts for the next flush
+                with self._lock:
+                    self._counts += counts
+                    self.pending += pending
+                self.flush_errors += 1
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def stats(self):
+        return {
+            'drift_observed_rows': self.observed,
+            'drift_pending_rows': self.pending,
+            'drift_flushes': self.flushes,
+            'drift_flush_errors': self.flush_errors,
+        }
+
+def load_drift_monitor(enabled=DRIFT_MONITOR):
+    """A DriftMonitor, or None when the monitor is turned off"""
+    return DriftMonitor() if enabled else None
+
+def live_histograms(conn, since):
+    """Live counts from the hours since `since` (YYYY-MM-DD HH), as a features x BINS array"""
+    counts = np.zeros((len(FEATURE_FIELDS), BINS), dtype=np.int64)
+    index = {field: i for i, field in enumerate(FEATURE_FIELDS)}
+    rows = conn.execute('''
+        SELECT feature, value, SUM(count) FROM drift_histograms
+        WHERE hour >= ? GROUP BY feature, value
+    ''', (since,)).fetchall()
+    for feature, value, count in rows:
+        if feature in index and 0 <= value < BINS:
+            counts[index[feature], value] = count
+    return counts
+
+def _shares(counts):
+    shares = counts / max(counts.sum(), 1)
+    shares = np.where(shares > 0, shares, EPSILON)
+    return shares / shares.sum()
+
+def divergence(live, train):
+    """(PSI, KL(live || train)) of two count vectors over the bins either of them uses"""
+    used = (live > 0) | (train > 0)
+    p, q = _shares(live[used]), _shares(train[used])
+    return float(((p - q) * np.log(p / q)).sum()), float((p * np.log(p / q)).sum())
+
+def status(psi, rows, min_rows=MIN_ROWS):
+    if rows < min_rows:
+        return 'too few rows'
+    if psi >= PSI_ALERT:
+        return 'alert'
+    return 'warn' if psi >= PSI_WARN else 'ok'
+
+def drift_report(conn, since, reference, min_rows=MIN_ROWS):
+    """PSI, KL, live rows and status per feature since `since` (YYYY-MM-DD HH), largest PSI first"""
+    import pandas as pd
+    live = live_histograms(conn, since)
+    records = []
+    for i, field in enumerate(FEATURE_FIELDS):
+        rows = int(live[i].sum())
+        psi, kl = divergence(live[i], np.asarray(reference['features'][field])) if rows else (None, None)
+        records.append({'feature': field, 'live_rows': rows, 'psi': psi, 'kl': kl,
+                        'status': status(psi, rows, min_rows)})
+    report = pd.DataFrame(records).set_index('feature')
+    return report.sort_values('psi', ascending=False, na_position='last')
+
+def feature_shares(conn, field, since, reference):
+    """Live and training share of each answer to one feature, indexed by the answer"""
+    import pandas as pd
+    from features import FEATURES
+    from sensitivity import value_label
+    index = FEATURE_FIELDS.index(field)
+    _, _, encoding, allowed = FEATURES[index]
+    live = live_histograms(conn, since)[index]
+    train = np.asarray(reference['features'][field])
+    used = np.nonzero((live > 0) | (train > 0))[0]
+    return pd.DataFrame({
+        'training': (train[used] / max(train.sum(), 1)).round(4),
+        'live': (live[used] / max(live.sum(), 1)).round(4),
+    }, index=[value_label(encoding, allowed, int(value)) for value in used])
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the training histograms or report input drift")
+    parser.add_argument("--data", default=TRAINING_DATA)
+    parser.add_argument("--output", default=DRIFT_REFERENCE)
+    parser.add_argument("--report", action="store_true", help="compare live inputs with --output instead")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--hours", type=int, default=24)
+    args = parser.parse_args()
+
+    if not args.report:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            reference = build_reference(args.data)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reference, f)
+        print(f"Saved training histograms of {reference['rows']:,} rows from {args.data} to {args.output}")
+        return
+
+    import pandas as pd
+    since = _hour(utcnow() - datetime.timedelta(hours=args.hours))
+    conn = sqlite3.connect(args.db)
+    try:
+        report = drift_report(conn, since, load_reference(args.output))
+    finally:
+        conn.close()
+    with pd.option_context('display.float_format', '{:.4f}'.format, 'display.width', 120):
+        print(report)
+    alerts = report.index[report['status'] == 'alert'].tolist()
+    if alerts:
+        print(f"Drift alert in the last {args.hours}h: {', '.join(alerts)}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
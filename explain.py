@@ -0,0 +1,125 @@
+# Per-prediction explanations read straight off the fitted decision tree.
+#
+# A prediction is the leaf a profile lands in, and every profile reaching the same leaf took the same
+# path, so the explanation depends only on the leaf. TreeExplainer walks the tree with plain Python
+# lists (a few microseconds for depth 25) and builds each leaf's explanation once:
+#   - the conditions along the path, merged into one range per feature and phrased with the answer
+#     labels from features.py ("Certification: one of hadoop, python")
+#   - each feature's contribution: how much its splits moved the probability of the predicted role,
+#     from the training prior at the root to the leaf
+# Later predictions that reach the same leaf are a dictionary lookup.
+
+from features import FEATURES, FEATURE_LABELS
+
+TREE_LEAF = -1
+
+def _domain(encoding, allowed):
+    """Smallest and largest encoded value of a feature"""
+    if encoding == 'number':
+        return allowed
+    if encoding == 'flag':
+        return 0, 1
+    return 0, max(allowed.values())
+
+def describe_range(field, encoding, allowed, low, high):
+    """Phrase low <= value <= high with the answer labels of the feature"""
+    label = FEATURE_LABELS[field]
+    if encoding == 'flag':
+        return f"{label}: {'Yes' if low == 1 else 'No'}"
+    if encoding == 'number':
+        domain_low, domain_high = allowed
+        if low == high:
+            return f"{label}: {low}"
+        if low <= domain_low:
+            return f"{label} at most {high}"
+        if high >= domain_high:
+            return f"{label} at least {low}"
+        return f"{label} between {low} and {high}"
+    names = [name for name, code in sorted(allowed.items(), key=lambda item: item[1]) if low <= code <= high]
+    if not names:
+        return f"{label}: an option not offered in the form"
+    if len(names) == 1:
+        return f"{label}: {names[0]}"
+    return f"{label}: one of {', '.join(names)}"
+
+class TreeExplainer:
+    """Decision-path explanations for a fitted DecisionTreeClassifier, cached per leaf"""
+
+    def __init__(self, model, top_n=4):
+        tree = model.tree_
+        self.left = tree.children_left.tolist()
+        self.right = tree.children_right.tolist()
+        self.feature = tree.feature.tolist()
+        self.threshold = tree.threshold.tolist()
+        value = tree.value[:, 0, :]
+        self.proba = (value / value.sum(axis=1, keepdims=True)).tolist()
+        self.classes = [str(c) for c in model.classes_]
+        self.top_n = top_n
+        self.parent = [TREE_LEAF] * len(self.left)
+        for node, (left, right) in enumerate(zip(self.left, self.right)):
+            if left != TREE_LEAF:
+                self.parent[left] = node
+                self.parent[right] = node
+        self._cache = {}
+
+    @classmethod
+    def for_model(cls, model, top_n=4):
+        """An explainer when the model is a single decision tree, else None"""
+        return cls(model, top_n) if hasattr(model, 'tree_') else None
+
+    def leaf(self, row):
+        """The leaf an encoded row lands in"""
+        left, right, feature, threshold = self.left, self.right, self.feature, self.threshold
+        node = 0
+        while left[node] != TREE_LEAF:
+            node = left[node] if row[feature[node]] <= threshold[node] else right[node]
+        return node
+
+    def explain(self, row):
+        """Explanation of the prediction for one encoded row (shared between rows; do not modify)"""
+        leaf = self.leaf(row)
+        explanation = self._cache.get(leaf)
+        if explanation is None:
+            explanation = self._cache[leaf] = self._build(leaf)
+        return explanation
+
+    def _build(self, leaf):
+        path = [leaf]
+        while self.parent[path[-1]] != TREE_LEAF:
+            path.append(self.parent[path[-1]])
+        path.reverse()
+
+        leaf_proba = self.proba[leaf]
+        predicted = max(range(len(leaf_proba)), key=leaf_proba.__getitem__)
+        bounds = {}
+        contributions = {}
+        for node, child in zip(path, path[1:]):
+            index = self.feature[node]
+            _, _, encoding, allowed = FEATURES[index]
+            low, high = bounds.get(index, _domain(encoding, allowed))
+            # Features are integer-coded, so "<= 4.5" means at most 4 and "> 4.5" at least 5
+            if child == self.left[node]:
+                high = min(high, int(self.threshold[node]))
+            else:
+                low = max(low, int(self.threshold[node]) + 1)
+            bounds[index] = (low, high)
+            contributions[index] = (contributions.get(index, 0.0)
+                                    + self.proba[child][predicted] - self.proba[node][predicted])
+
+        ranked = sorted(contributions, key=lambda index: abs(contributions[index]), reverse=True)
+        conditions = []
+        for index in ranked[:self.top_n]:
+            field, _, encoding, allowed = FEATURES[index]
+            conditions.append({
+                'feature': field,
+                'text': describe_range(field, encoding, allowed, *bounds[index]),
+                'contribution': round(contributions[index], 4),
+            })
+        return {
+            'role': self.classes[predicted],
+            'confidence': round(leaf_proba[predicted], 4),
+            'prior': round(self.proba[0][predicted], 4),
+            'depth': len(path) - 1,
+            'leaf': leaf,
+            'conditions': conditions,
+        }
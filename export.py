@@ -0,0 +1,225 @@
+# Streaming export of users and prediction history for the data warehouse.
+#
+# Rows are read in id order with one SQLite cursor and written chunk by chunk (--chunk-rows), so
+# memory stays flat however large the tables are. The saved answers of each prediction are decoded
+# into one integer column per feature. Every run exports only rows added since the previous run:
+# the last exported id of each table and format is kept in <out>/watermark.json, as
+# {"user_predictions": {"csv": 123, "parquet": 0}}, and advanced once that format's file is
+# complete, so a format added later starts from id 0. Formats at the same watermark share one read
+# of the table. Each run writes one part file per table and format; --full starts again from id 0
+# and replaces the earlier parts of the formats it writes:
+#   <out>/users/part-<first id>-<last id>.csv.gz
+#   <out>/user_predictions/part-<first id>-<last id>.parquet
+# CSV (gzip) is always available; Parquet and Feather need pyarrow (pip install pyarrow).
+#
+#   python export.py --out exports                       # gzip CSV since the watermark
+#   python export.py --out exports --format csv parquet  # also Parquet
+#   python export.py --out exports --full                # ignore the watermark, export everything
+
+import os
+import csv
+import gzip
+import re
+import json
+import sqlite3
+import argparse
+import importlib.util
+
+from features import FEATURES
+from history import decode_inputs
+
+DB_PATH = 'career_predictor.db'
+CHUNK_ROWS = 10000
+FORMATS = ('csv', 'parquet', 'feather')
+EXTENSIONS = {'csv': '.csv.gz', 'parquet': '.parquet', 'feather': '.feather'}
+PART_NAME = re.compile(r'part-(\d+)-(\d+)(\..+)$')
+
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# Column name and Arrow type per exported column; password hashes and raw input strings stay behind
+TABLES = {
+    'users': {
+        'query': 'SELECT id, username, email, full_name, created_at FROM users WHERE id > ? AND id <= ? ORDER BY id',
+        'columns': [('id', 'int64'), ('username', 'string'), ('email', 'string'), ('full_name', 'string'),
+                    ('created_at', 'timestamp')],
+    },
+    'user_predictions': {
+        'query': 'SELECT id, user_id, prediction_result, created_at, input_data FROM user_predictions '
+                 'WHERE id > ? AND id <= ? ORDER BY id',
+        'columns': [('id', 'int64'), ('user_id', 'int64'), ('prediction_result', 'string'),
+                    ('created_at', 'timestamp')] + [(field, 'int8') for field, _, _, _ in FEATURES],
+    },
+}
+
+def _prediction_record(row):
+    prediction_id, user_id, role, created_at, input_data = row
+    answers = decode_inputs(input_data)
+    return (prediction_id, user_id, role, created_at) + tuple(
+        int(answers[field]) if field in answers else None for field, _, _, _ in FEATURES)
+
+def read_chunks(conn, table, after, upto, chunk_rows=CHUNK_ROWS):
+    """Yield lists of at most chunk_rows exported records with after < id <= upto"""
+    cursor = conn.execute(TABLES[table]['query'], (after, upto))
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            return
+        yield [_prediction_record(row) for row in rows] if table == 'user_predictions' else rows
+
+class CsvWriter:
+    def __init__(self, path, columns):
+        self.file = gzip.open(path, 'wt', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _ in columns])
+
+    def write(self, records):
+        self.writer.writerows(records)
+
+    def close(self):
+        self.file.close()
+
+class ArrowWriter:
+    """Parquet (one row group per chunk) or Feather written incrementally with pyarrow"""
+
+    def __init__(self, path, columns, fmt):
+        import pyarrow as pa
+        types = {'int64': pa.int64(), 'int8': pa.int8(), 'string': pa.string(), 'timestamp': pa.timestamp('s')}
+        self.columns = columns
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+
+    def write(self, records):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        arrays = []
+        for (name, kind), values in zip(self.columns, zip(*records)):
+            if kind == 'timestamp':
+                arrays.append(pc.strptime(pa.array(values, pa.string()), format='%Y-%m-%d %H:%M:%S',
+                                          unit='s', error_is_null=True))
+            else:
+                arrays.append(pa.array(values, self.schema.field(name).type))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+def load_watermark(out_dir):
+    """{table: {format: last exported id}}"""
+    try:
+        with open(os.path.join(out_dir, 'watermark.json'), encoding='utf-8') as f:
+            watermark = json.load(f)
+    except FileNotFoundError:
+        return {}
+    for table, marks in watermark.items():
+        if isinstance(marks, int):
+            # One id for every format, from before they were kept apart: it holds for the formats
+            # that have part files
+            names = os.listdir(os.path.join(out_dir, table)) if os.path.isdir(os.path.join(out_dir, table)) else []
+            written = {match.group(3) for match in map(PART_NAME.match, names) if match}
+            watermark[table] = {fmt: marks for fmt in FORMATS if EXTENSIONS[fmt] in written}
+    return watermark
+
+def save_watermark(out_dir, watermark):
+    path = os.path.join(out_dir, 'watermark.json')
+    tmp = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(watermark, f, indent=1)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def remove_parts(table_dir, formats, after, keep=()):
+    """Remove the part files of these formats holding any id > after, except the ones in keep"""
+    if not os.path.isdir(table_dir):
+        return
+    extensions = {EXTENSIONS[fmt] for fmt in formats}
+    for name in os.listdir(table_dir):
+        match = PART_NAME.match(name)
+        if match and match.group(3) in extensions and int(match.group(2)) > after and name not in keep:
+            os.remove(os.path.join(table_dir, name))
+
+def export_table(conn, table, out_dir, after, formats, chunk_rows=CHUNK_ROWS):
+    """Write the rows with id > after to one part file per format; returns (rows, last id)"""
+    upto = conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0]
+    table_dir = os.path.join(out_dir, table)
+    if upto <= after:
+        remove_parts(table_dir, formats, after)
+        return 0, after
+    os.makedirs(table_dir, exist_ok=True)
+    columns = TABLES[table]['columns']
+    paths = {fmt: os.path.join(table_dir, f"part-{after + 1:010d}-{upto:010d}{EXTENSIONS[fmt]}") for fmt in formats}
+    # Written under a temporary name of this process, so an interrupted run leaves no part file that
+    # looks complete and concurrent runs never write into the same file
+    tmps = {fmt: f"{path}.tmp-{os.getpid()}" for fmt, path in paths.items()}
+    rows = 0
+    try:
+        writers = {}
+        try:
+            for fmt, tmp in tmps.items():
+                writers[fmt] = CsvWriter(tmp, columns) if fmt == 'csv' else ArrowWriter(tmp, columns, fmt)
+            for records in read_chunks(conn, table, after, upto, chunk_rows):
+                for writer in writers.values():
+                    writer.write(records)
+                rows += len(records)
+        finally:
+            for writer in writers.values():
+                writer.close()
+        for fmt, path in paths.items():
+            os.replace(tmps[fmt], path)
+        # Parts of an earlier run that overlap this one (--full starts again from 0), so no row is exported twice
+        remove_parts(table_dir, formats, after, keep={os.path.basename(path) for path in paths.values()})
+    finally:
+        for tmp in tmps.values():
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return rows, upto
+
+def export(db_path=DB_PATH, out_dir='exports', formats=('csv',), full=False, chunk_rows=CHUNK_ROWS):
+    """Export the users and user_predictions rows each format lacks; returns {table: {format: (rows, last id)}}"""
+    os.makedirs(out_dir, exist_ok=True)
+    # Other formats keep their watermark, --full or not
+    watermark = load_watermark(out_dir)
+    conn = sqlite3.connect(db_path)
+    results = {}
+    try:
+        for table in TABLES:
+            marks = watermark.setdefault(table, {})
+            groups = {}
+            for fmt in formats:
+                groups.setdefault(0 if full else marks.get(fmt, 0), []).append(fmt)
+            results[table] = {}
+            for after, group in sorted(groups.items()):
+                result = export_table(conn, table, out_dir, after, group, chunk_rows)
+                for fmt in group:
+                    results[table][fmt] = result
+                    marks[fmt] = result[1]
+                save_watermark(out_dir, watermark)
+            results[table] = {fmt: results[table][fmt] for fmt in formats}
+    finally:
+        conn.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Export users and predictions to gzip CSV / Parquet / Feather")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--out", default="exports")
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["csv"])
+    parser.add_argument("--full", action="store_true", help="export every row, ignoring the watermark")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if not PYARROW_AVAILABLE and set(args.format) - {'csv'}:
+        raise SystemExit("Parquet and Feather export need pyarrow: pip install pyarrow")
+    results = export(args.db, args.out, args.format, args.full, args.chunk_rows)
+    for table, by_format in results.items():
+        for fmt, (rows, last_id) in by_format.items():
+            print(f"{table:<18}{fmt:<9}{rows:>10,} rows exported (watermark id {last_id})")
+
+if __name__ == "__main__":
+    main()
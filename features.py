@@ -0,0 +1,189 @@
+# The 21-feature input schema of the job role model.
+#
+# The model was trained (careerPredictionModel.ipynb) on label-encoded answers: yes/no as 1/0,
+# poor/medium/excellent as 0/1/2, the categorical answers as pandas category codes and the two
+# dummy-encoded questions as A_*/B_* flags. The Streamlit form and the HTTP service both encode
+# their input through this module, so the codes live in one place.
+
+import math
+
+TRAINING_DATA = 'data/mldata.csv'
+TARGET = 'Suggested Job Role'
+
+LEVELS = {"poor": 0, "medium": 1, "excellent": 2}
+
+CERTIFICATIONS = {
+    'information security': 4, 'shell programming': 8, 'r programming': 7,
+    'distro making': 1, 'machine learning': 5, 'full stack': 2,
+    'hadoop': 3, 'app development': 0, 'python': 6
+}
+
+BOOK_TYPES = {
+    'Series': 28, 'Autobiographies': 3, 'Travel': 29, 'Guide': 13,
+    'Health': 14, 'Journals': 17, 'Anthology': 1, 'Dictionaries': 9
+}
+
+WORKSHOPS = {
+    'testing': 6, 'database security': 2, 'game development': 3,
+    'data science': 1, 'system designing': 5, 'hacking': 4,
+    'cloud computing': 0, 'web technologies': 7
+}
+
+SUBJECTS = {
+    'programming': 9, 'Management': 2, 'data engineering': 5,
+    'networks': 7, 'Software Engineering': 3, 'cloud computing': 4,
+    'parallel computing': 8, 'IOT': 1, 'Computer Architecture': 0, 'hacking': 6
+}
+
+CAREER_AREAS = {
+    'testing': 5, 'system developer': 4, 'Business process analyst': 0,
+    'security': 3, 'developer': 2, 'cloud computing': 1
+}
+
+COMPANY_TYPES = {
+    'BPA': 0, 'Cloud Services': 1, 'product development': 9,
+    'Testing and Maintainance Services': 7, 'SAaS services': 4,
+    'Web Services': 8, 'Finance': 2, 'Sales and Marketing': 5,
+    'Product based': 3, 'Service Based': 6
+}
+
+# (JSON field, model column, encoding, allowed range or label mapping), in the model's column order
+FEATURES = [
+    ('logical_quotient_rating', 'Logical quotient rating', 'number', (1, 10)),
+    ('coding_skills_rating', 'coding skills rating', 'number', (1, 10)),
+    ('hackathons', 'hackathons', 'number', (0, 50)),
+    ('public_speaking_points', 'public speaking points', 'number', (1, 10)),
+    ('self_learning_capability', 'self-learning capability?', 'flag', None),
+    ('extra_courses', 'Extra-courses did', 'flag', None),
+    ('senior_inputs', 'Taken inputs from seniors or elders', 'flag', None),
+    ('worked_in_teams', 'worked in teams ever?', 'flag', None),
+    ('introvert', 'Introvert', 'flag', None),
+    ('reading_writing_skills', 'reading and writing skills', 'category', LEVELS),
+    ('memory_capability', 'memory capability score', 'category', LEVELS),
+    ('hard_worker', 'B_hard worker', 'flag', None),
+    ('smart_worker', 'B_smart worker', 'flag', None),
+    ('management', 'A_Management', 'flag', None),
+    ('technical', 'A_Technical', 'flag', None),
+    ('interested_subject', 'Interested subjects_code', 'category', SUBJECTS),
+    ('book_type', 'Interested Type of Books_code', 'category', BOOK_TYPES),
+    ('certification', 'certifications_code', 'category', CERTIFICATIONS),
+    ('workshop', 'workshops_code', 'category', WORKSHOPS),
+    ('company_type', 'Type of company want to settle in?_code', 'category', COMPANY_TYPES),
+    ('career_area', 'interested career area _code', 'category', CAREER_AREAS),
+]
+
+# How each feature is named when shown to users (explanations, reports)
+FEATURE_LABELS = {
+    'logical_quotient_rating': "Logical quotient rating",
+    'coding_skills_rating': "Coding skills rating",
+    'hackathons': "Hackathons",
+    'public_speaking_points': "Public speaking points",
+    'self_learning_capability': "Self-learning capability",
+    'extra_courses': "Extra courses",
+    'senior_inputs': "Inputs from seniors",
+    'worked_in_teams': "Worked in teams",
+    'introvert': "Introvert",
+    'reading_writing_skills': "Reading/writing skills",
+    'memory_capability': "Memory capability",
+    'hard_worker': "Hard worker",
+    'smart_worker': "Smart worker",
+    'management': "Aspires to management",
+    'technical': "Aspires to a technical role",
+    'interested_subject': "Interested subject",
+    'book_type': "Interested type of books",
+    'certification': "Certification",
+    'workshop': "Workshop attended",
+    'company_type': "Preferred company type",
+    'career_area': "Interested career area",
+}
+
+FEATURE_FIELDS = [field for field, _, _, _ in FEATURES]
+FEATURE_COLUMNS = [column for _, column, _, _ in FEATURES]
+
+class FeatureError(ValueError):
+    """Raised when an input record does not match the feature schema"""
+
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+def _encode(field, encoding, allowed, value):
+    if encoding == 'number':
+        # NaN and Infinity parse as JSON numbers but are not answers
+        if (isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value)
+                or value != int(value)):
+            raise ValueError(f"{field}: expected an integer")
+        low, high = allowed
+        if not low <= value <= high:
+            raise ValueError(f"{field}: expected a value from {low} to {high}")
+        return int(value)
+    if encoding == 'flag':
+        if isinstance(value, str) and value.lower() in ("yes", "no"):
+            return 1 if value.lower() == "yes" else 0
+        if value in (0, 1):
+            return int(value)
+        raise ValueError(f"{field}: expected true/false, 1/0 or yes/no")
+    # Categories accept the answer label or its encoded value
+    if isinstance(value, str) and value in allowed:
+        return allowed[value]
+    if isinstance(value, int) and not isinstance(value, bool) and value in allowed.values():
+        return value
+    raise ValueError(f"{field}: expected one of {', '.join(allowed)}")
+
+def encode_features(record):
+    """Encode one JSON record into the model's 21 feature values"""
+    if not isinstance(record, dict):
+        raise FeatureError(["expected an object of feature values"])
+    errors = []
+    row = []
+    for field, _, encoding, allowed in FEATURES:
+        if field not in record:
+            errors.append(f"{field}: missing")
+            continue
+        try:
+            row.append(_encode(field, encoding, allowed, record[field]))
+        except ValueError as e:
+            errors.append(str(e))
+    unknown = sorted(set(record) - set(FEATURE_FIELDS))
+    if unknown:
+        errors.append(f"unknown fields: {', '.join(unknown)}")
+    if errors:
+        raise FeatureError(errors)
+    return row
+
+def to_frame(rows):
+    """Encoded rows as the DataFrame the model was fitted on"""
+    import pandas as pd
+    return pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+
+def feature_schema():
+    """Field names, types and allowed values, as served by the HTTP service"""
+    schema = []
+    for field, column, encoding, allowed in FEATURES:
+        entry = {'field': field, 'column': column, 'type': encoding}
+        if encoding == 'number':
+            entry['min'], entry['max'] = allowed
+        elif encoding == 'category':
+            entry['values'] = list(allowed)
+        schema.append(entry)
+    return schema
+
+def encode_training_frame(df):
+    """Encode raw survey answers exactly as the notebook did before training"""
+    import pandas as pd
+    df = df.copy()
+    for column in ['self-learning capability?', 'Extra-courses did', 'Taken inputs from seniors or elders',
+                   'worked in teams ever?', 'Introvert']:
+        df[column] = df[column].map({'yes': 1, 'no': 0})
+    for column in ['reading and writing skills', 'memory capability score']:
+        df[column] = df[column].map(LEVELS)
+    for column in ['certifications', 'workshops', 'Interested subjects', 'interested career area ',
+                   'Type of company want to settle in?', 'Interested Type of Books']:
+        df[column + '_code'] = df[column].astype('category').cat.codes
+    df = pd.get_dummies(df, columns=['Management or Technical', 'hard/smart worker'], prefix=['A', 'B'], dtype=int)
+    return df[FEATURE_COLUMNS], df[TARGET]
+
+def load_training_data(path=TRAINING_DATA):
+    """The training CSV as (encoded features, job roles), read from the columnar cache in dataset.py"""
+    from dataset import load_encoded
+    return load_encoded(path)
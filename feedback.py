@@ -0,0 +1,63 @@
+# User feedback on predictions: the labelled rows the model refresh learns from.
+#
+# Under a saved prediction, a logged-in user can confirm the role or pick the right one. Each answer
+# is stored in prediction_feedback next to the role the model gave. Answering again for the same
+# prediction replaces the earlier row under a new id. refresh_model.py reads only the rows with an
+# id above its checkpoint, so every refresh sees just the feedback given since the previous one
+# (a changed answer is seen again).
+
+import sqlite3
+
+DB_PATH = 'career_predictor.db'
+
+def init_feedback_table(db_path=DB_PATH):
+    """Create the prediction_feedback table"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS prediction_feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        prediction_id INTEGER UNIQUE NOT NULL,
+        user_id INTEGER NOT NULL,
+        predicted_role TEXT,
+        role TEXT NOT NULL,
+        created_at TIMESTAMP,
+        FOREIGN KEY (prediction_id) REFERENCES user_predictions (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+    conn.commit()
+    conn.close()
+
+def record_feedback(cursor, user_id, prediction_id, role, created_at):
+    """Store the user's role for one of their predictions; False if the prediction is not theirs"""
+    row = cursor.execute('SELECT prediction_result FROM user_predictions WHERE id = ? AND user_id = ?',
+                         (prediction_id, user_id)).fetchone()
+    if row is None:
+        return False
+    cursor.execute('''
+        INSERT OR REPLACE INTO prediction_feedback (prediction_id, user_id, predicted_role, role, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (prediction_id, user_id, row[0], role, created_at))
+    return True
+
+def load_feedback(conn, user_id, prediction_id):
+    """The role the user gave for one of their predictions, or None"""
+    row = conn.execute('SELECT role FROM prediction_feedback WHERE prediction_id = ? AND user_id = ?',
+                       (prediction_id, user_id)).fetchone()
+    return row[0] if row else None
+
+def read_feedback(conn, after, upto, chunk_rows=10000):
+    """Yield lists of (feedback id, prediction id, input_data, role) with after < id <= upto, in id order"""
+    cursor = conn.execute('''
+        SELECT f.id, f.prediction_id, p.input_data, f.role
+        FROM prediction_feedback f JOIN user_predictions p ON p.id = f.prediction_id
+        WHERE f.id > ? AND f.id <= ? ORDER BY f.id
+    ''', (after, upto))
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            return
+        yield rows
@@ -0,0 +1,210 @@
+# Micro-batching scheduler for job role predictions.
+#
+# Concurrent callers (Streamlit sessions, service request threads) each submit a few encoded rows.
+# One scheduler thread collects the pending requests for up to max_wait_ms or max_batch_size rows,
+# runs a single vectorized predict_proba over all of them and hands every caller its own slice.
+# The rows of requests submitted with observe=True (real user inputs, not what-if variants) are
+# then queued for the candidate model of a shadow evaluator (shadow.py) and counted into the
+# input histograms of a drift monitor (drift.py), when those are attached.
+# Environment variables:
+#   CAREERPATH_MODEL_PATH          model artifact to serve: job_role_model.pkl (default) or a cascade
+#                                  from train_cascade.py
+#   CAREERPATH_BATCH_MAX_WAIT_MS   longest a request waits for others to join its batch (default 2)
+#   CAREERPATH_BATCH_MAX_SIZE      rows per model call (default 64)
+#   CAREERPATH_BATCH_MAX_QUEUE     pending requests before new ones are rejected (default 10000)
+#   CAREERPATH_BATCH_TIMEOUT_S     longest a caller waits for its answer (default 30)
+
+import os
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from features import to_frame
+
+MODEL_PATH = os.getenv("CAREERPATH_MODEL_PATH", "job_role_model.pkl")
+MAX_WAIT_MS = float(os.getenv("CAREERPATH_BATCH_MAX_WAIT_MS", "2"))
+MAX_BATCH_SIZE = int(os.getenv("CAREERPATH_BATCH_MAX_SIZE", "64"))
+MAX_QUEUE = int(os.getenv("CAREERPATH_BATCH_MAX_QUEUE", "10000"))
+REQUEST_TIMEOUT = float(os.getenv("CAREERPATH_BATCH_TIMEOUT_S", "30"))
+
+# Queue-wait and batch-time samples kept for the percentiles in stats()
+METRIC_WINDOW = 2000
+
+log = logging.getLogger(__name__)
+
+class SchedulerOverloaded(RuntimeError):
+    """Raised when the scheduler queue is full"""
+
+class SchedulerTimeout(SchedulerOverloaded):
+    """Raised when a request is not answered within its timeout"""
+
+class _Request:
+    __slots__ = ('rows', 'observe', 'future', 'enqueued')
+
+    def __init__(self, rows, observe):
+        self.rows = rows
+        self.observe = observe
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+class BatchScheduler:
+    """Coalesce concurrent prediction requests into vectorized predict_proba calls"""
+
+    def __init__(self, model, max_wait_ms=MAX_WAIT_MS, max_batch_size=MAX_BATCH_SIZE, max_queue=MAX_QUEUE,
+                 shadow=None, monitor=None):
+        self.model = model
+        self.shadow = shadow
+        self.monitor = monitor
+        self.classes = [str(c) for c in model.classes_]
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._metrics_lock = threading.Lock()
+        self._queue_wait_ms = deque(maxlen=METRIC_WINDOW)
+        self._batch_ms = deque(maxlen=METRIC_WINDOW)
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.failed_batches = 0
+        self._thread = threading.Thread(target=self._run, name="prediction-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, rows, observe=True):
+        """Queue encoded rows; the returned Future resolves to one probability row per input row.
+        Rows that are not real user inputs (e.g. what-if variants) are submitted with observe=False."""
+        request = _Request(rows, observe)
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._metrics_lock:
+                self.rejected += 1
+            raise SchedulerOverloaded(f"{self._queue.maxsize} prediction requests already queued")
+        return request.future
+
+    def predict_proba(self, rows, timeout=REQUEST_TIMEOUT, observe=True):
+        try:
+            return self.submit(rows, observe).result(timeout)
+        except FutureTimeout:
+            with self._metrics_lock:
+                self.timed_out += 1
+            raise SchedulerTimeout(f"no answer within {timeout}s") from None
+
+    def predict(self, rows, timeout=REQUEST_TIMEOUT):
+        """Most likely role per row (the same argmax DecisionTreeClassifier.predict takes)"""
+        return [self.classes[max(range(len(p)), key=p.__getitem__)] for p in self.predict_proba(rows, timeout)]
+
+    def top_k(self, rows, k, timeout=REQUEST_TIMEOUT):
+        """The k most likely roles per row with their probabilities"""
+        results = []
+        for p in self.predict_proba(rows, timeout):
+            ranked = sorted(range(len(p)), key=p.__getitem__, reverse=True)[:k]
+            results.append([{'role': self.classes[i], 'probability': round(float(p[i]), 4)} for i in ranked])
+        return results
+
+    def _collect(self):
+        """Block for one request, then gather more until the batch is full or the first has waited max_wait"""
+        pending = [self._queue.get()]
+        size = len(pending[0].rows)
+        deadline = pending[0].enqueued + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(request)
+            size += len(request.rows)
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            started = time.perf_counter()
+            rows = [row for request in pending for row in request.rows]
+            try:
+                probabilities = self.model.predict_proba(to_frame(rows))
+            except Exception as e:
+                for request in pending:
+                    request.future.set_exception(e)
+                continue
+            offset = 0
+            for request in pending:
+                request.future.set_result(probabilities[offset:offset + len(request.rows)])
+                offset += len(request.rows)
+            # This is the only scheduler thread: a failure after the answers must not stop it
+            try:
+                self._after_batch(pending, probabilities, started)
+            except Exception:
+                with self._metrics_lock:
+                    self.failed_batches += 1
+                log.exception("post-answer work failed for a batch of %d rows", len(rows))
+
+    def _after_batch(self, pending, probabilities, started):
+        """Metrics, then the observed rows to the shadow evaluator and the drift monitor"""
+        roles = probabilities.argmax(axis=1)
+        observed, observed_roles = [], []
+        offset = 0
+        for request in pending:
+            # Synthetic rows (observe=False, e.g. what-if variants) reach neither the shadow nor the monitor
+            if request.observe:
+                observed.extend(request.rows)
+                observed_roles.extend(self.classes[i] for i in roles[offset:offset + len(request.rows)])
+            offset += len(request.rows)
+        batch_ms = self._record(pending, offset, started)
+        if not observed:
+            return
+        # Callers already have their answers; the candidate model only sees the rows afterwards
+        if self.shadow is not None:
+            self.shadow.submit(observed, observed_roles, batch_ms)
+        if self.monitor is not None:
+            self.monitor.observe(observed)
+
+    def _record(self, pending, size, started):
+        batch_ms = (time.perf_counter() - started) * 1000
+        with self._metrics_lock:
+            self.requests += len(pending)
+            self.rows += size
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, size)
+            self._batch_ms.append(batch_ms)
+            self._queue_wait_ms.extend((started - request.enqueued) * 1000 for request in pending)
+        return batch_ms
+
+    def stats(self):
+        """Counters and recent queue-wait / batch-time percentiles, plus the model's own (e.g. escalation rate)"""
+        model_stats = self.model.stats() if hasattr(self.model, 'stats') else {}
+        if self.shadow is not None:
+            model_stats.update(self.shadow.stats())
+        if self.monitor is not None:
+            model_stats.update(self.monitor.stats())
+        with self._metrics_lock:
+            return {
+                **model_stats,
+                'max_wait_ms': self.max_wait * 1000,
+                'max_batch_size': self.max_batch_size,
+                'queue_depth': self._queue.qsize(),
+                'requests': self.requests,
+                'rows': self.rows,
+                'batches': self.batches,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'failed_batches': self.failed_batches,
+                'mean_batch_rows': round(self.rows / self.batches, 2) if self.batches else None,
+                'largest_batch': self.largest_batch,
+                'p50_queue_wait_ms': _percentile(self._queue_wait_ms, 0.5),
+                'p95_queue_wait_ms': _percentile(self._queue_wait_ms, 0.95),
+                'p50_batch_ms': _percentile(self._batch_ms, 0.5),
+                'p95_batch_ms': _percentile(self._batch_ms, 0.95),
+            }
@@ -0,0 +1,256 @@
+# Pluggable transports for OpenAI chat completions.
+#
+# The app only ever calls client.chat.completions.create(...), so every transport below
+# exposes that same call shape. The mode is picked with the CAREERPATH_LLM_MODE environment variable:
+#   live      - the real OpenAI client (default)
+#   record    - the real OpenAI client, with every response and its latency saved as a fixture
+#   replay    - responses served from the fixture store, no network or API key needed
+#   synthetic - generated filler responses of a configurable length, no network or API key needed
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+LLM_MODES = ("live", "record", "replay", "synthetic")
+
+LLM_MODE = os.getenv("CAREERPATH_LLM_MODE", "live").lower()
+FIXTURE_DIR = os.getenv("CAREERPATH_LLM_FIXTURES", "llm_fixtures")
+# Replay: sleep for the recorded time to first token and per-chunk gaps
+REPLAY_LATENCY = os.getenv("CAREERPATH_LLM_REPLAY_LATENCY", "0") == "1"
+# Synthetic: response length in tokens, time to first token and generation speed
+SYNTHETIC_TOKENS = int(os.getenv("CAREERPATH_LLM_SYNTHETIC_TOKENS", "800"))
+SYNTHETIC_TTFT = float(os.getenv("CAREERPATH_LLM_SYNTHETIC_TTFT", "0"))
+SYNTHETIC_TOKENS_PER_SEC = float(os.getenv("CAREERPATH_LLM_SYNTHETIC_TPS", "0"))
+
+SYNTHETIC_WORDS = [
+    "learn", "build", "deploy", "python", "project", "roadmap", "skills", "course", "practice",
+    "portfolio", "certification", "framework", "testing", "cloud", "database", "security",
+    "design", "api", "milestone", "interview", "community", "docs", "review", "career"
+]
+
+class FixtureNotFoundError(KeyError):
+    """Raised in replay mode when no fixture was recorded for a request"""
+
+def request_key(kwargs):
+    """Stable fixture key for a chat.completions.create request"""
+    fields = {k: kwargs.get(k) for k in ("model", "messages", "temperature", "max_tokens")}
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token) for the synthetic transport"""
+    return max(1, len(text) // 4)
+
+def include_usage(kwargs):
+    """Whether a streamed request asked for the final usage chunk"""
+    return bool((kwargs.get("stream_options") or {}).get("include_usage"))
+
+def make_response(content, model, usage):
+    """Build an object shaped like an OpenAI ChatCompletion"""
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(index=0, finish_reason="stop",
+                                 message=SimpleNamespace(role="assistant", content=content))],
+        usage=usage
+    )
+
+def make_chunk(content, model, finish_reason=None):
+    """Build an object shaped like an OpenAI ChatCompletionChunk"""
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(index=0, finish_reason=finish_reason,
+                                 delta=SimpleNamespace(role="assistant", content=content))],
+        usage=None
+    )
+
+def make_usage_chunk(model, usage):
+    """The last chunk of a stream with include_usage: the usage, and no choices"""
+    return SimpleNamespace(model=model, choices=[], usage=usage)
+
+def make_usage(prompt_tokens, completion_tokens):
+    """Build an object shaped like OpenAI usage data, or None when the counts are unknown"""
+    if prompt_tokens is None or completion_tokens is None:
+        return None
+    return SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                           total_tokens=prompt_tokens + completion_tokens)
+
+def prompt_tokens_for(kwargs):
+    """Estimated prompt size of a request"""
+    return sum(estimate_tokens(m.get("content") or "") for m in kwargs.get("messages", []))
+
+class FixtureStore:
+    """One JSON file per request key in a local directory"""
+
+    def __init__(self, directory=FIXTURE_DIR):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        return self.directory / f"{key}.json"
+
+    def load(self, key):
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise FixtureNotFoundError(key)
+
+    def save(self, key, fixture):
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path(key).with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(fixture, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path(key))
+
+class _Completions:
+    def __init__(self, create):
+        self.create = create
+
+class _Chat:
+    def __init__(self, create):
+        self.completions = _Completions(create)
+
+class RecordingClient:
+    """Forward requests to a real client and save each response with its latency profile and usage"""
+
+    def __init__(self, client, store):
+        self.client = client
+        self.store = store
+        self.chat = _Chat(self._create)
+
+    def _create(self, **kwargs):
+        key = request_key(kwargs)
+        started = time.perf_counter()
+        if kwargs.get("stream"):
+            return self._record_stream(key, kwargs, started)
+        response = self.client.chat.completions.create(**kwargs)
+        latency = time.perf_counter() - started
+        content = response.choices[0].message.content or ""
+        usage = getattr(response, "usage", None)
+        self.store.save(key, {
+            "request": {k: v for k, v in kwargs.items() if k not in ("stream", "stream_options")},
+            "content": content,
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+            "latency_s": latency,
+            "ttft_s": latency,
+            "chunks": [[content, latency]]
+        })
+        return response
+
+    def _record_stream(self, key, kwargs, started):
+        chunks = []
+        usage = None
+        last = started
+        # Always stream with include_usage, so the fixture keeps the usage the API returned; the usage
+        # chunk is passed on only to callers that asked for it
+        forward_usage = include_usage(kwargs)
+        options = dict(kwargs.get("stream_options") or {}, include_usage=True)
+        for chunk in self.client.chat.completions.create(**dict(kwargs, stream_options=options)):
+            now = time.perf_counter()
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                chunks.append([delta, now - last])
+                last = now
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+                if not chunk.choices and not forward_usage:
+                    continue
+            yield chunk
+        content = "".join(text for text, _ in chunks)
+        self.store.save(key, {
+            "request": {k: v for k, v in kwargs.items() if k not in ("stream", "stream_options")},
+            "content": content,
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+            "latency_s": last - started,
+            "ttft_s": chunks[0][1] if chunks else last - started,
+            "chunks": chunks
+        })
+
+class ReplayClient:
+    """Serve recorded fixtures, optionally reproducing the recorded latency profile"""
+
+    def __init__(self, store, latency=REPLAY_LATENCY):
+        self.store = store
+        self.latency = latency
+        self.chat = _Chat(self._create)
+
+    def _create(self, **kwargs):
+        fixture = self.store.load(request_key(kwargs))
+        model = kwargs.get("model")
+        usage = make_usage(fixture.get("prompt_tokens"), fixture.get("completion_tokens"))
+        if kwargs.get("stream"):
+            return self._replay_stream(fixture, model, usage if include_usage(kwargs) else None)
+        if self.latency:
+            time.sleep(fixture["latency_s"])
+        return make_response(fixture["content"], model, usage)
+
+    def _replay_stream(self, fixture, model, usage):
+        for text, gap in fixture["chunks"]:
+            if self.latency:
+                time.sleep(gap)
+            yield make_chunk(text, model)
+        yield make_chunk(None, model, finish_reason="stop")
+        if usage:
+            yield make_usage_chunk(model, usage)
+
+class SyntheticClient:
+    """Generate deterministic filler responses of a configurable length"""
+
+    def __init__(self, tokens=SYNTHETIC_TOKENS, ttft=SYNTHETIC_TTFT, tokens_per_sec=SYNTHETIC_TOKENS_PER_SEC):
+        self.tokens = tokens
+        self.ttft = ttft
+        self.tokens_per_sec = tokens_per_sec
+        self.chat = _Chat(self._create)
+
+    def _words(self, kwargs):
+        rng = random.Random(request_key(kwargs))
+        count = min(self.tokens, kwargs.get("max_tokens") or self.tokens)
+        return [rng.choice(SYNTHETIC_WORDS) for _ in range(count)]
+
+    def _create(self, **kwargs):
+        words = self._words(kwargs)
+        model = kwargs.get("model")
+        usage = make_usage(prompt_tokens_for(kwargs), len(words))
+        if kwargs.get("stream"):
+            return self._stream(words, model, usage if include_usage(kwargs) else None)
+        delay = self.ttft + (len(words) / self.tokens_per_sec if self.tokens_per_sec else 0)
+        if delay:
+            time.sleep(delay)
+        return make_response(" ".join(words), model, usage)
+
+    def _stream(self, words, model, usage):
+        if self.ttft:
+            time.sleep(self.ttft)
+        gap = 1 / self.tokens_per_sec if self.tokens_per_sec else 0
+        for i, word in enumerate(words):
+            if gap and i:
+                time.sleep(gap)
+            yield make_chunk(word if i == 0 else " " + word, model)
+        yield make_chunk(None, model, finish_reason="stop")
+        if usage:
+            yield make_usage_chunk(model, usage)
+
+def build_client(api_key=None, mode=None, fixture_dir=None):
+    """Create the chat client for the configured transport mode"""
+    mode = (mode or LLM_MODE).lower()
+    if mode not in LLM_MODES:
+        raise ValueError(f"Unknown LLM transport mode: {mode} (expected one of {', '.join(LLM_MODES)})")
+    store = FixtureStore(fixture_dir or FIXTURE_DIR)
+    if mode == "replay":
+        return ReplayClient(store)
+    if mode == "synthetic":
+        return SyntheticClient()
+
+    from openai import OpenAI
+    client = OpenAI(api_key=api_key)
+    if mode == "record":
+        return RecordingClient(client, store)
+    return client
@@ -0,0 +1,197 @@
+# "Profiles like you": nearest neighbours of a profile among the training profiles.
+#
+# Similarity is the number of answers two profiles share (Hamming distance over the 21 encoded
+# answers of features.py). The index is built once, after the model is exported, and saved with
+# joblib so the app and the service memory-map it instead of reading it into every process:
+#   - codes: the encoded training profiles as an int8 matrix, and their roles
+#   - for large datasets, a multi-index: the answers are split into blocks, and for each block the
+#     profiles are sorted by the block's combined answer key. A query looks up the profiles that
+#     match it exactly on at least one block (a binary search per block) and ranks only those, so
+#     the work per query follows the bucket sizes instead of the dataset size. The number of blocks
+#     is picked at build time to keep the expected candidates under CANDIDATE_BUDGET.
+# Indexes of up to EXACT_SCAN_ROWS profiles (the shipped dataset has 6,901) skip the blocks: one
+# vectorized comparison against every profile is exact and already well under a millisecond.
+# Environment variables:
+#   CAREERPATH_NEIGHBORS_PATH   index artifact (default neighbors_index.joblib; built in memory from
+#                               the training data when the file is missing)
+#
+#   python neighbors.py                     # writes neighbors_index.joblib from data/mldata.csv
+
+import os
+import time
+import argparse
+import warnings
+
+import numpy as np
+
+from features import FEATURES, FEATURE_LABELS, TRAINING_DATA, load_training_data
+from sensitivity import value_label
+
+NEIGHBORS_PATH = os.getenv("CAREERPATH_NEIGHBORS_PATH", "neighbors_index.joblib")
+EXACT_SCAN_ROWS = 20000
+CANDIDATE_BUDGET = 2000
+DEFAULT_NEIGHBORS = 10
+
+def _block_keys(codes, block, radix):
+    """One int64 key per profile combining its answers to the block's features"""
+    keys = np.zeros(len(codes), dtype=np.int64)
+    for index in block:
+        keys = keys * radix[index] + codes[:, index]
+    return keys
+
+def _split_blocks(distinct, count):
+    """Split the features into blocks with roughly equal numbers of answer combinations"""
+    blocks = [[] for _ in range(count)]
+    weights = [0.0] * count
+    for index in sorted(range(len(distinct)), key=lambda i: -distinct[i]):
+        lightest = min(range(count), key=weights.__getitem__)
+        blocks[lightest].append(index)
+        weights[lightest] += np.log(max(distinct[index], 2))
+    return [sorted(block) for block in blocks]
+
+def _expected_candidates(codes, blocks, radix):
+    """Mean bucket size a profile drawn from the data would hit, summed over the blocks"""
+    total = 0.0
+    for block in blocks:
+        _, counts = np.unique(_block_keys(codes, block, radix), return_counts=True)
+        total += float((counts.astype(np.float64) ** 2).sum()) / len(codes)
+    return total
+
+def build_index(codes, roles, classes, exact_scan_rows=EXACT_SCAN_ROWS, candidate_budget=CANDIDATE_BUDGET):
+    """The index arrays for encoded profiles (rows in FEATURES order) and their role codes"""
+    codes = np.ascontiguousarray(codes, dtype=np.int8)
+    radix = [max(int(codes[:, i].max()) + 1, 2) for i in range(codes.shape[1])]
+    index = {
+        'codes': codes,
+        'roles': np.asarray(roles, dtype=np.int16),
+        'classes': [str(c) for c in classes],
+        'radix': radix,
+        'blocks': [],
+        'keys': [],
+        'order': [],
+    }
+    if len(codes) <= exact_scan_rows:
+        return index
+
+    # More blocks find more of the true neighbours (a neighbour differing in fewer answers than there
+    # are blocks always shares one block) but every block adds its bucket to the candidates
+    distinct = [len(np.unique(codes[:, i])) for i in range(codes.shape[1])]
+    blocks = _split_blocks(distinct, 2)
+    for count in range(3, codes.shape[1] + 1):
+        wider = _split_blocks(distinct, count)
+        if _expected_candidates(codes, wider, radix) > candidate_budget:
+            break
+        blocks = wider
+    for block in blocks:
+        keys = _block_keys(codes, block, radix)
+        order = np.argsort(keys, kind='stable').astype(np.int32)
+        index['blocks'].append(block)
+        index['keys'].append(keys[order])
+        index['order'].append(order)
+    return index
+
+def build_from_training_data(path=TRAINING_DATA, **kwargs):
+    X, y = load_training_data(path)
+    classes, roles = np.unique(y.astype(str), return_inverse=True)
+    return build_index(X.to_numpy(), roles, classes, **kwargs)
+
+class NeighborIndex:
+    """k most similar training profiles and their role distribution for one encoded row"""
+
+    def __init__(self, index):
+        self.codes = index['codes']
+        self.roles = index['roles']
+        self.classes = index['classes']
+        self.radix = index['radix']
+        self.blocks = list(zip(index['blocks'], index['keys'], index['order']))
+
+    @classmethod
+    def load(cls, path=NEIGHBORS_PATH):
+        """Memory-map a saved index, or build one from the training data when there is no file"""
+        if os.path.exists(path):
+            import joblib
+            return cls(joblib.load(path, mmap_mode='r'))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return cls(build_from_training_data())
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _candidates(self, query):
+        """Profiles sharing at least one whole block of answers with the query"""
+        buckets = []
+        for block, keys, order in self.blocks:
+            key = 0
+            for index in block:
+                key = key * self.radix[index] + int(query[index])
+            start, stop = np.searchsorted(keys, [key, key + 1])
+            buckets.append(order[start:stop])
+        return np.unique(np.concatenate(buckets))
+
+    def nearest(self, row, k=DEFAULT_NEIGHBORS):
+        """Indices and differing-answer counts of the k nearest profiles, and whether the search was exact"""
+        query = np.asarray(row, dtype=np.int8)
+        if self.blocks:
+            candidates = self._candidates(query)
+            if len(candidates) >= k:
+                distances = (self.codes[candidates] != query).sum(axis=1, dtype=np.int8)
+                # Stable, so ties go to the earlier profile and repeated queries agree
+                top = np.argsort(distances, kind='stable')[:k]
+                # Any profile outside the buckets differs in at least one answer per block
+                return candidates[top], distances[top], bool(distances[top[-1]] < len(self.blocks))
+        # int8 distances sort with a linear-time radix sort
+        distances = (self.codes != query).sum(axis=1, dtype=np.int8)
+        nearest = np.argsort(distances, kind='stable')[:k]
+        return nearest, distances[nearest], True
+
+    def query(self, row, k=DEFAULT_NEIGHBORS):
+        started = time.perf_counter()
+        nearest, distances, exact = self.nearest(row, k)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        counts = np.bincount(self.roles[nearest], minlength=len(self.classes))
+        roles = [{'role': self.classes[i], 'count': int(counts[i]), 'share': round(float(counts[i]) / len(nearest), 4)}
+                 for i in np.argsort(-counts, kind='stable') if counts[i]]
+        profiles = []
+        for position, distance in zip(nearest, distances):
+            codes = self.codes[position]
+            differences = []
+            for index, (field, _, encoding, allowed) in enumerate(FEATURES):
+                if codes[index] != row[index]:
+                    differences.append({'feature': field, 'answer': FEATURE_LABELS[field],
+                                        'value': value_label(encoding, allowed, int(codes[index]))})
+            profiles.append({
+                'role': self.classes[self.roles[position]],
+                'matching': len(FEATURES) - int(distance),
+                'differences': differences,
+            })
+        return {
+            'k': len(profiles),
+            'profiles_indexed': len(self),
+            'exact': exact,
+            'elapsed_ms': round(elapsed_ms, 3),
+            'roles': roles,
+            'profiles': profiles,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the profiles-like-you index from the training data")
+    parser.add_argument("--data", default=TRAINING_DATA)
+    parser.add_argument("--output", default=NEIGHBORS_PATH)
+    args = parser.parse_args()
+
+    import joblib
+    started = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        index = build_from_training_data(args.data)
+    build_s = time.perf_counter() - started
+    # Uncompressed, so NeighborIndex.load can memory-map the arrays
+    joblib.dump(index, args.output)
+    search = f"{len(index['blocks'])} blocks" if index['blocks'] else "exact scan"
+    print(f"Indexed {len(index['codes']):,} profiles ({search}) in {build_s:.2f}s")
+    print(f"Saved {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+if __name__ == "__main__":
+    main()
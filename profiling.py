@@ -0,0 +1,167 @@
+# Lightweight per-rerun timing and profiling for the Streamlit script.
+#
+# Streamlit reruns ui.py top to bottom on every widget interaction. begin_rerun() and end_rerun()
+# bracket one rerun; span() / timed() mark the DB calls, model inference, LLM calls and render
+# blocks inside it. Environment variables:
+#   CAREERPATH_TIMINGS=1       record spans, show the debug panel and append one JSON line per rerun
+#   CAREERPATH_TIMING_LOG      path of the JSON-lines log (default logs/rerun_timings.jsonl)
+#   CAREERPATH_PROFILE=1       run cProfile for every rerun and dump it to CAREERPATH_PROFILE_DIR; only one
+#                              profiler can be active at a time (Python 3.12+), so a rerun that starts
+#                              while another session's is profiled keeps its spans but is not profiled
+#   CAREERPATH_PROFILE_DIR     directory for .prof files (default profiles/), open with snakeviz or pstats
+
+import os
+import json
+import time
+import cProfile
+import datetime
+import threading
+import functools
+from pathlib import Path
+from contextlib import contextmanager
+
+TIMINGS_ENABLED = os.getenv("CAREERPATH_TIMINGS", "0") == "1"
+TIMING_LOG = os.getenv("CAREERPATH_TIMING_LOG", "logs/rerun_timings.jsonl")
+PROFILE_ENABLED = os.getenv("CAREERPATH_PROFILE", "0") == "1"
+PROFILE_DIR = os.getenv("CAREERPATH_PROFILE_DIR", "profiles")
+
+# Each Streamlit session runs its script in its own thread, so the open rerun is thread-local
+_local = threading.local()
+_log_lock = threading.Lock()
+# Held while a rerun is profiled
+_profile_lock = threading.Lock()
+skipped_profiles = 0
+
+def _start_profiler():
+    """An enabled cProfile.Profile, or None while another rerun (or tool) is profiling"""
+    global skipped_profiles
+    if not _profile_lock.acquire(blocking=False):
+        skipped_profiles += 1
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler outside this module is active
+        _profile_lock.release()
+        skipped_profiles += 1
+        return None
+    return profiler
+
+def _stop_profiler(profiler):
+    profiler.disable()
+    _profile_lock.release()
+
+def begin_rerun():
+    """Start timing (and optionally profiling) one script run"""
+    if not (TIMINGS_ENABLED or PROFILE_ENABLED):
+        return
+    stale = getattr(_local, 'rerun', None)
+    if stale is not None and stale['profiler'] is not None:
+        # The previous run died before end_rerun(); never leave two profilers active
+        _stop_profiler(stale['profiler'])
+    profiler = _start_profiler() if PROFILE_ENABLED else None
+    _local.rerun = {'started': time.perf_counter(), 'spans': [], 'stack': [], 'profiler': profiler}
+
+@contextmanager
+def span(name, kind='render'):
+    """Time a block inside the current rerun; a no-op when timings are off"""
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is None or not TIMINGS_ENABLED:
+        yield
+        return
+    record = {'name': name, 'kind': kind, 'depth': len(rerun['stack']), 'child_ms': 0.0,
+              'start_ms': (time.perf_counter() - rerun['started']) * 1000}
+    rerun['stack'].append(record)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record['ms'] = (time.perf_counter() - started) * 1000
+        rerun['stack'].pop()
+        if rerun['stack']:
+            rerun['stack'][-1]['child_ms'] += record['ms']
+        rerun['spans'].append(record)
+
+def timed(kind, name=None):
+    """Decorator form of span() for DB, model and LLM functions"""
+    def decorator(fn):
+        label = name or fn.__name__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def timed_fragment(name, on_finish=None):
+    """Decorator for st.fragment functions; a fragment-only rerun is timed as its own rerun"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'rerun', None) is not None:
+                with span(f"fragment:{name}"):
+                    return fn(*args, **kwargs)
+            begin_rerun()
+            try:
+                with span(f"fragment:{name}"):
+                    return fn(*args, **kwargs)
+            finally:
+                summary = end_rerun(f"fragment:{name}")
+                if summary and on_finish:
+                    on_finish(summary)
+        return wrapper
+    return decorator
+
+def summarize_spans(spans):
+    """Self time per kind plus per-name call counts and totals"""
+    by_kind = {}
+    by_name = {}
+    for record in spans:
+        self_ms = record['ms'] - record['child_ms']
+        by_kind[record['kind']] = by_kind.get(record['kind'], 0.0) + self_ms
+        entry = by_name.setdefault(record['name'], {'kind': record['kind'], 'calls': 0, 'total_ms': 0.0})
+        entry['calls'] += 1
+        entry['total_ms'] += record['ms']
+    return {k: round(v, 2) for k, v in by_kind.items()}, by_name
+
+def end_rerun(page):
+    """Finish the current rerun; returns its timing summary (or None when timings are off)"""
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is None:
+        return None
+    _local.rerun = None
+    total_ms = (time.perf_counter() - rerun['started']) * 1000
+    timestamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+
+    if rerun['profiler'] is not None:
+        _stop_profiler(rerun['profiler'])
+        Path(PROFILE_DIR).mkdir(parents=True, exist_ok=True)
+        rerun['profiler'].dump_stats(str(Path(PROFILE_DIR) / f"rerun-{timestamp}-{page}.prof"))
+
+    if not TIMINGS_ENABLED:
+        return None
+
+    by_kind, by_name = summarize_spans(rerun['spans'])
+    tracked_ms = sum(by_kind.values())
+    summary = {
+        'timestamp': timestamp,
+        'page': page,
+        'total_ms': round(total_ms, 2),
+        'untracked_ms': round(max(total_ms - tracked_ms, 0.0), 2),
+        'by_kind': by_kind,
+        'spans': [{'name': r['name'], 'kind': r['kind'], 'depth': r['depth'],
+                   'start_ms': round(r['start_ms'], 2), 'ms': round(r['ms'], 2)}
+                  for r in sorted(rerun['spans'], key=lambda r: r['start_ms'])],
+        'by_name': {k: {'kind': v['kind'], 'calls': v['calls'], 'total_ms': round(v['total_ms'], 2)}
+                    for k, v in by_name.items()}
+    }
+    _append_log(summary)
+    return summary
+
+def _append_log(summary):
+    line = json.dumps(summary)
+    with _log_lock:
+        Path(TIMING_LOG).parent.mkdir(parents=True, exist_ok=True)
+        with open(TIMING_LOG, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
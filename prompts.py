@@ -0,0 +1,224 @@
+# Prompt templates and request settings for the career content generated with OpenAI.
+# Shared by ui.py and the offline benchmarks so both send identical requests; the standalone roadmap.py
+# keeps its own prompt and settings.
+
+# Roadmap generation functions
+def generate_roadmap_prompt(job_role):
+    """Generate a comprehensive prompt for detailed career roadmap"""
+    return f"""
+You are an expert career mentor and industry professional with 15+ years of experience. Create a comprehensive, detailed learning roadmap for someone who wants to become a {job_role}.
+
+REQUIREMENTS:
+1. **Structure**: Organize into clear phases with specific timelines
+2. **Specificity**: Include exact technologies, tools, and versions where relevant
+3. **Resources**: Provide specific course names, book titles, and platform recommendations
+4. **Projects**: Detail 5-7 hands-on projects with specific requirements
+5. **Certifications**: List industry-recognized certifications with exam codes
+6. **Skills Assessment**: Include measurable milestones for each phase
+7. **Industry Context**: Explain current market trends and salary expectations
+8. **Career Path**: Show progression from junior to senior levels
+
+ROADMAP STRUCTURE:
+## 🎯 {job_role} Complete Learning Roadmap
+
+### 📊 **Career Overview**
+- Current market demand and salary range
+- Key responsibilities and daily tasks
+- Career progression path (Junior → Mid → Senior → Lead)
+- Industry trends and future outlook
+
+### 🏗️ **Phase 1: Foundation (Months 1-3)**
+- **Core Technologies**: List 5-7 fundamental technologies
+- **Learning Resources**: 
+  - Specific online courses (Udemy, Coursera, Pluralsight)
+  - Essential books (with authors)
+  - YouTube channels and tutorials
+  - Free resources and documentation
+- **Hands-on Practice**: 2-3 beginner projects
+- **Milestone**: What you should be able to build/do after 3 months
+
+### 🚀 **Phase 2: Intermediate (Months 4-8)**
+- **Advanced Technologies**: Framework/tools for real-world development
+- **Learning Resources**: 
+  - Advanced courses and specializations
+  - Technical blogs and publications
+  - Community resources (Reddit, Discord, Stack Overflow)
+- **Projects**: 2-3 intermediate projects with specific features
+- **Networking**: Communities to join, conferences to attend
+- **Milestone**: Portfolio-worthy projects and skills
+
+### 🎓 **Phase 3: Advanced (Months 9-12)**
+- **Expert-Level Skills**: Architecture, optimization, best practices
+- **Specialization Areas**: Choose focus areas within the role
+- **Learning Resources**: 
+  - Professional courses and bootcamps
+  - Industry publications and research papers
+  - Open source contribution opportunities
+- **Capstone Projects**: 1-2 complex, production-ready projects
+- **Milestone**: Job-ready skills and professional portfolio
+
+### 💼 **Phase 4: Professional Development (Months 12+)**
+- **Industry Certifications**: Specific exam names and preparation resources
+- **Soft Skills**: Communication, leadership, project management
+- **Job Preparation**: 
+  - Resume building tips
+  - Interview preparation resources
+  - Portfolio presentation strategies
+- **Continuous Learning**: Staying updated with industry trends
+
+### 🛠️ **Detailed Project Portfolio**
+For each project, include:
+- Project description and objectives
+- Technologies and tools used
+- Key features to implement
+- Estimated time to complete
+- Learning outcomes
+- GitHub repository structure
+
+### 📚 **Comprehensive Resource Library**
+- **Free Resources**: (10+ specific links)
+- **Paid Courses**: (5+ course recommendations with platforms)
+- **Books**: (5+ essential books with authors)
+- **Tools & Software**: (Complete development environment setup)
+- **Communities**: (Discord servers, Reddit communities, professional groups)
+
+### 📜 **Certification Roadmap**
+- **Entry Level**: Beginner certifications (with exam codes)
+- **Professional**: Industry-standard certifications
+- **Expert**: Advanced/specialized certifications
+- **Preparation**: Study materials and practice exams
+
+### 💰 **Career Progression & Salary**
+- **Junior Level**: Expected salary range and responsibilities
+- **Mid Level**: Growth expectations and skills required
+- **Senior Level**: Leadership responsibilities and compensation
+- **Specialization**: High-demand niches and their requirements
+
+### 🎯 **Monthly Milestones Checklist**
+Create a month-by-month checklist of specific achievements and skills to master.
+
+Make this roadmap actionable, specific, and comprehensive. Include real course names, specific technologies with versions, actual book titles, and measurable milestones. The goal is to create a roadmap so detailed that someone could follow it step-by-step to become job-ready in 12 months.
+"""
+
+def generate_project_prompt(job_role, project_type="portfolio"):
+    """Generate specific project ideas for the job role"""
+    return f"""
+As a senior {job_role} and technical mentor, suggest 3 specific, detailed project ideas for someone learning to become a {job_role}.
+
+For each project, provide:
+1. **Project Name & Description**: Clear, engaging title and 2-3 sentence description
+2. **Technical Requirements**: Specific technologies, frameworks, and tools to use
+3. **Core Features**: 5-7 essential features to implement
+4. **Advanced Features**: 3-4 optional features for extra challenge
+5. **Learning Objectives**: What skills this project will teach
+6. **Time Estimate**: Realistic timeline for completion
+7. **Deployment Strategy**: How and where to host/deploy the project
+8. **Portfolio Value**: Why this project will impress employers
+
+Make these projects:
+- **Industry-relevant**: Based on real-world applications
+- **Scalable**: Can be enhanced over time
+- **Portfolio-worthy**: Impressive to potential employers
+- **Skill-building**: Cover different aspects of the {job_role} role
+- **Current**: Use modern, in-demand technologies
+
+Focus on projects that demonstrate both technical skills and business understanding.
+"""
+
+def generate_resources_prompt(job_role):
+    """Generate specific learning resources for the job role"""
+    return f"""
+As an expert {job_role} and career coach, provide a comprehensive list of specific learning resources for someone pursuing a {job_role} career.
+
+Organize resources into these categories:
+
+### 📚 **Books** (5-7 essential books)
+- Title, Author, Year
+- Brief description of what makes it valuable
+- Skill level (Beginner/Intermediate/Advanced)
+
+### 🎓 **Online Courses** (8-10 courses)
+- Course name, Platform (Udemy, Coursera, Pluralsight, etc.)
+- Instructor name if notable
+- Duration and cost
+- What specific skills it covers
+
+### 🆓 **Free Resources** (10+ resources)
+- YouTube channels with subscriber count
+- Documentation and official guides
+- Free coding platforms and tutorials
+- Open source projects to study
+
+### 🏆 **Certifications** (5-7 certifications)
+- Certification name and issuing organization
+- Exam code and cost
+- Prerequisites and preparation time
+- Industry recognition and value
+
+### 🛠️ **Tools & Software**
+- Development environment setup
+- Essential tools and their purposes
+- Browser extensions and productivity tools
+- Version control and collaboration tools
+
+### 👥 **Communities & Networking**
+- Reddit communities with member count
+- Discord servers and Slack groups
+- Professional associations and meetups
+- Twitter accounts and LinkedIn groups to follow
+
+### 📰 **Industry Publications**
+- Blogs, newsletters, and magazines
+- Technical publications and research sources
+- Podcasts and video channels
+- Conference talks and presentations
+
+### 💻 **Practice Platforms**
+- Coding challenge websites
+- Project-based learning platforms
+- Hackathon platforms
+- Open source contribution opportunities
+
+Make sure all resources are:
+- **Current**: Updated within the last 2 years
+- **Specific**: Include exact names, URLs where helpful
+- **Varied**: Different learning styles and budgets
+- **Actionable**: Clear next steps for each resource
+"""
+
+# Request settings per generated section (system message, sampling and length limits)
+SECTIONS = {
+    'roadmap': {
+        'prompt': generate_roadmap_prompt,
+        'system': "You are a senior industry professional and expert career mentor with deep knowledge of current technology trends, hiring practices, and career development. You provide detailed, actionable, and industry-relevant guidance.",
+        'temperature': 0.7,
+        'max_tokens': 4000
+    },
+    'projects': {
+        'prompt': generate_project_prompt,
+        'system': "You are a senior software architect and project manager who designs real-world, industry-relevant projects for skill development.",
+        'temperature': 0.8,
+        'max_tokens': 3000
+    },
+    'resources': {
+        'prompt': generate_resources_prompt,
+        'system': "You are an expert career coach and technical educator with comprehensive knowledge of learning resources across all technology domains.",
+        'temperature': 0.6,
+        'max_tokens': 3500
+    }
+}
+
+MODEL_NAME = "gpt-4o-mini"
+
+def build_request(section, job_role):
+    """Build the chat.completions.create keyword arguments for a section"""
+    settings = SECTIONS[section]
+    return {
+        'model': MODEL_NAME,
+        'messages': [
+            {"role": "system", "content": settings['system']},
+            {"role": "user", "content": settings['prompt'](job_role)}
+        ],
+        'temperature': settings['temperature'],
+        'max_tokens': settings['max_tokens']
+    }
@@ -0,0 +1,129 @@
+# Size- and latency-aware pruning sweep for the decision tree model.
+#
+# The exported job_role_model.pkl is a fully grown tree. This script sweeps cost-complexity pruning
+# (ccp_alpha) and max_depth on the notebook's training split, measures validation accuracy, node
+# count, artifact bytes, load time and predict latency for each setting, and exports the smallest
+# model whose validation accuracy is within the tolerance of the unpruned tree. The chosen setting
+# is refitted on the full training split and checked on the notebook's test split.
+#
+#   python prune_model.py                                  # writes job_role_model_pruned.pkl
+#   python prune_model.py --tolerance 0.01 --output job_role_model.pkl
+
+import io
+import time
+import argparse
+import warnings
+
+import joblib
+
+from features import load_training_data
+
+def artifact_stats(model):
+    """Serialized size and the time joblib.load needs to read it back"""
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    size = buffer.tell()
+    buffer.seek(0)
+    started = time.perf_counter()
+    joblib.load(buffer)
+    return size, (time.perf_counter() - started) * 1000
+
+def predict_ms(model, X, rows=200):
+    """Median latency of single-row predict calls, the way the app scores one profile"""
+    samples = []
+    for i in range(min(rows, len(X))):
+        row = X.iloc[i:i + 1]
+        started = time.perf_counter()
+        model.predict(row)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def describe(model, x_eval, y_eval):
+    started = time.perf_counter()
+    predicted = model.predict(x_eval)
+    # Vectorized time per row: tree traversal without the per-call input validation overhead
+    batch_us = (time.perf_counter() - started) * 1e6 / len(x_eval)
+    size, load_ms = artifact_stats(model)
+    return {
+        'accuracy': float((predicted == y_eval).mean()),
+        'nodes': int(model.tree_.node_count),
+        'depth': int(model.get_depth()),
+        'bytes': size,
+        'load_ms': load_ms,
+        'predict_ms': predict_ms(model, x_eval),
+        'batch_us': batch_us,
+    }
+
+def format_row(label, r):
+    return (f"{label:<24}{r['accuracy']:>9.4f}{r['nodes']:>8}{r['depth']:>7}{r['bytes']:>11,}"
+            f"{r['load_ms']:>9.2f}{r['predict_ms']:>9.3f}{r['batch_us']:>10.2f}")
+
+HEADER = f"{'bytes':>11}{'load ms':>9}{'ms/call':>9}{'us/row':>10}"
+
+def candidate_settings(x_fit, y_fit, alphas, depths):
+    """ccp_alpha values spread over the pruning path, and max_depth values"""
+    import numpy as np
+    from sklearn.tree import DecisionTreeClassifier
+    path = DecisionTreeClassifier(random_state=1).cost_complexity_pruning_path(x_fit, y_fit)
+    # The path has one alpha per pruning step (many repeated); sample the distinct values evenly,
+    # without the last one, which prunes the tree down to its root
+    path_alphas = np.unique(path.ccp_alphas)[:-1]
+    step = max(1, len(path_alphas) // alphas)
+    settings = [{'ccp_alpha': float(a)} for a in path_alphas[::step]]
+    settings += [{'max_depth': d} for d in depths]
+    return settings
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep ccp_alpha / max_depth and export the smallest accurate tree")
+    parser.add_argument("--data", default="data/mldata.csv")
+    parser.add_argument("--output", default="job_role_model_pruned.pkl")
+    parser.add_argument("--tolerance", type=float, default=0.005,
+                        help="validation accuracy the pruned tree may lose against the unpruned one")
+    parser.add_argument("--alphas", type=int, default=30, help="ccp_alpha values sampled from the pruning path")
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 4, 6, 8, 10, 12, 16, 20])
+    args = parser.parse_args()
+
+    from sklearn.tree import DecisionTreeClassifier
+    from sklearn.model_selection import train_test_split
+
+    X, y = load_training_data(args.data)
+    x_train, x_test, y_train, y_test = train_test_split(X, y, test_size=0.20, random_state=42)
+    x_fit, x_val, y_fit, y_val = train_test_split(x_train, y_train, test_size=0.25, random_state=42)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        production = joblib.load("job_role_model.pkl")
+    baseline = describe(DecisionTreeClassifier(random_state=1).fit(x_fit, y_fit), x_val, y_val)
+    floor = baseline['accuracy'] - args.tolerance
+
+    results = []
+    for setting in candidate_settings(x_fit, y_fit, args.alphas, args.depths):
+        model = DecisionTreeClassifier(random_state=1, **setting).fit(x_fit, y_fit)
+        results.append(dict(setting=setting, **describe(model, x_val, y_val)))
+
+    print(f"{'setting':<24}{'val acc':>9}{'nodes':>8}{'depth':>7}{HEADER}")
+    print(format_row("unpruned", baseline))
+    for r in sorted(results, key=lambda r: r['bytes'], reverse=True):
+        label = ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in r['setting'].items())
+        print(format_row(label, r))
+
+    eligible = [r for r in results if r['accuracy'] >= floor]
+    if not eligible:
+        raise SystemExit(f"No pruned tree reaches validation accuracy {floor:.4f}; raise --tolerance")
+    chosen = min(eligible, key=lambda r: (r['bytes'], -r['accuracy']))
+
+    # Refit the chosen setting on the notebook's full training split
+    model = DecisionTreeClassifier(random_state=1, **chosen['setting']).fit(x_train, y_train)
+    final = describe(model, x_test, y_test)
+    current = describe(production, x_test, y_test)
+    print(f"\nchosen {chosen['setting']} (validation accuracy floor {floor:.4f})")
+    print(f"{'':<24}{'test acc':>9}{'nodes':>8}{'depth':>7}{HEADER}")
+    for name, r in (("current model", current), ("pruned", final)):
+        print(format_row(name, r))
+
+    joblib.dump(model, args.output)
+    print(f"Saved {args.output}")
+
+if __name__ == "__main__":
+    main()
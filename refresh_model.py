@@ -0,0 +1,170 @@
+# Incremental model refresh from user feedback (feedback.py), without retraining from scratch.
+#
+# The served decision tree can only be refitted on everything, so the refreshed model is one of the
+# incremental learners of train_chunked.py (CategoricalNB by default, or averaged SGD). --init trains
+# it once on the training data. Each later run:
+#   1. reads only the feedback rows with an id above the model's checkpoint and learns them with
+#      partial_fit, so a refresh costs time in proportion to the new feedback, not to all the data
+#   2. scores the current and the updated model on a bounded holdout: a fixed sample of at most
+#      --holdout-rows of the training rows train_chunked.py holds out, taken once by --init and
+#      stored in the checkpoint, plus the latest --holdout-rows feedback rows of every fifth
+#      prediction (those rows are never learned), so validation does not grow with the training data
+#   3. publishes the updated model only if it is no more than --tolerance less accurate: written to a
+#      temporary file, then renamed over the artifact in one step, so readers see the old model or
+#      the new one, never a partial file. The checkpoint (last feedback id learned) is stored in the
+#      artifact itself, so it can never disagree with the model it describes.
+# Serve the artifact with CAREERPATH_MODEL_PATH; running apps and workers pick it up on restart.
+#
+#   python refresh_model.py --init
+#   python refresh_model.py                            # e.g. hourly from cron
+#   CAREERPATH_MODEL_PATH=job_role_model_refreshed.pkl streamlit run ui.py
+
+import os
+import time
+import copy
+import sqlite3
+import argparse
+import warnings
+
+import joblib
+import numpy as np
+
+from clock import utcnow
+from features import FEATURE_FIELDS, TRAINING_DATA, to_frame
+from feedback import read_feedback
+from history import decode_inputs
+
+DB_PATH = 'career_predictor.db'
+REFRESHED_MODEL_PATH = 'job_role_model_refreshed.pkl'
+HOLDOUT_EVERY = 5
+HOLDOUT_ROWS = 5000
+TOLERANCE = 0.01
+# Past refreshes kept in the checkpoint
+CHECKPOINT_HISTORY = 20
+
+def encode_feedback(rows):
+    """Feedback rows as (int8 feature matrix, roles); rows with incomplete saved answers are skipped"""
+    X, y = [], []
+    for _, _, input_data, role in rows:
+        values = decode_inputs(input_data)
+        if len(values) == len(FEATURE_FIELDS):
+            X.append([values[field] for field in FEATURE_FIELDS])
+            y.append(role)
+    return np.asarray(X, dtype=np.int8).reshape(-1, len(FEATURE_FIELDS)), np.asarray(y, dtype=object)
+
+def holdout(conn, training, upto, holdout_rows=HOLDOUT_ROWS):
+    """Validation rows: the checkpoint's training sample and recent held-out feedback"""
+    X, y = training
+    rows = conn.execute('''
+        SELECT f.id, f.prediction_id, p.input_data, f.role
+        FROM prediction_feedback f JOIN user_predictions p ON p.id = f.prediction_id
+        WHERE f.id <= ? AND f.prediction_id % ? = 0 ORDER BY f.id DESC LIMIT ?
+    ''', (upto, HOLDOUT_EVERY, holdout_rows)).fetchall()
+    X_feedback, y_feedback = encode_feedback(rows)
+    return np.concatenate([X, X_feedback]), np.concatenate([y, y_feedback])
+
+def accuracy(model, X, y):
+    return float((model.predict(to_frame(X)) == y).mean()) if len(y) else None
+
+def publish(model, path):
+    """Replace the artifact at path in one step"""
+    tmp = f"{path}.tmp-{os.getpid()}"
+    try:
+        joblib.dump(model, tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def _timestamp():
+    return utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+def init_model(path=REFRESHED_MODEL_PATH, data=TRAINING_DATA, learner='nb', holdout_rows=HOLDOUT_ROWS):
+    """Train the incremental learner on the training data and publish it with an empty checkpoint"""
+    from train_chunked import train_chunked, held_out_sample
+    model, report = train_chunked(data, learner)
+    model.refresh_checkpoint_ = {'feedback_id': 0, 'learner': learner, 'data': data, 'feedback_rows': 0,
+                                 'training_holdout': held_out_sample(data, holdout_rows),
+                                 'refreshed_at': _timestamp(), 'holdout_accuracy': report['accuracy'], 'history': []}
+    publish(model, path)
+    return model.refresh_checkpoint_
+
+def refresh(path=REFRESHED_MODEL_PATH, db_path=DB_PATH, tolerance=TOLERANCE, holdout_rows=HOLDOUT_ROWS, force=False):
+    """Learn the feedback given since the checkpoint and publish the result if it validates; returns a report"""
+    from train_chunked import partial_fit
+    started = time.perf_counter()
+    model = joblib.load(path)
+    checkpoint = model.refresh_checkpoint_
+    conn = sqlite3.connect(db_path)
+    try:
+        upto = conn.execute('SELECT COALESCE(MAX(id), 0) FROM prediction_feedback').fetchone()[0]
+        report = {'from_id': checkpoint['feedback_id'], 'to_id': upto, 'learned_rows': 0, 'published': False}
+        if upto <= checkpoint['feedback_id']:
+            return dict(report, status='no new feedback', seconds=time.perf_counter() - started)
+
+        candidate = copy.deepcopy(model)
+        for rows in read_feedback(conn, checkpoint['feedback_id'], upto):
+            rows = [row for row in rows if row[1] % HOLDOUT_EVERY]
+            X, y = encode_feedback(rows)
+            # Roles the model does not know cannot be learned incrementally
+            known = np.isin(y, candidate.classes_)
+            if known.any():
+                partial_fit(candidate, X[known], y[known], candidate.classes_)
+                report['learned_rows'] += int(known.sum())
+
+        if 'training_holdout' not in checkpoint:
+            # Artifacts from before the sample was stored: take it once, kept with the next publish
+            from train_chunked import held_out_sample
+            checkpoint = dict(checkpoint, training_holdout=held_out_sample(checkpoint['data'], holdout_rows))
+        X_val, y_val = holdout(conn, checkpoint['training_holdout'], upto, holdout_rows)
+    finally:
+        conn.close()
+    report['before'], report['after'] = accuracy(model, X_val, y_val), accuracy(candidate, X_val, y_val)
+    report['holdout_rows'] = len(y_val)
+    if report['after'] < report['before'] - tolerance and not force:
+        return dict(report, status='rejected: holdout accuracy dropped', seconds=time.perf_counter() - started)
+
+    candidate.refresh_checkpoint_ = dict(
+        checkpoint, feedback_id=upto, feedback_rows=checkpoint['feedback_rows'] + report['learned_rows'],
+        refreshed_at=_timestamp(), holdout_accuracy=report['after'],
+        history=(checkpoint['history'] + [{key: report[key] for key in ('from_id', 'to_id', 'learned_rows', 'before',
+                                                                          'after')}])[-CHECKPOINT_HISTORY:])
+    publish(candidate, path)
+    return dict(report, status='published', published=True, seconds=time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the incremental job role model from user feedback")
+    parser.add_argument("--model", default=REFRESHED_MODEL_PATH)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--init", action="store_true", help="train the model on --data and start an empty checkpoint")
+    parser.add_argument("--data", default=TRAINING_DATA)
+    parser.add_argument("--learner", choices=["nb", "sgd"], default="nb")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="largest holdout accuracy drop that is still published")
+    parser.add_argument("--holdout-rows", type=int, default=HOLDOUT_ROWS,
+                        help="most training and most feedback rows in the holdout")
+    parser.add_argument("--force", action="store_true", help="publish even if holdout accuracy drops")
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if args.init or not os.path.exists(args.model):
+            checkpoint = init_model(args.model, args.data, args.learner, args.holdout_rows)
+            print(f"Trained {args.learner} on {args.data} (holdout accuracy {checkpoint['holdout_accuracy']:.4f}), "
+                  f"saved {args.model}")
+            if args.init:
+                return
+        report = refresh(args.model, args.db, args.tolerance, args.holdout_rows, args.force)
+
+    if report['status'] == 'no new feedback':
+        print(f"No feedback since id {report['from_id']}; {args.model} unchanged")
+        return
+    print(f"feedback ids {report['from_id'] + 1}-{report['to_id']}: {report['status']} "
+          f"({report['learned_rows']:,} rows learned in {report['seconds']:.2f}s)")
+    if 'before' in report:
+        print(f"holdout accuracy {report['before']:.4f} -> {report['after']:.4f} on {report['holdout_rows']:,} rows")
+    if report['status'].startswith('rejected'):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 import streamlit as st
-from openai import OpenAI
+from llm_transport import build_client
 
 # Set your OpenAI API key here (consider storing it in environment variable or Streamlit secrets for production)
-client = OpenAI(api_key="your-openai-api-key-here")
+# CAREERPATH_LLM_MODE selects the transport (live, record, replay or synthetic), see llm_transport.py
+client = build_client(api_key="your-openai-api-key-here")
 
 # Prompt generation function
 def generate_prompt(job_role):
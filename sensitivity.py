@@ -0,0 +1,71 @@
+# "What if" sensitivity analysis for one profile.
+#
+# Builds one batch holding the profile plus every single-answer change to it (each of the 21 features
+# moved through its whole valid range, all others fixed), scores the batch with one predict_proba
+# call and reports which changes would flip the predicted role.
+
+import time
+
+from features import FEATURES, FEATURE_LABELS
+
+def feature_values(encoding, allowed):
+    """Every valid encoded value of a feature"""
+    if encoding == 'number':
+        low, high = allowed
+        return range(low, high + 1)
+    if encoding == 'flag':
+        return (0, 1)
+    return sorted(allowed.values())
+
+def value_label(encoding, allowed, value):
+    """The answer a user would recognise for an encoded value"""
+    if encoding == 'flag':
+        return "Yes" if value else "No"
+    if encoding == 'category':
+        for name, code in allowed.items():
+            if code == value:
+                return name
+    return str(value)
+
+def build_variants(row):
+    """All rows that differ from the profile in exactly one answer, with (feature index, value) per row"""
+    variants = []
+    changes = []
+    for index, (_, _, encoding, allowed) in enumerate(FEATURES):
+        for value in feature_values(encoding, allowed):
+            if value == row[index]:
+                continue
+            variant = list(row)
+            variant[index] = value
+            variants.append(variant)
+            changes.append((index, value))
+    return variants, changes
+
+def what_if(predict_proba, classes, row):
+    """Score the profile and all its single-answer variants in one call; list the changes that flip the role"""
+    variants, changes = build_variants(row)
+    started = time.perf_counter()
+    probabilities = predict_proba([row] + variants)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    predicted = probabilities.argmax(axis=1)
+    role = predicted[0]
+    flips = []
+    for (index, value), variant_role, p in zip(changes, predicted[1:], probabilities[1:]):
+        if variant_role == role:
+            continue
+        field, _, encoding, allowed = FEATURES[index]
+        flips.append({
+            'feature': field,
+            'answer': FEATURE_LABELS[field],
+            'from': value_label(encoding, allowed, row[index]),
+            'to': value_label(encoding, allowed, value),
+            'role': str(classes[variant_role]),
+            'probability': round(float(p[variant_role]), 4),
+        })
+    return {
+        'role': str(classes[role]),
+        'rows': len(variants) + 1,
+        'elapsed_ms': round(elapsed_ms, 2),
+        'flips': flips,
+    }
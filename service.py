@@ -0,0 +1,318 @@
+# Headless HTTP inference service for the job role model.
+#
+# Runs next to the Streamlit app so other systems can get predictions without the UI. Standard
+# library only: the parent process binds the port and forks worker processes that share the
+# listening socket, and each worker loads the model artifact once and answers requests on threads.
+# Concurrent requests in a worker are coalesced into one model call by the batching scheduler in
+# inference.py.
+#
+#   python service.py --port 8502 --workers 4 --max-wait-ms 2 --max-batch-size 64
+#
+# Endpoints (JSON in the 21-feature schema of features.py, see GET /schema):
+#   GET  /healthz          the worker process is up
+#   GET  /readyz           the model is loaded (503 until then)
+#   GET  /schema           feature fields, types and allowed values
+#   GET  /metrics          batching scheduler counters and queue-wait percentiles of this worker
+#                          (plus cascade escalation, shadow-model and drift monitor counters when configured)
+#   POST /predict          {"features": {...}}                    -> {"role": ...}
+#   POST /predict/top-k    {"features": {...}, "k": 3}            -> {"predictions": [{"role", "probability"}, ...]}
+#   POST /predict/batch    {"instances": [{...}, ...], "k": null} -> {"predictions": [...]}, one entry per instance
+#   POST /explain          {"features": {...}}                    -> {"role", "confidence", "conditions": [...]}
+#   POST /what-if          {"features": {...}}                    -> {"role", "flips": [...]}, single-answer changes
+#   POST /similar          {"features": {...}, "k": 10}           -> {"roles": [...], "profiles": [...]}, nearest
+#                                                                    training profiles (neighbors.py)
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import threading
+import warnings
+from functools import partial
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from features import FeatureError, encode_features, feature_schema
+from inference import MODEL_PATH, MAX_WAIT_MS, MAX_BATCH_SIZE, BatchScheduler, SchedulerOverloaded
+from shadow import load_shadow_evaluator
+from drift import load_drift_monitor
+from explain import TreeExplainer
+from sensitivity import what_if
+from neighbors import NEIGHBORS_PATH, DEFAULT_NEIGHBORS, NeighborIndex
+
+MAX_BODY_BYTES = int(os.getenv("CAREERPATH_MAX_BODY_BYTES", str(1024 * 1024)))
+MAX_INSTANCES = int(os.getenv("CAREERPATH_MAX_INSTANCES", "1000"))
+DEFAULT_TOP_K = 3
+MAX_NEIGHBORS = 100
+
+class ModelState:
+    """The model of one worker process, loaded in the background so /readyz can report progress"""
+
+    def __init__(self, path, max_wait_ms=MAX_WAIT_MS, max_batch_size=MAX_BATCH_SIZE):
+        self.path = path
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self.scheduler = None
+        self.explainer = None
+        self.neighbors = None
+        self.error = None
+        self.loaded_at = None
+
+    def load(self):
+        try:
+            import joblib
+            with warnings.catch_warnings():
+                # The artifact was pickled with an older scikit-learn; the tree itself loads fine
+                warnings.simplefilter("ignore")
+                model = joblib.load(self.path)
+            self.explainer = TreeExplainer.for_model(model)
+            self.neighbors = NeighborIndex.load(NEIGHBORS_PATH)
+            self.scheduler = BatchScheduler(model, self.max_wait_ms, self.max_batch_size,
+                                            shadow=load_shadow_evaluator(), monitor=load_drift_monitor())
+            self.loaded_at = time.time()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+
+    @property
+    def ready(self):
+        return self.scheduler is not None
+
+    def predict(self, rows):
+        return self.scheduler.predict(rows)
+
+    def top_k(self, rows, k):
+        return self.scheduler.top_k(rows, k)
+
+state = None
+
+class RequestError(Exception):
+    """A client error answered with the given HTTP status"""
+
+    def __init__(self, status, message, details=None):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+def parse_k(payload, default=DEFAULT_TOP_K):
+    k = payload.get('k', default)
+    if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+        raise RequestError(400, "k must be a positive integer")
+    return k
+
+def encode_instances(instances):
+    if not isinstance(instances, list) or not instances:
+        raise RequestError(400, "instances must be a non-empty list")
+    if len(instances) > MAX_INSTANCES:
+        raise RequestError(413, f"at most {MAX_INSTANCES} instances per batch")
+    rows = []
+    errors = {}
+    for i, record in enumerate(instances):
+        try:
+            rows.append(encode_features(record))
+        except FeatureError as e:
+            errors[str(i)] = e.errors
+    if errors:
+        raise RequestError(400, "invalid instances", errors)
+    return rows
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    server_version = "CareerPathInference/1.0"
+    quiet = False
+
+    def do_GET(self):
+        if self.path == '/healthz':
+            self.send_json(200, {'status': 'ok', 'pid': os.getpid()})
+        elif self.path == '/readyz':
+            if state.ready:
+                self.send_json(200, {'status': 'ready', 'pid': os.getpid(), 'model': state.path})
+            else:
+                self.send_json(503, {'status': 'failed' if state.error else 'loading', 'error': state.error})
+        elif self.path == '/schema':
+            self.send_json(200, {'features': feature_schema()})
+        elif self.path == '/metrics':
+            if state.ready:
+                self.send_json(200, dict(state.scheduler.stats(), pid=os.getpid()))
+            else:
+                self.send_json(503, {'error': "model not loaded"})
+        else:
+            self.send_json(404, {'error': f"no route for GET {self.path}"})
+
+    def do_POST(self):
+        routes = {
+            '/predict': self.predict,
+            '/predict/top-k': self.predict_top_k,
+            '/predict/batch': self.predict_batch,
+            '/explain': self.explain,
+            '/what-if': self.what_if,
+            '/similar': self.similar,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self.send_json(404, {'error': f"no route for POST {self.path}"})
+            return
+        try:
+            if not state.ready:
+                raise RequestError(503, "model not loaded")
+            handler(self.read_json())
+        except RequestError as e:
+            body = {'error': str(e)}
+            if e.details is not None:
+                body['details'] = e.details
+            self.send_json(e.status, body)
+        except FeatureError as e:
+            self.send_json(400, {'error': "invalid features", 'details': e.errors})
+        except SchedulerOverloaded as e:
+            self.send_json(503, {'error': str(e)})
+        except Exception as e:
+            self.log_error("prediction failed: %s", e)
+            self.send_json(500, {'error': "prediction failed"})
+
+    def predict(self, payload):
+        row = encode_features(payload.get('features'))
+        self.send_json(200, {'role': state.predict([row])[0]})
+
+    def predict_top_k(self, payload):
+        k = parse_k(payload)
+        row = encode_features(payload.get('features'))
+        self.send_json(200, {'predictions': state.top_k([row], k)[0]})
+
+    def predict_batch(self, payload):
+        rows = encode_instances(payload.get('instances'))
+        if payload.get('k') is None:
+            predictions = [{'role': role} for role in state.predict(rows)]
+        else:
+            predictions = state.top_k(rows, parse_k(payload))
+        self.send_json(200, {'predictions': predictions})
+
+    def explain(self, payload):
+        if state.explainer is None:
+            raise RequestError(501, "explanations need a single decision tree model")
+        row = encode_features(payload.get('features'))
+        self.send_json(200, state.explainer.explain(row))
+
+    def what_if(self, payload):
+        row = encode_features(payload.get('features'))
+        scheduler = state.scheduler
+        # What-if variants are not live inputs, so the drift monitor does not count them
+        self.send_json(200, what_if(partial(scheduler.predict_proba, observe=False), scheduler.classes, row))
+
+    def similar(self, payload):
+        k = parse_k(payload, DEFAULT_NEIGHBORS)
+        if k > MAX_NEIGHBORS:
+            raise RequestError(400, f"k must be at most {MAX_NEIGHBORS}")
+        row = encode_features(payload.get('features'))
+        self.send_json(200, state.neighbors.query(row, k))
+
+    def read_json(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            raise RequestError(400, "invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, f"request body larger than {MAX_BODY_BYTES} bytes")
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, UnicodeDecodeError):
+            raise RequestError(400, "request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise RequestError(400, "request body must be a JSON object")
+        return payload
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_request(self, code='-', size='-'):
+        if not self.quiet:
+            super().log_request(code, size)
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"[worker {os.getpid()}] {self.address_string()} {format % args}\n")
+
+class WorkerServer(ThreadingHTTPServer):
+    # Request threads must not keep a terminating worker alive
+    daemon_threads = True
+
+def run_worker(sock, model_path, max_wait_ms, max_batch_size):
+    """Serve requests from the shared listening socket until terminated"""
+    global state
+    signal.signal(signal.SIGTERM, lambda *_: os._exit(0))
+    # Ctrl+C reaches the whole process group; the parent shuts the workers down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    state = ModelState(model_path, max_wait_ms, max_batch_size)
+    threading.Thread(target=state.load, name="model-loader", daemon=True).start()
+    server = WorkerServer(sock.getsockname()[:2], PredictionHandler, bind_and_activate=False)
+    server.socket = sock
+    server.serve_forever()
+
+def serve(host, port, workers, model_path=MODEL_PATH, max_wait_ms=MAX_WAIT_MS, max_batch_size=MAX_BATCH_SIZE):
+    """Bind once, pre-fork the workers and replace any worker that exits"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+
+    children = set()
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(sock, model_path, max_wait_ms, max_batch_size)
+            finally:
+                os._exit(1)
+        children.add(pid)
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+    print(f"Serving on http://{host}:{port} with {workers} workers (model: {model_path})", file=sys.stderr)
+
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} exited; starting a replacement", file=sys.stderr)
+            spawn()
+    sock.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Job role prediction HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--model", default=MODEL_PATH, help="path of the joblib model artifact")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS,
+                        help="longest a request waits to be batched with others")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE, help="rows per model call")
+    parser.add_argument("--quiet", action="store_true", help="do not log each request (errors are still logged)")
+    args = parser.parse_args()
+
+    PredictionHandler.quiet = args.quiet
+    serve(args.host, args.port, max(1, args.workers), args.model, args.max_wait_ms, args.max_batch_size)
+
+if __name__ == "__main__":
+    main()
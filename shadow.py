@@ -0,0 +1,172 @@
+# Shadow evaluation of a candidate model on live prediction inputs.
+#
+# After the batching scheduler has answered its callers with the live model, it hands the encoded
+# rows of real user inputs (not what-if variants) to ShadowEvaluator.submit(). A separate process
+# scores them with the candidate model and stores live vs candidate role, agreement and latency in
+# the shadow_predictions table.
+# The queue is bounded in rows: when the candidate falls behind, new rows are shed rather than
+# buffered, so serving latency and memory stay flat. Environment variables:
+#   CAREERPATH_SHADOW_MODEL_PATH   candidate joblib artifact (shadow mode is off when unset)
+#   CAREERPATH_SHADOW_QUEUE_ROWS   rows waiting for the candidate before new ones are shed (default 2000)
+#   CAREERPATH_SHADOW_SAMPLE_RATE  share of live rows sent to the candidate (default 1.0)
+
+import os
+import time
+import queue
+import random
+import sqlite3
+import datetime
+import warnings
+
+from features import to_frame
+from clock import utcnow
+
+DB_PATH = 'career_predictor.db'
+
+SHADOW_MODEL_PATH = os.getenv("CAREERPATH_SHADOW_MODEL_PATH")
+SHADOW_QUEUE_ROWS = int(os.getenv("CAREERPATH_SHADOW_QUEUE_ROWS", "2000"))
+SHADOW_SAMPLE_RATE = float(os.getenv("CAREERPATH_SHADOW_SAMPLE_RATE", "1.0"))
+
+COLUMNS = ('created_at', 'candidate', 'live_role', 'shadow_role', 'agree', 'live_ms', 'shadow_ms', 'batch_rows')
+
+def init_shadow_table(db_path=DB_PATH):
+    """Create the shadow_predictions table"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS shadow_predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TIMESTAMP,
+        candidate TEXT,
+        live_role TEXT,
+        shadow_role TEXT,
+        agree INTEGER,
+        live_ms REAL,
+        shadow_ms REAL,
+        batch_rows INTEGER
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_shadow_predictions_created ON shadow_predictions (created_at)')
+
+    conn.commit()
+    conn.close()
+
+def _score_loop(model_path, db_path, candidate, inbox, queued_rows, compared, parent_pid):
+    """Candidate process: score queued batches and store the comparisons"""
+    # Lowest CPU priority, so on a busy box the serving processes always run first
+    os.nice(19)
+    import joblib
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = joblib.load(model_path)
+    init_shadow_table(db_path)
+    conn = sqlite3.connect(db_path, timeout=30)
+    sql = f"INSERT INTO shadow_predictions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+    while True:
+        try:
+            batches = [inbox.get(timeout=1)]
+        except queue.Empty:
+            # Serving processes can exit without running cleanup; do not outlive them
+            if os.getppid() != parent_pid:
+                return
+            continue
+        while True:
+            try:
+                batches.append(inbox.get_nowait())
+            except queue.Empty:
+                break
+        rows = [row for batch_rows, _, _ in batches for row in batch_rows]
+        started = time.perf_counter()
+        shadow_roles = [str(role) for role in model.predict(to_frame(rows))]
+        shadow_ms = (time.perf_counter() - started) * 1000
+
+        created_at = utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        live = [(role, live_ms) for _, live_roles, live_ms in batches for role in live_roles]
+        records = [(created_at, candidate, live_role, shadow_role, int(live_role == shadow_role),
+                    live_ms, shadow_ms, len(rows))
+                   for (live_role, live_ms), shadow_role in zip(live, shadow_roles)]
+        try:
+            conn.executemany(sql, records)
+            conn.commit()
+        except sqlite3.Error:
+            # A failed batch is lost; the comparison is best effort
+            pass
+        with queued_rows.get_lock():
+            queued_rows.value -= len(rows)
+        with compared.get_lock():
+            compared.value += len(rows)
+
+class ShadowEvaluator:
+    """Score live inputs with a candidate model in a separate process"""
+
+    def __init__(self, model_path, max_queue_rows=SHADOW_QUEUE_ROWS, sample_rate=SHADOW_SAMPLE_RATE, db_path=DB_PATH):
+        import multiprocessing
+        # A process rather than a thread: the candidate's CPU time must not compete with serving for the GIL.
+        # spawn, because the Streamlit server and the service workers are already multi-threaded
+        context = multiprocessing.get_context('spawn')
+        self.candidate = os.path.basename(model_path)
+        self.max_queue_rows = max_queue_rows
+        self.sample_rate = sample_rate
+        self._inbox = context.Queue()
+        self._queued_rows = context.Value('i', 0)
+        self._compared = context.Value('i', 0)
+        self.shed = 0
+        self._process = context.Process(
+            target=_score_loop, name="shadow-evaluator", daemon=True,
+            args=(model_path, db_path, self.candidate, self._inbox, self._queued_rows, self._compared, os.getpid()))
+        self._process.start()
+
+    def submit(self, rows, live_roles, live_ms):
+        """Queue rows the live model already answered; never blocks and never raises"""
+        if self.sample_rate < 1.0:
+            kept = [i for i in range(len(rows)) if random.random() < self.sample_rate]
+            rows, live_roles = [rows[i] for i in kept], [live_roles[i] for i in kept]
+        if not rows:
+            return
+        with self._queued_rows.get_lock():
+            if not self._process.is_alive() or self._queued_rows.value + len(rows) > self.max_queue_rows:
+                self.shed += len(rows)
+                return
+            self._queued_rows.value += len(rows)
+        self._inbox.put((rows, live_roles, live_ms))
+
+    def stats(self):
+        return {
+            'shadow_candidate': self.candidate,
+            'shadow_running': self._process.is_alive(),
+            'shadow_queued_rows': self._queued_rows.value,
+            'shadow_compared': self._compared.value,
+            'shadow_shed': self.shed,
+        }
+
+def load_shadow_evaluator(model_path=SHADOW_MODEL_PATH):
+    """A ShadowEvaluator for the configured candidate, or None when shadow mode is off"""
+    return ShadowEvaluator(model_path) if model_path else None
+
+def load_shadow_results(days=30, db_path=DB_PATH):
+    """Shadow comparisons from the last N days as a DataFrame"""
+    import pandas as pd
+    since = (utcnow() - datetime.timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query(
+            f"SELECT {', '.join(COLUMNS)} FROM shadow_predictions WHERE created_at >= ?", conn, params=(since,))
+    finally:
+        conn.close()
+
+def summarize_disagreement(df):
+    """Agreement rate per live role, with the candidate's most common alternative answer"""
+    import pandas as pd
+    if df.empty:
+        return pd.DataFrame()
+    grouped = df.groupby('live_role')
+    summary = pd.DataFrame({
+        'predictions': grouped.size(),
+        'agreement_rate': grouped['agree'].mean().round(3),
+    })
+    disagreements = df[df['agree'] == 0]
+    if not disagreements.empty:
+        summary['top_candidate_answer'] = disagreements.groupby('live_role')['shadow_role'].agg(
+            lambda roles: roles.value_counts().index[0])
+    return summary.fillna('').sort_values('agreement_rate')
@@ -0,0 +1,198 @@
+# Per-call usage and latency telemetry for the OpenAI generation path.
+#
+# Every generated section produces one row in the llm_telemetry table: model, role, section,
+# token usage, time to first token, total latency, cache hit/miss and the fallback reason when
+# built-in content was served instead. Rows are queued in memory and written by a background
+# thread, so recording never blocks the page render.
+
+import time
+import queue
+import sqlite3
+import datetime
+import threading
+import functools
+
+from clock import utcnow
+
+DB_PATH = 'career_predictor.db'
+
+# Rows waiting for the writer thread; when full, new rows are dropped instead of blocking
+TELEMETRY_QUEUE_SIZE = 10000
+WRITE_BATCH_SIZE = 200
+
+COLUMNS = ('created_at', 'model', 'role', 'section', 'prompt_tokens', 'completion_tokens',
+           'ttft_ms', 'latency_ms', 'cache_hit', 'fallback_reason')
+
+_queue = queue.Queue(maxsize=TELEMETRY_QUEUE_SIZE)
+_writer = None
+_writer_lock = threading.Lock()
+_local = threading.local()
+dropped_records = 0
+
+def init_telemetry_table(db_path=DB_PATH):
+    """Create the llm_telemetry table"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS llm_telemetry (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TIMESTAMP,
+        model TEXT,
+        role TEXT,
+        section TEXT,
+        prompt_tokens INTEGER,
+        completion_tokens INTEGER,
+        ttft_ms REAL,
+        latency_ms REAL,
+        cache_hit INTEGER,
+        fallback_reason TEXT
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_llm_telemetry_created ON llm_telemetry (created_at)')
+
+    conn.commit()
+    conn.close()
+
+def _write_loop(db_path):
+    """Drain the queue in batches into SQLite"""
+    init_telemetry_table(db_path)
+    conn = sqlite3.connect(db_path)
+    placeholders = ', '.join('?' for _ in COLUMNS)
+    sql = f"INSERT INTO llm_telemetry ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+    while True:
+        rows = [_queue.get()]
+        while len(rows) < WRITE_BATCH_SIZE:
+            try:
+                rows.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            conn.executemany(sql, [tuple(row[c] for c in COLUMNS) for row in rows])
+            conn.commit()
+        except sqlite3.Error:
+            # Telemetry must never take the app down; a failed batch is lost
+            pass
+        for _ in rows:
+            _queue.task_done()
+
+def _ensure_writer(db_path=DB_PATH):
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_loop, args=(db_path,), name="llm-telemetry-writer", daemon=True)
+                _writer.start()
+
+def record_llm_call(role, section, model=None, prompt_tokens=None, completion_tokens=None,
+                    ttft_ms=None, latency_ms=None, cache_hit=False, fallback_reason=None):
+    """Queue one telemetry row without waiting for the database"""
+    global dropped_records
+    _ensure_writer()
+    row = {
+        'created_at': utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+        'model': model,
+        'role': role,
+        'section': section,
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'ttft_ms': ttft_ms,
+        'latency_ms': latency_ms,
+        'cache_hit': int(cache_hit),
+        'fallback_reason': fallback_reason
+    }
+    if not cache_hit:
+        _local.misses = getattr(_local, 'misses', 0) + 1
+    try:
+        _queue.put_nowait(row)
+    except queue.Full:
+        dropped_records += 1
+
+def flush(timeout=5.0):
+    """Wait until queued rows are written (used by scripts before exit)"""
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def fallback_reason(error):
+    """Classify an OpenAI error the same way get_career_roadmap words its warning"""
+    error_msg = str(error).lower()
+    if "rate limit" in error_msg:
+        return 'rate_limit'
+    if "api key" in error_msg or "authentication" in error_msg:
+        return 'auth'
+    if "quota" in error_msg:
+        return 'quota'
+    return 'error'
+
+def complete_with_telemetry(client, request, role, section):
+    """Stream one chat completion, record its usage and latency, and return the full text"""
+    started = time.perf_counter()
+    ttft = None
+    usage = None
+    parts = []
+    stream = client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **request)
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            if ttft is None:
+                ttft = time.perf_counter() - started
+            parts.append(chunk.choices[0].delta.content)
+        if getattr(chunk, 'usage', None):
+            usage = chunk.usage
+    latency = time.perf_counter() - started
+    record_llm_call(
+        role, section,
+        model=request.get('model'),
+        prompt_tokens=getattr(usage, 'prompt_tokens', None),
+        completion_tokens=getattr(usage, 'completion_tokens', None),
+        ttft_ms=(ttft if ttft is not None else latency) * 1000,
+        latency_ms=latency * 1000
+    )
+    return "".join(parts)
+
+def track_cache_hits(section):
+    """Record a cache-hit row when a cached generator returns without running its body"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(job_role, *args, **kwargs):
+            misses = getattr(_local, 'misses', 0)
+            started = time.perf_counter()
+            result = fn(job_role, *args, **kwargs)
+            if getattr(_local, 'misses', 0) == misses:
+                record_llm_call(job_role, section, cache_hit=True,
+                                latency_ms=(time.perf_counter() - started) * 1000)
+            return result
+        return wrapper
+    return decorator
+
+def load_telemetry(days=30, db_path=DB_PATH):
+    """Telemetry rows from the last N days as a DataFrame"""
+    import pandas as pd
+    since = (utcnow() - datetime.timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query(
+            f"SELECT {', '.join(COLUMNS)} FROM llm_telemetry WHERE created_at >= ?", conn, params=(since,))
+    finally:
+        conn.close()
+
+def summarize(df, by):
+    """Call counts, hit rate, p50/p95 latency and token spend grouped by section or role"""
+    import pandas as pd
+    if df.empty:
+        return pd.DataFrame()
+    generated = df[(df['cache_hit'] == 0) & df['fallback_reason'].isna()]
+    grouped = df.groupby(by)
+    summary = pd.DataFrame({
+        'calls': grouped.size(),
+        'cache_hit_rate': grouped['cache_hit'].mean().round(3),
+        'fallbacks': grouped['fallback_reason'].count()
+    })
+    if not generated.empty:
+        gen = generated.groupby(by)
+        summary['p50_latency_ms'] = gen['latency_ms'].quantile(0.5).round(1)
+        summary['p95_latency_ms'] = gen['latency_ms'].quantile(0.95).round(1)
+        summary['p50_ttft_ms'] = gen['ttft_ms'].quantile(0.5).round(1)
+        summary['prompt_tokens'] = gen['prompt_tokens'].sum()
+        summary['completion_tokens'] = gen['completion_tokens'].sum()
+    return summary.fillna(0).sort_values('calls', ascending=False)
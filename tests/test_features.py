@@ -0,0 +1,36 @@
+# Tests for the input schema's validation (features.py), as the HTTP service uses it.
+#
+#   python -m pytest -q tests
+
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from features import FEATURES, FeatureError, encode_features
+
+def valid_record():
+    record = {}
+    for field, _, encoding, allowed in FEATURES:
+        if encoding == 'number':
+            record[field] = allowed[0]
+        elif encoding == 'flag':
+            record[field] = "yes"
+        else:
+            record[field] = next(iter(allowed))
+    return record
+
+def test_a_valid_record_encodes():
+    assert len(encode_features(valid_record())) == len(FEATURES)
+
+@pytest.mark.parametrize("literal", ["Infinity", "-Infinity", "NaN", "1e400"])
+def test_non_finite_numbers_are_validation_errors(literal):
+    field = next(field for field, _, encoding, _ in FEATURES if encoding == 'number')
+    record = dict(valid_record(), **{field: json.loads(literal)})
+    with pytest.raises(FeatureError) as error:
+        encode_features(record)
+    assert error.value.errors == [f"{field}: expected an integer"]
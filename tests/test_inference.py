@@ -0,0 +1,85 @@
+# Tests for the batching scheduler (inference.py), with a stand-in model and shadow evaluator.
+#
+#   python -m pytest -q tests
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from inference import BatchScheduler, SchedulerTimeout
+
+class FakeModel:
+    """Role 'high' when the first answer is above 5"""
+    classes_ = np.array(['high', 'low'])
+
+    def predict_proba(self, frame):
+        high = (frame.iloc[:, 0].to_numpy() > 5).astype(float)
+        return np.column_stack([high, 1 - high])
+
+class FakeShadow:
+    def __init__(self):
+        self.submitted = []
+        self.called = threading.Event()
+
+    def submit(self, rows, live_roles, live_ms):
+        self.submitted.append((list(rows), list(live_roles)))
+        self.called.set()
+
+    def stats(self):
+        return {}
+
+def row(first):
+    return [first] + [0] * 20
+
+def test_unobserved_requests_never_reach_the_shadow():
+    shadow = FakeShadow()
+    # A long wait, so both requests join one batch
+    scheduler = BatchScheduler(FakeModel(), max_wait_ms=200, shadow=shadow)
+    synthetic = scheduler.submit([row(9), row(8)], observe=False)
+    live = scheduler.submit([row(1)])
+    assert [list(p) for p in synthetic.result(5)] == [[1.0, 0.0], [1.0, 0.0]]
+    assert [list(p) for p in live.result(5)] == [[0.0, 1.0]]
+
+    assert shadow.called.wait(5)
+    assert scheduler.stats()['batches'] == 1
+    assert shadow.submitted == [([row(1)], ['low'])]
+
+def test_a_batch_of_only_unobserved_requests_is_not_submitted():
+    shadow = FakeShadow()
+    scheduler = BatchScheduler(FakeModel(), shadow=shadow)
+    scheduler.predict_proba([row(9)], observe=False)
+    # Later batches are answered only after the earlier one's post-answer work
+    scheduler.predict_proba([row(2)])
+    assert shadow.called.wait(5)
+    assert shadow.submitted == [([row(2)], ['low'])]
+
+class FailingShadow(FakeShadow):
+    def submit(self, rows, live_roles, live_ms):
+        super().submit(rows, live_roles, live_ms)
+        raise OSError("shadow queue broken")
+
+def test_a_failure_after_the_answers_keeps_the_scheduler_running():
+    shadow = FailingShadow()
+    scheduler = BatchScheduler(FakeModel(), shadow=shadow)
+    # Each batch starts only after the previous one's post-answer work
+    for first in (1, 9, 2):
+        scheduler.predict_proba([row(first)], timeout=5)
+    assert len(shadow.submitted) >= 2
+    assert scheduler.stats()['failed_batches'] >= 2
+
+def test_callers_time_out_instead_of_waiting_forever():
+    class SlowModel(FakeModel):
+        def predict_proba(self, frame):
+            threading.Event().wait(0.5)
+            return super().predict_proba(frame)
+
+    scheduler = BatchScheduler(SlowModel())
+    with pytest.raises(SchedulerTimeout):
+        scheduler.predict_proba([row(1)], timeout=0.05)
+    assert scheduler.stats()['timed_out'] == 1
@@ -0,0 +1,56 @@
+# Tests for the record / replay transports (llm_transport.py), with a stand-in OpenAI client.
+#
+#   python -m pytest -q tests
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from llm_transport import FixtureStore, RecordingClient, ReplayClient, make_chunk, make_usage, make_usage_chunk
+
+REQUEST = {'model': 'gpt-4o-mini', 'messages': [{'role': 'user', 'content': 'A roadmap'}], 'temperature': 0.7}
+
+class FakeOpenAI:
+    """Streams two chunks; the usage chunk only with include_usage, as the API does"""
+
+    def __init__(self):
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        chunks = [make_chunk("Learn", kwargs['model']), make_chunk(" Python", kwargs['model']),
+                  make_chunk(None, kwargs['model'], finish_reason="stop")]
+        if (kwargs.get('stream_options') or {}).get('include_usage'):
+            chunks.append(make_usage_chunk(kwargs['model'], make_usage(1234, 56)))
+        return iter(chunks)
+
+def stream(client, **options):
+    """(text, usage) of one streamed request, read the way complete_with_telemetry reads it"""
+    parts, usage = [], None
+    for chunk in client.chat.completions.create(stream=True, **options, **REQUEST):
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+        if getattr(chunk, 'usage', None):
+            usage = chunk.usage
+    return "".join(parts), usage
+
+def test_replay_returns_the_recorded_usage(tmp_path):
+    store = FixtureStore(tmp_path)
+    live = stream(RecordingClient(FakeOpenAI(), store), stream_options={'include_usage': True})
+    replayed = stream(ReplayClient(store), stream_options={'include_usage': True})
+    assert replayed[0] == live[0] == "Learn Python"
+    assert (replayed[1].prompt_tokens, replayed[1].completion_tokens) == (1234, 56)
+
+def test_recording_keeps_the_usage_callers_did_not_ask_for(tmp_path):
+    store = FixtureStore(tmp_path)
+    api = FakeOpenAI()
+    _, usage = stream(RecordingClient(api, store))
+    assert usage is None
+    assert api.requests[0]['stream_options'] == {'include_usage': True}
+    # Without include_usage, replay ends like the API does: no usage chunk
+    assert stream(ReplayClient(store))[1] is None
+    assert stream(ReplayClient(store), stream_options={'include_usage': True})[1].completion_tokens == 56
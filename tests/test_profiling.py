@@ -0,0 +1,52 @@
+# Tests for per-rerun timing and profiling (profiling.py) with concurrent sessions.
+#
+#   python -m pytest -q tests
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import profiling
+
+@pytest.fixture
+def profiled(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, 'TIMINGS_ENABLED', True)
+    monkeypatch.setattr(profiling, 'PROFILE_ENABLED', True)
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path / "profiles"))
+    monkeypatch.setattr(profiling, 'TIMING_LOG', str(tmp_path / "timings.jsonl"))
+    return tmp_path
+
+def test_a_rerun_during_another_profiled_one_keeps_its_spans(profiled):
+    started, release = threading.Event(), threading.Event()
+    summaries = {}
+
+    def first_session():
+        profiling.begin_rerun()
+        started.set()
+        release.wait(5)
+        summaries['first'] = profiling.end_rerun('first')
+
+    thread = threading.Thread(target=first_session)
+    thread.start()
+    assert started.wait(5)
+    skipped = profiling.skipped_profiles
+    profiling.begin_rerun()
+    with profiling.span("work"):
+        pass
+    summaries['second'] = profiling.end_rerun('second')
+    release.set()
+    thread.join(5)
+
+    assert profiling.skipped_profiles == skipped + 1
+    assert [s['name'] for s in summaries['second']['spans']] == ["work"]
+    assert [p.name.rsplit('-', 1)[-1] for p in (profiled / "profiles").iterdir()] == ["first.prof"]
+
+    # Once the first profile is written, the next rerun is profiled again
+    profiling.begin_rerun()
+    profiling.end_rerun('third')
+    assert len(list((profiled / "profiles").iterdir())) == 2
@@ -0,0 +1,102 @@
+# Train and tune the tree -> ensemble cascade offline on data/mldata.csv.
+#
+# Uses the notebook's split (20% test, random_state=42) and carves a validation set out of the
+# training rows. The tree and the ensemble are fitted on the rest, the confidence threshold is
+# tuned on validation to reach the target accuracy with the fewest escalations, and the test set
+# reports the final accuracy, escalation rate and per-row latency.
+#
+#   python train_cascade.py                           # target: the ensemble's validation accuracy
+#   python train_cascade.py --target-accuracy 0.09 --ensemble hgb
+#   CAREERPATH_MODEL_PATH=cascade_model.pkl streamlit run ui.py
+
+import time
+import argparse
+import warnings
+
+import joblib
+
+from features import load_training_data
+from cascade import CascadeModel, cascade_accuracy, tune_threshold
+
+def build_ensemble(kind, n_estimators):
+    if kind == 'hgb':
+        from sklearn.ensemble import HistGradientBoostingClassifier
+        return HistGradientBoostingClassifier(random_state=42)
+    from sklearn.ensemble import RandomForestClassifier
+    # Same settings as the notebook's RandomForest
+    return RandomForestClassifier(n_estimators=n_estimators, random_state=10)
+
+def per_row_ms(model, X, rows=200):
+    """Mean latency of single-row predict_proba calls, the way the app scores one profile"""
+    sample = X.iloc[:rows]
+    started = time.perf_counter()
+    for i in range(len(sample)):
+        model.predict_proba(sample.iloc[i:i + 1])
+    return (time.perf_counter() - started) * 1000 / len(sample)
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the tree -> ensemble cascade")
+    parser.add_argument("--data", default="data/mldata.csv")
+    parser.add_argument("--output", default="cascade_model.pkl")
+    parser.add_argument("--ensemble", choices=["forest", "hgb"], default="forest")
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--tree-min-samples-leaf", type=int, default=20,
+                        help="a fully grown tree is always 100%% confident; leaves need several samples")
+    parser.add_argument("--target-accuracy", type=float, default=None,
+                        help="validation accuracy to reach (default: the ensemble's own)")
+    args = parser.parse_args()
+
+    from sklearn.tree import DecisionTreeClassifier
+    from sklearn.model_selection import train_test_split
+
+    X, y = load_training_data(args.data)
+    x_train, x_test, y_train, y_test = train_test_split(X, y, test_size=0.20, random_state=42)
+    x_fit, x_val, y_fit, y_val = train_test_split(x_train, y_train, test_size=0.25, random_state=42)
+
+    tree = DecisionTreeClassifier(min_samples_leaf=args.tree_min_samples_leaf, random_state=1).fit(x_fit, y_fit)
+    ensemble = build_ensemble(args.ensemble, args.n_estimators).fit(x_fit, y_fit)
+    classes = tree.classes_
+
+    tree_val = tree.predict_proba(x_val)
+    ensemble_val = ensemble.predict_proba(x_val)
+    ensemble_accuracy = float((classes[ensemble_val.argmax(axis=1)] == y_val.values).mean())
+    target = args.target_accuracy if args.target_accuracy is not None else ensemble_accuracy
+    best, table = tune_threshold(tree_val, ensemble_val, y_val.values, classes, target)
+
+    print(f"{'threshold':>10}{'val acc':>10}{'escalated':>11}")
+    shown = table[::max(1, len(table) // 15)]
+    if best not in shown:
+        shown = sorted(shown + [best], key=lambda row: row['threshold'])
+    for row in shown:
+        marker = "  <- chosen" if row is best else ""
+        print(f"{row['threshold']:>10.3f}{row['accuracy']:>10.4f}{row['escalation_rate']:>10.1%}{marker}")
+
+    tree_test, ensemble_test = tree.predict_proba(x_test), ensemble.predict_proba(x_test)
+    test_accuracy, test_escalation = cascade_accuracy(tree_test, ensemble_test, y_test.values, classes, best['threshold'])
+    report = {
+        'target_accuracy': target,
+        'threshold': best['threshold'],
+        'val_accuracy': best['accuracy'],
+        'val_escalation_rate': best['escalation_rate'],
+        'test_accuracy': test_accuracy,
+        'test_escalation_rate': test_escalation,
+        'tree_test_accuracy': float((classes[tree_test.argmax(axis=1)] == y_test.values).mean()),
+        'ensemble_test_accuracy': float((classes[ensemble_test.argmax(axis=1)] == y_test.values).mean()),
+        'ensemble': args.ensemble,
+    }
+    model = CascadeModel(tree, ensemble, best['threshold'], report)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        tree_ms, ensemble_ms, cascade_ms = (per_row_ms(m, x_test) for m in (tree, ensemble, model))
+
+    print(f"\ntarget accuracy {target:.4f}: threshold {best['threshold']:.3f}")
+    print(f"test accuracy  tree {report['tree_test_accuracy']:.4f}  ensemble {report['ensemble_test_accuracy']:.4f}  "
+          f"cascade {test_accuracy:.4f} ({test_escalation:.1%} escalated)")
+    print(f"ms per row     tree {tree_ms:.2f}  ensemble {ensemble_ms:.2f}  cascade {cascade_ms:.2f}")
+
+    joblib.dump(model, args.output)
+    print(f"Saved {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# Train a job role model on datasets larger than memory.
+#
+# The notebook reads the whole CSV into one DataFrame, encodes it with get_dummies and fits in
+# memory. This script streams the file (CSV, gzip CSV, or with pyarrow Parquet / Feather) in chunks
+# of --chunk-rows and encodes each chunk straight to int8 with the codes the notebook assigned on
+# data/mldata.csv, so a chunk is encoded the same whichever answers it happens to contain. Memory
+# stays bounded by the chunk, whatever the file size:
+#   nb    CategoricalNB, counts updated chunk by chunk (partial_fit); the same model as fitting at once
+#   sgd   logistic regression by averaged SGD over one-hot answers (partial_fit), one pass
+#   hgb   HistGradientBoosting on the int8 answers of a uniform sample of at most --sample-rows rows,
+#         kept while streaming, so memory is bounded by the sample instead of the file
+# About --test-share of the rows (chosen by a hash of the row number, so independent of the chunk
+# size) are held out and scored in a second pass. --in-memory runs the notebook's way instead (the
+# whole file loaded, then one fit) with the same learner and split, for comparison. The report
+# gives accuracy, time and peak RSS; benchmarks/bench_training.py compares both modes by size.
+#
+#   python synthetic.py --rows 5000000 --out data/synthetic.parquet
+#   python train_chunked.py --data data/synthetic.parquet --learner nb
+#   python train_chunked.py --data data/synthetic.parquet --learner hgb --in-memory
+
+import json
+import time
+import argparse
+import resource
+import warnings
+
+import joblib
+import numpy as np
+
+from features import FEATURES, FEATURE_COLUMNS, LEVELS, TARGET, TRAINING_DATA
+
+CHUNK_ROWS = 100000
+SAMPLE_ROWS = 1000000
+TEST_SHARE = 0.2
+LEARNERS = ('nb', 'sgd', 'hgb')
+
+# Model columns that the notebook derived from one raw column with get_dummies
+DUMMIES = {
+    'A_Management': ('Management or Technical', 'Management'),
+    'A_Technical': ('Management or Technical', 'Technical'),
+    'B_hard worker': ('hard/smart worker', 'hard worker'),
+    'B_smart worker': ('hard/smart worker', 'smart worker'),
+}
+
+def encoding_plan(reference=TRAINING_DATA):
+    """Per model column: (raw column, value -> code or None for integers, number of codes)"""
+    from dataset import load_frame
+    frame = load_frame(reference)
+    plan = []
+    for _, column, encoding, allowed in FEATURES:
+        if column in DUMMIES:
+            raw, value = DUMMIES[column]
+            plan.append((raw, {v: int(v == value) for v in frame[raw].cat.categories}, 2))
+        elif encoding == 'number':
+            plan.append((column, None, allowed[1] + 1))
+        elif encoding == 'flag':
+            plan.append((column, {'yes': 1, 'no': 0}, 2))
+        elif allowed is LEVELS:
+            plan.append((column, LEVELS, len(LEVELS)))
+        else:
+            # '<raw>_code': pandas category codes of the reference file, as the notebook computed them
+            raw = column[:-len('_code')]
+            categories = frame[raw].cat.categories
+            plan.append((raw, {v: i for i, v in enumerate(categories)}, len(categories)))
+    return plan, list(frame[TARGET].cat.categories)
+
+def _codes(column, mapping):
+    import pandas as pd
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype('category')
+    # One lookup per distinct value; the trailing -1 catches missing values (category code -1)
+    lookup = np.array([mapping.get(v, -1) for v in column.cat.categories] + [-1])
+    codes = lookup[column.cat.codes.to_numpy()]
+    if (codes < 0).any():
+        unknown = sorted({str(v) for v in column[codes < 0]})
+        raise ValueError(f"{column.name}: values not in the training data: {', '.join(unknown[:5])}")
+    return codes
+
+def encode_chunk(df, plan, roles):
+    """Raw rows as (int8 feature matrix in model column order, int8 role codes)"""
+    X = np.empty((len(df), len(plan)), dtype=np.int8)
+    for i, (raw, mapping, _) in enumerate(plan):
+        X[:, i] = df[raw].to_numpy() if mapping is None else _codes(df[raw], mapping)
+    y = _codes(df[TARGET], {role: i for i, role in enumerate(roles)}).astype(np.int8)
+    return X, y
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield the source file as DataFrames of at most chunk_rows raw rows"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif path.endswith('.feather'):
+        import pyarrow as pa
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i).to_pandas()
+    else:
+        import pandas as pd
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+def _mix(values):
+    """splitmix64 of each value: a well spread 64-bit hash"""
+    z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def held_out(index, test_share=TEST_SHARE):
+    """Whether each row number belongs to the test set"""
+    return _mix(index * 2) < np.uint64(int(test_share * 2.0 ** 64))
+
+def _sample_keys(index):
+    return _mix(index * 2 + 1)
+
+def _frame(X):
+    import pandas as pd
+    return pd.DataFrame(X, columns=FEATURE_COLUMNS, copy=False)
+
+def make_learner(kind, plan):
+    sizes = [size for _, _, size in plan]
+    if kind == 'nb':
+        from sklearn.naive_bayes import CategoricalNB
+        return CategoricalNB(min_categories=sizes)
+    if kind == 'sgd':
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import OneHotEncoder
+        from sklearn.linear_model import SGDClassifier
+        # Every code is known up front, so fitting the encoder on one row fixes its columns
+        encoder = OneHotEncoder(categories=[list(range(size)) for size in sizes], handle_unknown='ignore')
+        encoder.fit(_frame(np.zeros((1, len(sizes)), dtype=np.int8)))
+        # Averaging the weights lets a single pass reach what repeated epochs over the whole data do
+        return make_pipeline(encoder, SGDClassifier(loss='log_loss', average=True, random_state=42))
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    nominal = [column.endswith('_code') for column in FEATURE_COLUMNS]
+    return HistGradientBoostingClassifier(categorical_features=nominal, random_state=42)
+
+def partial_fit(learner, X, y, classes):
+    if hasattr(learner, 'steps'):
+        encoder, model = learner.steps[0][1], learner.steps[-1][1]
+        model.partial_fit(encoder.transform(_frame(X)), y, classes=classes)
+    else:
+        learner.partial_fit(_frame(X), y, classes=classes)
+
+def train_chunked(path, kind, chunk_rows=CHUNK_ROWS, sample_rows=SAMPLE_ROWS, test_share=TEST_SHARE):
+    """Stream the file once to train and once to score the held-out rows; returns (model, report)"""
+    plan, roles = encoding_plan()
+    classes = np.asarray(roles, dtype=object)
+    learner = make_learner(kind, plan)
+    sample = None
+    rows = trained = 0
+    for df in read_chunks(path, chunk_rows):
+        X, y = encode_chunk(df, plan, roles)
+        index = np.arange(rows, rows + len(X))
+        rows += len(X)
+        train = ~held_out(index, test_share)
+        X, y, index = X[train], y[train], index[train]
+        trained += len(X)
+        if kind != 'hgb':
+            partial_fit(learner, X, classes[y], classes)
+            continue
+        # Bottom-k sample: the sample_rows rows with the smallest hash, a uniform sample of everything seen
+        keys = _sample_keys(index)
+        if sample is not None:
+            X, y, keys = (np.concatenate(pair) for pair in zip(sample, (X, y, keys)))
+        if len(keys) > sample_rows:
+            keep = np.argpartition(keys, sample_rows - 1)[:sample_rows]
+            X, y, keys = X[keep], y[keep], keys[keep]
+        sample = (X, y, keys)
+    if kind == 'hgb' and sample is not None:
+        learner.fit(_frame(sample[0]), classes[sample[1]])
+
+    correct = tested = start = 0
+    for df in read_chunks(path, chunk_rows):
+        X, y = encode_chunk(df, plan, roles)
+        test = held_out(np.arange(start, start + len(X)), test_share)
+        start += len(X)
+        if test.any():
+            correct += int((learner.predict(_frame(X[test])) == classes[y[test]]).sum())
+            tested += int(test.sum())
+    fitted = min(trained, sample_rows) if kind == 'hgb' else trained
+    return learner, {'rows': rows, 'train_rows': trained, 'fitted_rows': fitted, 'test_rows': tested,
+                     'accuracy': correct / tested if tested else None}
+
+def held_out_sample(path, sample_rows, chunk_rows=CHUNK_ROWS, test_share=TEST_SHARE):
+    """A uniform sample of at most sample_rows held-out rows, as (int8 feature matrix, roles)"""
+    plan, roles = encoding_plan()
+    sample = None
+    start = 0
+    for df in read_chunks(path, chunk_rows):
+        X, y = encode_chunk(df, plan, roles)
+        index = np.arange(start, start + len(X))
+        start += len(X)
+        test = held_out(index, test_share)
+        X, y, keys = X[test], y[test], _sample_keys(index[test])
+        # Bottom-k sample, as in train_chunked
+        if sample is not None:
+            X, y, keys = (np.concatenate(pair) for pair in zip(sample, (X, y, keys)))
+        if len(keys) > sample_rows:
+            keep = np.argpartition(keys, sample_rows - 1)[:sample_rows]
+            X, y, keys = X[keep], y[keep], keys[keep]
+        sample = (X, y, keys)
+    if sample is None:
+        return np.empty((0, len(plan)), dtype=np.int8), np.empty(0, dtype=object)
+    return sample[0], np.asarray(roles, dtype=object)[sample[1]]
+
+def train_in_memory(path, kind, test_share=TEST_SHARE):
+    """The notebook's way: load and encode the whole file, then fit once; returns (model, report)"""
+    from dataset import read_source
+    plan, roles = encoding_plan()
+    classes = np.asarray(roles, dtype=object)
+    X, y = encode_chunk(read_source(path), plan, roles)
+    test = held_out(np.arange(len(X)), test_share)
+    learner = make_learner(kind, plan)
+    if hasattr(learner, 'steps'):
+        learner.steps[-1][1].fit(learner.steps[0][1].transform(_frame(X[~test])), classes[y[~test]])
+    else:
+        learner.fit(_frame(X[~test]), classes[y[~test]])
+    accuracy = float((learner.predict(_frame(X[test])) == classes[y[test]]).mean()) if test.any() else None
+    return learner, {'rows': len(X), 'train_rows': int((~test).sum()), 'fitted_rows': int((~test).sum()),
+                     'test_rows': int(test.sum()), 'accuracy': accuracy}
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a job role model in chunks, for data larger than memory")
+    parser.add_argument("--data", default=TRAINING_DATA, help=".csv, .csv.gz, .parquet or .feather")
+    parser.add_argument("--learner", choices=LEARNERS, default="nb")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--sample-rows", type=int, default=SAMPLE_ROWS, help="rows hgb is fitted on")
+    parser.add_argument("--test-share", type=float, default=TEST_SHARE)
+    parser.add_argument("--in-memory", action="store_true", help="load the whole file and fit once instead")
+    parser.add_argument("--output", default="job_role_model_chunked.pkl")
+    parser.add_argument("--report", help="also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if args.in_memory:
+            model, report = train_in_memory(args.data, args.learner, args.test_share)
+        else:
+            model, report = train_chunked(args.data, args.learner, args.chunk_rows, args.sample_rows,
+                                          args.test_share)
+    report.update(mode='in-memory' if args.in_memory else 'chunked', learner=args.learner,
+                  seconds=round(time.perf_counter() - started, 1),
+                  # ru_maxrss is in KB on Linux
+                  peak_rss_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+    print(f"{report['mode']} {args.learner}: {report['rows']:,} rows, fitted on {report['fitted_rows']:,}, "
+          f"test accuracy {report['accuracy']:.4f} on {report['test_rows']:,}")
+    print(f"{report['seconds']}s, peak RSS {report['peak_rss_mb']} MB")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+    joblib.dump(model, args.output)
+    print(f"Saved {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,32 @@
 import streamlit as st
-import pickle
-import pandas as pd
-import numpy as np
-import joblib
+import importlib.util
 import sqlite3
 import hashlib
 import datetime
 import os
 from pathlib import Path
-try:
-    from openai import OpenAI
-    OPENAI_LIBRARY_AVAILABLE = True
-except ImportError:
-    OPENAI_LIBRARY_AVAILABLE = False
+from prompts import build_request
+from clock import utcnow
+from features import LEVELS, CERTIFICATIONS, BOOK_TYPES, WORKSHOPS, SUBJECTS, CAREER_AREAS, COMPANY_TYPES, to_frame
+from llm_transport import LLM_MODE, build_client
+from profiling import TIMINGS_ENABLED, begin_rerun, end_rerun, span, timed, timed_fragment
+from telemetry import (init_telemetry_table, record_llm_call, complete_with_telemetry,
+                       track_cache_hits, fallback_reason, load_telemetry, summarize)
+from shadow import init_shadow_table, load_shadow_results, summarize_disagreement
+from user_stats import init_user_stats_table, record_prediction, load_user_stats
+from history import init_history_index, fetch_page, fetch_inputs
+from analytics import init_analytics_tables, record_prediction_rollups
+from feedback import init_feedback_table, record_feedback, load_feedback
+# Heavy libraries (pandas, joblib/sklearn, openai) are imported only by the pages that use them,
+# so the landing and login pages render without paying for them
+OPENAI_LIBRARY_AVAILABLE = importlib.util.find_spec("openai") is not None
 
 # Set OpenAI API Key (can be overridden by environment variable)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "your-openai-api-key-here")
 
+# Usernames allowed to open the admin reports (comma-separated)
+ADMIN_USERNAMES = [name.strip() for name in os.getenv("CAREERPATH_ADMIN_USERS", "").split(",") if name.strip()]
+
 # Page configuration - MUST be first Streamlit command
 st.set_page_config(
     page_title="CareerPath AI - Smart Job Role Predictor",
@@ -25,7 +35,12 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Rerun timing / profiling (enabled with CAREERPATH_TIMINGS / CAREERPATH_PROFILE)
+begin_rerun()
+
 # Database setup
+@timed('db')
+@st.cache_resource
 def init_database():
     """Initialize SQLite database for user authentication"""
     conn = sqlite3.connect('career_predictor.db')
@@ -55,6 +70,18 @@ def init_database():
     
     conn.commit()
     conn.close()
+    
+    init_user_stats_table()
+    init_history_index()
+    init_analytics_tables()
+    init_telemetry_table()
+    init_shadow_table()
+    init_feedback_table()
+
+def get_db_connection():
+    """Open a database connection, creating the tables on first use in this process"""
+    init_database()
+    return sqlite3.connect('career_predictor.db')
 
 def hash_password(password):
     """Hash password using SHA-256"""
@@ -64,9 +91,10 @@ def verify_password(password, hashed_password):
     """Verify password against hash"""
     return hash_password(password) == hashed_password
 
+@timed('db')
 def register_user(username, email, password, full_name):
     """Register a new user"""
-    conn = sqlite3.connect('career_predictor.db')
+    conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
@@ -82,9 +110,10 @@ def register_user(username, email, password, full_name):
     finally:
         conn.close()
 
+@timed('db')
 def authenticate_user(username, password):
     """Authenticate user login"""
-    conn = sqlite3.connect('career_predictor.db')
+    conn = get_db_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -104,44 +133,88 @@ def authenticate_user(username, password):
         }
     return False, None
 
+def is_admin(user_info):
+    """Check whether a logged-in user may open the admin reports"""
+    return bool(user_info) and user_info['username'] in ADMIN_USERNAMES
+
+@timed('db')
 def save_prediction(user_id, prediction_result, input_data):
-    """Save user prediction to database"""
-    conn = sqlite3.connect('career_predictor.db')
+    """Save user prediction to database and fold it into the user's dashboard stats and the analytics rollups;
+    returns the prediction id"""
+    conn = get_db_connection()
     cursor = conn.cursor()
+    created_at = utcnow().strftime('%Y-%m-%d %H:%M:%S')
     
     cursor.execute('''
-        INSERT INTO user_predictions (user_id, prediction_result, input_data)
-        VALUES (?, ?, ?)
-    ''', (user_id, prediction_result, str(input_data)))
+        INSERT INTO user_predictions (user_id, prediction_result, input_data, created_at)
+        VALUES (?, ?, ?, ?)
+    ''', (user_id, prediction_result, str(input_data), created_at))
+    prediction_id = cursor.lastrowid
+    record_prediction(cursor, user_id, prediction_result, created_at)
+    record_prediction_rollups(cursor, user_id, prediction_result, input_data, created_at)
     
     conn.commit()
     conn.close()
+    return prediction_id
 
-def get_user_predictions(user_id):
-    """Get user's prediction history"""
-    conn = sqlite3.connect('career_predictor.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT prediction_result, created_at
-        FROM user_predictions
-        WHERE user_id = ?
-        ORDER BY created_at DESC
-        LIMIT 10
-    ''', (user_id,))
-    
-    predictions = cursor.fetchall()
-    conn.close()
-    return predictions
+@timed('db')
+def save_feedback(user_id, prediction_id, role):
+    """Store the role the user confirmed or chose for one of their predictions"""
+    conn = get_db_connection()
+    try:
+        saved = record_feedback(conn.cursor(), user_id, prediction_id, role,
+                                utcnow().strftime('%Y-%m-%d %H:%M:%S'))
+        conn.commit()
+        return saved
+    finally:
+        conn.close()
+
+@timed('db')
+def get_feedback(user_id, prediction_id):
+    """The role the user gave for one of their predictions, or None"""
+    conn = get_db_connection()
+    try:
+        return load_feedback(conn, user_id, prediction_id)
+    finally:
+        conn.close()
+
+@timed('db')
+def get_user_stats(user_id):
+    """Dashboard statistics for a user, one row whatever the length of the history"""
+    conn = get_db_connection()
+    try:
+        return load_user_stats(conn, user_id)
+    finally:
+        conn.close()
 
-# Initialize database
-init_database()
+@timed('db')
+def get_prediction_page(user_id, after=None):
+    """One page of the user's prediction history, newest first, and the cursor of the next page"""
+    conn = get_db_connection()
+    try:
+        return fetch_page(conn, user_id, after)
+    finally:
+        conn.close()
+
+@timed('db')
+def get_prediction_inputs(user_id, prediction_id):
+    """The decoded answers behind one saved prediction"""
+    conn = get_db_connection()
+    try:
+        return fetch_inputs(conn, user_id, prediction_id)
+    finally:
+        conn.close()
 
 # OpenAI Configuration with enhanced error handling
+@timed('llm')
 @st.cache_resource
 def init_openai():
     """Initialize OpenAI client with robust error handling"""
     try:
+        # Offline transports (fixture replay, synthetic responses) need neither the library nor a key
+        if LLM_MODE in ("replay", "synthetic"):
+            return build_client()
+        
         if not OPENAI_LIBRARY_AVAILABLE:
             return None
             
@@ -151,8 +224,9 @@ def init_openai():
         if not api_key or api_key == 'your-api-key-here':
             return None
             
-        # Initialize client with just the API key (avoiding potential parameter issues)
-        client = OpenAI(api_key=api_key)
+        # Initialize client with just the API key (avoiding potential parameter issues);
+        # in record mode the client also saves every response as a replay fixture
+        client = build_client(api_key=api_key)
         
         # Test the client with a simple API call (optional - comment out to avoid API calls during init)
         # try:
@@ -174,19 +248,14 @@ def init_openai():
         # Don't show other errors during initialization
         return None
 
-# Initialize OpenAI client with better error handling
-try:
-    client = init_openai()
-    OPENAI_AVAILABLE = client is not None
-except Exception as e:
-    client = None
-    OPENAI_AVAILABLE = False
-
-# Show a single info message about OpenAI status at startup
-if not OPENAI_AVAILABLE and OPENAI_LIBRARY_AVAILABLE:
-    st.info("💡 **Note**: Using built-in career roadmaps. To enable AI-generated roadmaps, configure your OpenAI API key.")
+def get_openai_client():
+    """OpenAI client for the generation functions, created on first use (None when unavailable)"""
+    try:
+        return init_openai()
+    except Exception:
+        return None
 
-# Related Career Fields Mapping
+# Related Career Fields Mapping (fallback for roles missing from career_graph.json)
 RELATED_CAREERS = {
     'Applications Developer': [
         'Full Stack Developer',
@@ -250,209 +319,47 @@ RELATED_CAREERS = {
     ]
 }
 
-# Roadmap generation functions
-def generate_roadmap_prompt(job_role):
-    """Generate a comprehensive prompt for detailed career roadmap"""
-    return f"""
-You are an expert career mentor and industry professional with 15+ years of experience. Create a comprehensive, detailed learning roadmap for someone who wants to become a {job_role}.
-
-REQUIREMENTS:
-1. **Structure**: Organize into clear phases with specific timelines
-2. **Specificity**: Include exact technologies, tools, and versions where relevant
-3. **Resources**: Provide specific course names, book titles, and platform recommendations
-4. **Projects**: Detail 5-7 hands-on projects with specific requirements
-5. **Certifications**: List industry-recognized certifications with exam codes
-6. **Skills Assessment**: Include measurable milestones for each phase
-7. **Industry Context**: Explain current market trends and salary expectations
-8. **Career Path**: Show progression from junior to senior levels
-
-ROADMAP STRUCTURE:
-## 🎯 {job_role} Complete Learning Roadmap
-
-### 📊 **Career Overview**
-- Current market demand and salary range
-- Key responsibilities and daily tasks
-- Career progression path (Junior → Mid → Senior → Lead)
-- Industry trends and future outlook
-
-### 🏗️ **Phase 1: Foundation (Months 1-3)**
-- **Core Technologies**: List 5-7 fundamental technologies
-- **Learning Resources**: 
-  - Specific online courses (Udemy, Coursera, Pluralsight)
-  - Essential books (with authors)
-  - YouTube channels and tutorials
-  - Free resources and documentation
-- **Hands-on Practice**: 2-3 beginner projects
-- **Milestone**: What you should be able to build/do after 3 months
-
-### 🚀 **Phase 2: Intermediate (Months 4-8)**
-- **Advanced Technologies**: Framework/tools for real-world development
-- **Learning Resources**: 
-  - Advanced courses and specializations
-  - Technical blogs and publications
-  - Community resources (Reddit, Discord, Stack Overflow)
-- **Projects**: 2-3 intermediate projects with specific features
-- **Networking**: Communities to join, conferences to attend
-- **Milestone**: Portfolio-worthy projects and skills
-
-### 🎓 **Phase 3: Advanced (Months 9-12)**
-- **Expert-Level Skills**: Architecture, optimization, best practices
-- **Specialization Areas**: Choose focus areas within the role
-- **Learning Resources**: 
-  - Professional courses and bootcamps
-  - Industry publications and research papers
-  - Open source contribution opportunities
-- **Capstone Projects**: 1-2 complex, production-ready projects
-- **Milestone**: Job-ready skills and professional portfolio
-
-### 💼 **Phase 4: Professional Development (Months 12+)**
-- **Industry Certifications**: Specific exam names and preparation resources
-- **Soft Skills**: Communication, leadership, project management
-- **Job Preparation**: 
-  - Resume building tips
-  - Interview preparation resources
-  - Portfolio presentation strategies
-- **Continuous Learning**: Staying updated with industry trends
-
-### 🛠️ **Detailed Project Portfolio**
-For each project, include:
-- Project description and objectives
-- Technologies and tools used
-- Key features to implement
-- Estimated time to complete
-- Learning outcomes
-- GitHub repository structure
-
-### 📚 **Comprehensive Resource Library**
-- **Free Resources**: (10+ specific links)
-- **Paid Courses**: (5+ course recommendations with platforms)
-- **Books**: (5+ essential books with authors)
-- **Tools & Software**: (Complete development environment setup)
-- **Communities**: (Discord servers, Reddit communities, professional groups)
-
-### 📜 **Certification Roadmap**
-- **Entry Level**: Beginner certifications (with exam codes)
-- **Professional**: Industry-standard certifications
-- **Expert**: Advanced/specialized certifications
-- **Preparation**: Study materials and practice exams
-
-### 💰 **Career Progression & Salary**
-- **Junior Level**: Expected salary range and responsibilities
-- **Mid Level**: Growth expectations and skills required
-- **Senior Level**: Leadership responsibilities and compensation
-- **Specialization**: High-demand niches and their requirements
-
-### 🎯 **Monthly Milestones Checklist**
-Create a month-by-month checklist of specific achievements and skills to master.
-
-Make this roadmap actionable, specific, and comprehensive. Include real course names, specific technologies with versions, actual book titles, and measurable milestones. The goal is to create a roadmap so detailed that someone could follow it step-by-step to become job-ready in 12 months.
-"""
-
-def generate_project_prompt(job_role, project_type="portfolio"):
-    """Generate specific project ideas for the job role"""
-    return f"""
-As a senior {job_role} and technical mentor, suggest 3 specific, detailed project ideas for someone learning to become a {job_role}.
-
-For each project, provide:
-1. **Project Name & Description**: Clear, engaging title and 2-3 sentence description
-2. **Technical Requirements**: Specific technologies, frameworks, and tools to use
-3. **Core Features**: 5-7 essential features to implement
-4. **Advanced Features**: 3-4 optional features for extra challenge
-5. **Learning Objectives**: What skills this project will teach
-6. **Time Estimate**: Realistic timeline for completion
-7. **Deployment Strategy**: How and where to host/deploy the project
-8. **Portfolio Value**: Why this project will impress employers
-
-Make these projects:
-- **Industry-relevant**: Based on real-world applications
-- **Scalable**: Can be enhanced over time
-- **Portfolio-worthy**: Impressive to potential employers
-- **Skill-building**: Cover different aspects of the {job_role} role
-- **Current**: Use modern, in-demand technologies
-
-Focus on projects that demonstrate both technical skills and business understanding.
-"""
+# Icon and card gradient for the first, second and third related career
+RELATED_CARD_STYLES = [
+    ("🚀", "#667eea 0%, #764ba2 100%"),
+    ("💻", "#f093fb 0%, #f5576c 100%"),
+    ("⚡", "#4facfe 0%, #00f2fe 100%"),
+]
 
-def generate_resources_prompt(job_role):
-    """Generate specific learning resources for the job role"""
-    return f"""
-As an expert {job_role} and career coach, provide a comprehensive list of specific learning resources for someone pursuing a {job_role} career.
-
-Organize resources into these categories:
-
-### 📚 **Books** (5-7 essential books)
-- Title, Author, Year
-- Brief description of what makes it valuable
-- Skill level (Beginner/Intermediate/Advanced)
-
-### 🎓 **Online Courses** (8-10 courses)
-- Course name, Platform (Udemy, Coursera, Pluralsight, etc.)
-- Instructor name if notable
-- Duration and cost
-- What specific skills it covers
-
-### 🆓 **Free Resources** (10+ resources)
-- YouTube channels with subscriber count
-- Documentation and official guides
-- Free coding platforms and tutorials
-- Open source projects to study
-
-### 🏆 **Certifications** (5-7 certifications)
-- Certification name and issuing organization
-- Exam code and cost
-- Prerequisites and preparation time
-- Industry recognition and value
-
-### 🛠️ **Tools & Software**
-- Development environment setup
-- Essential tools and their purposes
-- Browser extensions and productivity tools
-- Version control and collaboration tools
-
-### 👥 **Communities & Networking**
-- Reddit communities with member count
-- Discord servers and Slack groups
-- Professional associations and meetups
-- Twitter accounts and LinkedIn groups to follow
-
-### 📰 **Industry Publications**
-- Blogs, newsletters, and magazines
-- Technical publications and research sources
-- Podcasts and video channels
-- Conference talks and presentations
-
-### 💻 **Practice Platforms**
-- Coding challenge websites
-- Project-based learning platforms
-- Hackathon platforms
-- Open source contribution opportunities
-
-Make sure all resources are:
-- **Current**: Updated within the last 2 years
-- **Specific**: Include exact names, URLs where helpful
-- **Varied**: Different learning styles and budgets
-- **Actionable**: Clear next steps for each resource
-"""
+# Related roles weighted by model confusion and profile similarity (career_graph.py)
+@st.cache_resource
+def get_career_graph():
+    from career_graph import load_career_graph, GRAPH_PATH
+    return load_career_graph(GRAPH_PATH)
 
+# Roles whose guides the LLM has written in this server process (and st.cache_data holds);
+# built-in fallback guides are not counted
+@st.cache_resource
+def get_generated_guides():
+    return set()
+
+def get_related_careers(prediction):
+    """Up to 3 related roles from the career graph, or the static RELATED_CAREERS for roles it lacks"""
+    from career_graph import related_roles, CACHED_ONLY
+    graph = get_career_graph()
+    if prediction in graph:
+        return related_roles(graph, prediction, available=get_generated_guides() if CACHED_ONLY else None)
+    return RELATED_CAREERS.get(prediction, [])[:len(RELATED_CARD_STYLES)]
+
+@timed('llm')
+@track_cache_hits('roadmap')
 @st.cache_data
 def get_career_roadmap(job_role):
     """Generate comprehensive career roadmap using OpenAI or provide fallback"""
-    if not OPENAI_AVAILABLE or client is None:
+    client = get_openai_client()
+    if client is None:
+        record_llm_call(job_role, 'roadmap', fallback_reason='unavailable')
         return get_fallback_roadmap(job_role)
     
     try:
-        prompt = generate_roadmap_prompt(job_role)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a senior industry professional and expert career mentor with deep knowledge of current technology trends, hiring practices, and career development. You provide detailed, actionable, and industry-relevant guidance."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4000  # Increased for more detailed response
-        )
-        return response.choices[0].message.content
+        return complete_with_telemetry(client, build_request('roadmap', job_role), job_role, 'roadmap')
     except Exception as e:
+        record_llm_call(job_role, 'roadmap', fallback_reason=fallback_reason(e))
         # Enhanced error handling with specific messages
         error_msg = str(e).lower()
         if "rate limit" in error_msg:
@@ -465,48 +372,55 @@ def get_career_roadmap(job_role):
             st.info("🤖 Using built-in roadmap. For AI-generated personalized roadmaps, configure OpenAI API key.")
         return get_fallback_roadmap(job_role)
 
+@timed('llm')
+@track_cache_hits('projects')
 @st.cache_data
 def get_project_ideas(job_role):
     """Generate specific project ideas for the job role"""
-    if not OPENAI_AVAILABLE or client is None:
+    client = get_openai_client()
+    if client is None:
+        record_llm_call(job_role, 'projects', fallback_reason='unavailable')
         return get_fallback_projects(job_role)
     
     try:
-        prompt = generate_project_prompt(job_role)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a senior software architect and project manager who designs real-world, industry-relevant projects for skill development."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.8,
-            max_tokens=3000
-        )
-        return response.choices[0].message.content
-    except Exception:
+        return complete_with_telemetry(client, build_request('projects', job_role), job_role, 'projects')
+    except Exception as e:
+        record_llm_call(job_role, 'projects', fallback_reason=fallback_reason(e))
         return get_fallback_projects(job_role)
 
+@timed('llm')
+@track_cache_hits('resources')
 @st.cache_data
 def get_learning_resources(job_role):
     """Generate comprehensive learning resources for the job role"""
-    if not OPENAI_AVAILABLE or client is None:
+    client = get_openai_client()
+    if client is None:
+        record_llm_call(job_role, 'resources', fallback_reason='unavailable')
         return get_fallback_resources(job_role)
     
     try:
-        prompt = generate_resources_prompt(job_role)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert career coach and technical educator with comprehensive knowledge of learning resources across all technology domains."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.6,
-            max_tokens=3500
-        )
-        return response.choices[0].message.content
-    except Exception:
+        return complete_with_telemetry(client, build_request('resources', job_role), job_role, 'resources')
+    except Exception as e:
+        record_llm_call(job_role, 'resources', fallback_reason=fallback_reason(e))
         return get_fallback_resources(job_role)
 
+def get_fallback_roadmap(job_role):
+    """Provide a fallback career roadmap when OpenAI is not available"""
+    return f"""
+## 🗺️ Career Roadmap for {job_role}
+
+### Stage 1: Foundation
+Learn the core concepts, tools and programming fundamentals every {job_role} relies on.
+
+### Stage 2: Intermediate
+Apply them in guided projects, learn the standard frameworks and practices of the field, and start contributing to team work.
+
+### Stage 3: Advanced
+Specialize in one area of {job_role} work, earn a relevant certification, and build a portfolio of real-world projects.
+
+*For a detailed, personalized roadmap with specific skills, courses and timelines, configure OpenAI API key.*
+"""
+
 def get_fallback_projects(job_role):
     """Provide fallback project ideas when OpenAI is not available"""
     return f"""
@@ -544,341 +458,71 @@ def get_fallback_resources(job_role):
 *For comprehensive, specific resource recommendations with exact course names, books, and links, configure OpenAI API key.*
 """
 
-# Load the model
+# Load the model (on first prediction, not at import)
+@timed('model')
 @st.cache_resource
 def load_model():
-    return joblib.load('job_role_model.pkl')
+    import joblib
+    from inference import MODEL_PATH
+    return joblib.load(MODEL_PATH)
 
-model = load_model()
+# Input histograms of this server process (None when CAREERPATH_DRIFT_MONITOR=0)
+@st.cache_resource
+def get_drift_monitor():
+    from drift import load_drift_monitor
+    return load_drift_monitor()
+
+# Training histograms the drift report compares live inputs with
+@st.cache_resource
+def get_drift_reference():
+    from drift import load_reference
+    return load_reference()
+
+# One scheduler per server process, so predictions from concurrent sessions share model calls
+@timed('model')
+@st.cache_resource
+def get_prediction_scheduler():
+    from inference import BatchScheduler
+    from shadow import load_shadow_evaluator
+    return BatchScheduler(load_model(), shadow=load_shadow_evaluator(), monitor=get_drift_monitor())
+
+# Decision-path explanations, cached per leaf for the life of the process
+@st.cache_resource
+def get_explainer():
+    from explain import TreeExplainer
+    return TreeExplainer.for_model(load_model())
+
+# Training profiles similar to the user's, memory-mapped from neighbors_index.joblib
+@timed('model')
+@st.cache_resource
+def get_neighbor_index():
+    from neighbors import NeighborIndex, NEIGHBORS_PATH
+    return NeighborIndex.load(NEIGHBORS_PATH)
 
 # Page configuration already set at the top
 
+# Styles are a static asset (static/styles.min.css, built from assets/styles.css by build_assets.py)
+@st.cache_resource
+def load_stylesheet():
+    """Read the minified stylesheet once per process and fingerprint it for cache busting"""
+    css = Path('static/styles.min.css').read_text(encoding='utf-8')
+    return css, hashlib.sha256(css.encode()).hexdigest()[:12]
+
+def inject_styles():
+    """Link the cacheable stylesheet; inline it only when static file serving is disabled"""
+    css, version = load_stylesheet()
+    if st.get_option("server.enableStaticServing"):
+        st.markdown(f'<link rel="stylesheet" href="app/static/styles.min.css?v={version}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+def store_rerun_timings(timings):
+    """Keep the latest rerun timings for the debug panel"""
+    st.session_state.last_rerun_timings = timings
+
 # Custom CSS for bright, modern UI with excellent visibility
-st.markdown("""
-<style>
-    /* Import Google Fonts for better typography */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Global styling for bright, clean interface */
-    .stApp {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Main content area */
-    .main .block-container {
-        padding: 2rem 1rem;
-        background: rgba(255, 255, 255, 0.9);
-        border-radius: 20px;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        backdrop-filter: blur(10px);
-        margin: 1rem;
-    }
-    
-    /* Text selection with vibrant colors */
-    ::selection {
-        background-color: #667eea;
-        color: white;
-    }
-    
-    ::-moz-selection {
-        background-color: #667eea;
-        color: white;
-    }
-    
-    /* Headers with bright, modern styling */
-    h1, h2, h3, h4, h5, h6 {
-        color: #2d3748 !important;
-        font-family: 'Inter', sans-serif;
-        font-weight: 600;
-    }
-    
-    /* Paragraph text with excellent readability */
-    p, .stMarkdown p {
-        color: #4a5568 !important;
-        font-family: 'Inter', sans-serif;
-        line-height: 1.7;
-    }
-    
-    /* Form elements with bright, clean styling */
-    .stSelectbox > div > div > div {
-        background: linear-gradient(145deg, #ffffff, #f7fafc) !important;
-        color: #2d3748 !important;
-        border: 2px solid #e2e8f0 !important;
-        border-radius: 12px !important;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05) !important;
-        font-family: 'Inter', sans-serif;
-        font-weight: 500;
-    }
-    
-    .stSelectbox > div > div > div:hover {
-        border-color: #667eea !important;
-        box-shadow: 0 4px 12px rgba(102, 126, 234, 0.15) !important;
-    }
-    
-    .stNumberInput > div > div > input,
-    .stTextInput > div > div > input {
-        background: linear-gradient(145deg, #ffffff, #f7fafc) !important;
-        color: #2d3748 !important;
-        border: 2px solid #e2e8f0 !important;
-        border-radius: 12px !important;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05) !important;
-        font-family: 'Inter', sans-serif;
-        font-weight: 500;
-        font-size: 16px !important;
-    }
-    
-    .stNumberInput > div > div > input:focus,
-    .stTextInput > div > div > input:focus {
-        border-color: #667eea !important;
-        box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1), 0 4px 12px rgba(102, 126, 234, 0.15) !important;
-    }
-    
-    /* Form labels with bright, readable text */
-    .stSelectbox label, 
-    .stNumberInput label, 
-    .stTextInput label, 
-    .stSlider label,
-    .stCheckbox label,
-    .stRadio label {
-        color: #2d3748 !important;
-        font-weight: 600 !important;
-        font-size: 14px !important;
-        font-family: 'Inter', sans-serif;
-        margin-bottom: 8px !important;
-    }
-    
-    /* Checkboxes with modern styling */
-    .stCheckbox > label {
-        background: rgba(255, 255, 255, 0.8);
-        padding: 8px 12px;
-        border-radius: 8px;
-        border: 1px solid #e2e8f0;
-        margin: 4px 0;
-        transition: all 0.2s ease;
-    }
-    
-    .stCheckbox > label:hover {
-        background: rgba(102, 126, 234, 0.05);
-        border-color: #667eea;
-    }
-    
-    /* Slider with vibrant theme */
-    .stSlider > div > div > div {
-        background: linear-gradient(90deg, #667eea, #764ba2) !important;
-    }
-    
-    /* Buttons with bright, modern gradient */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 12px !important;
-        padding: 12px 24px !important;
-        font-weight: 600 !important;
-        font-family: 'Inter', sans-serif;
-        font-size: 16px !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 12px rgba(102, 126, 234, 0.3) !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 8px 25px rgba(102, 126, 234, 0.4) !important;
-        background: linear-gradient(135deg, #5a67d8 0%, #6b46c1 100%) !important;
-    }
-    
-    /* Main header with stunning gradient */
-    .main-header {
-        font-size: 3.5rem;
-        font-weight: 700;
-        text-align: center;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        margin-bottom: 2rem;
-        padding: 1rem 0;
-        font-family: 'Inter', sans-serif;
-        text-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-    }
-    
-    /* Hero section with bright, attractive design */
-    .landing-hero {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 4rem 2rem;
-        border-radius: 24px;
-        text-align: center;
-        color: white;
-        margin: 2rem 0;
-        box-shadow: 0 20px 40px rgba(102, 126, 234, 0.3);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .landing-hero::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: url("data:image/svg+xml,%3Csvg width='60' height='60' viewBox='0 0 60 60' xmlns='http://www.w3.org/2000/svg'%3E%3Cg fill='none' fill-rule='evenodd'%3E%3Cg fill='%23ffffff' fill-opacity='0.1'%3E%3Ccircle cx='30' cy='30' r='2'/%3E%3C/g%3E%3C/g%3E%3C/svg%3E");
-        opacity: 0.3;
-    }
-    
-    /* Feature cards with bright, clean design */
-    .feature-card {
-        background: linear-gradient(145deg, #ffffff, #f8fafc);
-        padding: 2.5rem;
-        border-radius: 20px;
-        box-shadow: 0 10px 30px rgba(0, 0, 0, 0.08);
-        margin: 1rem 0;
-        border: 1px solid rgba(102, 126, 234, 0.1);
-        transition: all 0.3s ease;
-        position: relative;
-        overflow: hidden;
-        backdrop-filter: blur(10px);
-    }
-    
-    .feature-card:hover {
-        transform: translateY(-8px);
-        box-shadow: 0 20px 40px rgba(102, 126, 234, 0.15);
-        border-color: rgba(102, 126, 234, 0.3);
-    }
-    
-    .feature-card h3 {
-        color: #2d3748 !important;
-        font-weight: 700;
-        margin-bottom: 1rem;
-        font-size: 1.4rem;
-    }
-    
-    .feature-card p {
-        color: #4a5568 !important;
-        line-height: 1.7;
-        font-size: 1rem;
-    }
-    
-    /* Login form with bright, welcoming design */
-    .login-form {
-        background: linear-gradient(145deg, #ffffff, #f8fafc);
-        padding: 3rem;
-        border-radius: 24px;
-        box-shadow: 0 20px 40px rgba(0, 0, 0, 0.1);
-        max-width: 420px;
-        margin: 2rem auto;
-        border: 1px solid rgba(102, 126, 234, 0.1);
-        backdrop-filter: blur(10px);
-    }
-    
-    /* Metric cards with bright, informative design */
-    div[data-testid="metric-container"] {
-        background: linear-gradient(145deg, #ffffff, #f8fafc) !important;
-        border: 1px solid rgba(102, 126, 234, 0.1) !important;
-        padding: 1.5rem !important;
-        border-radius: 16px !important;
-        box-shadow: 0 8px 20px rgba(0, 0, 0, 0.08) !important;
-        transition: all 0.3s ease;
-    }
-    
-    div[data-testid="metric-container"]:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 12px 30px rgba(102, 126, 234, 0.15) !important;
-    }
-    
-    div[data-testid="metric-container"] > div {
-        color: #2d3748 !important;
-        font-family: 'Inter', sans-serif;
-        font-weight: 600;
-    }
-    
-    /* Tab styling with bright, modern appearance */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 12px;
-        background: rgba(255, 255, 255, 0.5);
-        padding: 8px;
-        border-radius: 16px;
-        backdrop-filter: blur(10px);
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background: rgba(255, 255, 255, 0.7);
-        color: #4a5568;
-        border-radius: 12px;
-        padding: 12px 20px;
-        font-weight: 600;
-        font-family: 'Inter', sans-serif;
-        border: 1px solid rgba(102, 126, 234, 0.1);
-        transition: all 0.3s ease;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #667eea, #764ba2);
-        color: white;
-        box-shadow: 0 4px 12px rgba(102, 126, 234, 0.3);
-        transform: translateY(-2px);
-    }
-    
-    /* Dashboard with bright, professional design */
-    .user-dashboard {
-        background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-        padding: 3rem;
-        border-radius: 24px;
-        color: white;
-        margin-bottom: 2rem;
-        box-shadow: 0 20px 40px rgba(79, 172, 254, 0.3);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    /* Info, success, and warning boxes with bright themes */
-    .stInfo {
-        background: linear-gradient(145deg, #ebf8ff, #bee3f8) !important;
-        border-left: 4px solid #3182ce !important;
-        color: #2a4365 !important;
-        border-radius: 12px;
-        padding: 1rem 1.5rem;
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .stSuccess {
-        background: linear-gradient(145deg, #f0fff4, #c6f6d5) !important;
-        border-left: 4px solid #38a169 !important;
-        color: #22543d !important;
-        border-radius: 12px;
-        padding: 1rem 1.5rem;
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .stWarning {
-        background: linear-gradient(145deg, #fffbeb, #fed7aa) !important;
-        border-left: 4px solid #d69e2e !important;
-        color: #744210 !important;
-        border-radius: 12px;
-        padding: 1rem 1.5rem;
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Sidebar styling */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-    }
-    
-    /* Additional bright styling for better visibility */
-    .stMarkdown {
-        color: #2d3748;
-    }
-    
-    /* Spinner with bright theme */
-    .stSpinner {
-        color: #667eea !important;
-    }
-    
-    /* Progress bar with gradient */
-    .stProgress > div > div {
-        background: linear-gradient(90deg, #667eea, #764ba2) !important;
-    }
-</style>""", unsafe_allow_html=True)
+with span('inject_css'):
+    inject_styles()
 
 # Session state initialization
 if 'authenticated' not in st.session_state:
@@ -1228,321 +872,345 @@ def show_prediction_interface(show_nav=True):
     </div>
     """, unsafe_allow_html=True)
     
-    # Model loading
-    model = load_model()
-    
-    # Create two columns for the form
-    col1, col2 = st.columns(2)
+    # Inputs and results rerun as a fragment, so a prediction never reruns the whole page
+    show_prediction_form()
+
+@st.fragment
+@timed_fragment('prediction_form', on_finish=store_rerun_timings)
+def show_prediction_form():
+    """Display the prediction inputs as one form; edits are sent together on submit"""
+    with st.form("prediction_form", border=False):
+        # Create two columns for the form
+        col1, col2 = st.columns(2)
     
-    with col1:
-        st.markdown("### 📊 Skills & Capabilities")
+        with col1:
+            st.markdown("### 📊 Skills & Capabilities")
+        
+            # Numeric input fields
+            Logical_quotient_rating = st.slider("Logical Quotient Rating:", min_value=1, max_value=10, value=5)
+            coding_skills_rating = st.slider("Coding Skills Rating:", min_value=1, max_value=10, value=5)
+            hackathons = st.number_input("Number of Hackathons Participated:", min_value=0, max_value=50, value=0)
+            public_speaking_points = st.slider("Public Speaking Points:", min_value=1, max_value=10, value=5)
         
-        # Numeric input fields
-        Logical_quotient_rating = st.slider("Logical Quotient Rating:", min_value=1, max_value=10, value=5)
-        coding_skills_rating = st.slider("Coding Skills Rating:", min_value=1, max_value=10, value=5)
-        hackathons = st.number_input("Number of Hackathons Participated:", min_value=0, max_value=50, value=0)
-        public_speaking_points = st.slider("Public Speaking Points:", min_value=1, max_value=10, value=5)
+            # Memory capability mapping
+            selected_memory = st.selectbox("Memory Capability Score:", list(LEVELS.keys()))
+            memory_score = LEVELS[selected_memory]
+
+            # Yes/No encoded fields
+            self_learning_capability = 1 if st.selectbox("Self-Learning Capability?", ["No", "Yes"]) == "Yes" else 0
+            extra_courses = 1 if st.selectbox("Did Extra Courses?", ["No", "Yes"]) == "Yes" else 0
+            senior_input = 1 if st.selectbox("Taken Inputs from Seniors?", ["No", "Yes"]) == "Yes" else 0
+            team_work = 1 if st.selectbox("Worked in Teams?", ["No", "Yes"]) == "Yes" else 0
+            introvert = 1 if st.selectbox("Are you Introvert?", ["No", "Yes"]) == "Yes" else 0
+
+            selected_skill = st.selectbox("Reading/Writing Skills Level:", list(LEVELS.keys()))
+            skill_value = LEVELS[selected_skill]
+            rw_skills = skill_value
+
+        with col2:
+            st.markdown("### 🎯 Preferences & Interests")
+
+            # Binary checkboxes
+            b_hard_worker = 1 if st.checkbox("Are you a Hard Worker?") else 0
+            b_smart_worker = 1 if st.checkbox("Are you a Smart Worker?") else 0
+            a_management = 1 if st.checkbox("Aspired Management Role?") else 0
+            a_technical = 1 if st.checkbox("Aspired Technical Role?") else 0
+
+            # Certification mapping
+            selected_cert = st.selectbox("Select a Certification:", list(CERTIFICATIONS.keys()))
+            cert_value = CERTIFICATIONS[selected_cert]
+
+            # Book type mapping
+            selected_book_type = st.selectbox("Select Interested Type of Books:", list(BOOK_TYPES.keys()))
+            book_type_value = BOOK_TYPES[selected_book_type]
+
+            # Workshop mapping
+            selected_workshop = st.selectbox("Select a Workshop Attended:", list(WORKSHOPS.keys()))
+            workshop_value = WORKSHOPS[selected_workshop]
+
+            # Additional fields in full width
+            st.markdown("### 🏢 Career Preferences")
+
+            col3, col4 = st.columns(2)
+
+            with col3:
+                # Interested subjects mapping
+                selected_subject = st.selectbox("Select an Interested Subject:", list(SUBJECTS.keys()))
+                subject_value = SUBJECTS[selected_subject]
+
+                # Interested career area mapping
+                selected_career_area = st.selectbox("Select Your Interested Career Area:", list(CAREER_AREAS.keys()))
+                career_area_value = CAREER_AREAS[selected_career_area]
+
+            with col4:
+                # Company type mapping
+                selected_company_type = st.selectbox("Type of company you want to settle in?", list(COMPANY_TYPES.keys()))
+                company_type_value = COMPANY_TYPES[selected_company_type]
+
+            # Predict button
+            st.markdown("---")
+            col_predict, col_reset = st.columns([3, 1])
+            
+            with col_predict:
+                predict_clicked = st.form_submit_button("🔍 Predict My Career Path", use_container_width=True)
+            
+            with col_reset:
+                # Submitting without predicting reruns only this fragment and clears the results
+                reset_clicked = st.form_submit_button("🔄 Reset", use_container_width=True)
+    
+    if reset_clicked:
+        st.session_state.pop('prediction_result', None)
+        return
+    
+    # Encoded features in the model's column order (see features.py)
+    features = [Logical_quotient_rating, coding_skills_rating, hackathons, public_speaking_points, self_learning_capability,
+                extra_courses, senior_input, team_work, introvert, rw_skills,
+                memory_score, b_hard_worker, b_smart_worker, a_management, a_technical, subject_value,
+                book_type_value, cert_value, workshop_value, company_type_value, career_area_value]
+    user_id = st.session_state.user_info['id'] if st.session_state.authenticated else None
+    
+    # Any rerun with the inputs of the last prediction re-renders it from the session: no model call,
+    # no second saved prediction and no guide lookups. Only changed inputs are predicted again.
+    result = st.session_state.get('prediction_result')
+    current = result is not None and result['features'] == features and result['user_id'] == user_id
+    if predict_clicked and not current:
+        result = predict_profile(features, user_id)
+        st.session_state.prediction_result = result
+    if predict_clicked or current:
+        show_prediction_results(result)
+
+def predict_profile(features, user_id):
+    """Predict, explain and save one profile; returns the session's prediction_result record"""
+    input_data = to_frame([features])
+    
+    with st.spinner("🤖 Analyzing your profile..."):
+        # Model loading (cached after the first prediction); the scheduler batches concurrent sessions
+        scheduler = get_prediction_scheduler()
+        with span('model.predict', 'model'):
+            prediction = scheduler.predict([features])[0]
+        explainer = get_explainer()
+        with span('model.explain', 'model'):
+            explanation = explainer.explain(features) if explainer else None
+        with span('model.what_if', 'model'):
+            from functools import partial
+            from sensitivity import what_if
+            # Variants are not live inputs, so the drift monitor does not count them
+            sensitivity = what_if(partial(scheduler.predict_proba, observe=False), scheduler.classes, features)
+        neighbor_index = get_neighbor_index()
+        with span('model.neighbors', 'model'):
+            similar = neighbor_index.query(features)
         
-        # Memory capability mapping
-        memory_mapping = {"poor": 0, "medium": 1, "excellent": 2}
-        selected_memory = st.selectbox("Memory Capability Score:", list(memory_mapping.keys()))
-        memory_score = memory_mapping[selected_memory]
-
-        # Yes/No encoded fields
-        self_learning_capability = 1 if st.selectbox("Self-Learning Capability?", ["No", "Yes"]) == "Yes" else 0
-        extra_courses = 1 if st.selectbox("Did Extra Courses?", ["No", "Yes"]) == "Yes" else 0
-        senior_input = 1 if st.selectbox("Taken Inputs from Seniors?", ["No", "Yes"]) == "Yes" else 0
-        team_work = 1 if st.selectbox("Worked in Teams?", ["No", "Yes"]) == "Yes" else 0
-        introvert = 1 if st.selectbox("Are you Introvert?", ["No", "Yes"]) == "Yes" else 0
-
-        skill_mapping = {"poor": 0, "medium": 1, "excellent": 2}
-        selected_skill = st.selectbox("Reading/Writing Skills Level:", list(skill_mapping.keys()))
-        skill_value = skill_mapping[selected_skill]
-        rw_skills = skill_value
+        # Save prediction if user is logged in
+        prediction_id = None
+        if user_id is not None:
+            prediction_id = save_prediction(user_id, prediction, input_data.to_dict())
+    
+    return {
+        'features': features,
+        'user_id': user_id,
+        'prediction': prediction,
+        'prediction_id': prediction_id,
+        'explanation': explanation,
+        'sensitivity': sensitivity,
+        'similar': similar,
+        # Generated guides per related career, filled in as the results render
+        'guides': {},
+        'celebrated': False,
+    }
 
-    with col2:
-        st.markdown("### 🎯 Preferences & Interests")
-
-        # Binary checkboxes
-        b_hard_worker = 1 if st.checkbox("Are you a Hard Worker?") else 0
-        b_smart_worker = 1 if st.checkbox("Are you a Smart Worker?") else 0
-        a_management = 1 if st.checkbox("Aspired Management Role?") else 0
-        a_technical = 1 if st.checkbox("Aspired Technical Role?") else 0
-
-        # Certification mapping
-        certification_mapping = {
-            'information security': 4, 'shell programming': 8, 'r programming': 7,
-            'distro making': 1, 'machine learning': 5, 'full stack': 2,
-            'hadoop': 3, 'app development': 0, 'python': 6
-        }
-        selected_cert = st.selectbox("Select a Certification:", list(certification_mapping.keys()))
-        cert_value = certification_mapping[selected_cert]
+def show_prediction_explanation(explanation):
+    """Display the answers that moved the model toward the predicted role"""
+    st.markdown("### 🔍 Why This Role?")
+    st.caption(f"The model asked {explanation['depth']} questions about your profile. "
+               f"These answers moved it most toward **{explanation['role']}** "
+               f"(from {explanation['prior']:.0%} for an average profile):")
+    for condition in explanation['conditions']:
+        arrow = "⬆️" if condition['contribution'] >= 0 else "⬇️"
+        st.markdown(f"- {arrow} **{condition['text']}** ({condition['contribution'] * 100:+.0f} pts)")
+
+def show_what_if(sensitivity):
+    """Display the single-answer changes that would change the predicted role"""
+    import pandas as pd
+    
+    flips = sensitivity['flips']
+    with st.expander(f"🔀 What If? {len(flips)} single-answer changes would change your predicted role"):
+        st.caption(f"Each of your answers was tried at every other value ({sensitivity['rows']} profiles, "
+                   f"scored together in {sensitivity['elapsed_ms']:.0f} ms).")
+        if not flips:
+            st.info("Changing any one answer keeps the same predicted role.")
+            return
+        flips_df = pd.DataFrame(flips)
+        answers = sorted(flips_df['answer'].unique(), key=lambda a: -len(flips_df[flips_df['answer'] == a]))
+        selected = st.multiselect("Answers", answers, default=answers[:5], key="what_if_answers")
+        shown = flips_df[flips_df['answer'].isin(selected)] if selected else flips_df
+        st.dataframe(
+            shown.rename(columns={'answer': 'Answer', 'from': 'Yours', 'to': 'If It Were',
+                                  'role': 'Predicted Role', 'probability': 'Probability'})
+                 [['Answer', 'Yours', 'If It Were', 'Predicted Role', 'Probability']],
+            use_container_width=True, hide_index=True
+        )
 
-        # Book type mapping
-        book_type_mapping = {
-            'Series': 28, 'Autobiographies': 3, 'Travel': 29, 'Guide': 13,
-            'Health': 14, 'Journals': 17, 'Anthology': 1, 'Dictionaries': 9
-        }
-        selected_book_type = st.selectbox("Select Interested Type of Books:", list(book_type_mapping.keys()))
-        book_type_value = book_type_mapping[selected_book_type]
-
-        # Workshop mapping
-        workshop_mapping = {
-            'testing': 6, 'database security': 2, 'game development': 3,
-            'data science': 1, 'system designing': 5, 'hacking': 4,
-            'cloud computing': 0, 'web technologies': 7
-        }
-        selected_workshop = st.selectbox("Select a Workshop Attended:", list(workshop_mapping.keys()))
-        workshop_value = workshop_mapping[selected_workshop]
-
-        # Additional fields in full width
-        st.markdown("### 🏢 Career Preferences")
-
-        col3, col4 = st.columns(2)
-
-        with col3:
-            # Interested subjects mapping
-            subject_mapping = {
-                'programming': 9, 'Management': 2, 'data engineering': 5,
-                'networks': 7, 'Software Engineering': 3, 'cloud computing': 4,
-                'parallel computing': 8, 'IOT': 1, 'Computer Architecture': 0, 'hacking': 6
-            }
-            selected_subject = st.selectbox("Select an Interested Subject:", list(subject_mapping.keys()))
-            subject_value = subject_mapping[selected_subject]
-
-            # Interested career area mapping
-            career_area_mapping = {
-                'testing': 5, 'system developer': 4, 'Business process analyst': 0,
-                'security': 3, 'developer': 2, 'cloud computing': 1
-            }
-            selected_career_area = st.selectbox("Select Your Interested Career Area:", list(career_area_mapping.keys()))
-            career_area_value = career_area_mapping[selected_career_area]
-
-        with col4:
-            # Company type mapping
-            company_type_mapping = {
-                'BPA': 0, 'Cloud Services': 1, 'product development': 9,
-                'Testing and Maintainance Services': 7, 'SAaS services': 4,
-                'Web Services': 8, 'Finance': 2, 'Sales and Marketing': 5,
-                'Product based': 3, 'Service Based': 6
-            }
-            selected_company_type = st.selectbox("Type of company you want to settle in?", list(company_type_mapping.keys()))
-            company_type_value = company_type_mapping[selected_company_type]
-
-        # Create input DataFrame (preserved original logic)
-        input_data = pd.DataFrame([[Logical_quotient_rating, coding_skills_rating, hackathons, public_speaking_points, self_learning_capability,
-                                    extra_courses, senior_input, team_work, introvert, rw_skills,
-                                    memory_score, b_hard_worker, b_smart_worker, a_management, a_technical, subject_value,
-                                    book_type_value, cert_value, workshop_value, company_type_value, career_area_value]], columns=[
-            'Logical quotient rating', 'coding skills rating', 'hackathons', 'public speaking points', 'self-learning capability?',
-            'Extra-courses did', 'Taken inputs from seniors or elders', 'worked in teams ever?', 'Introvert', 'reading and writing skills',
-            'memory capability score', 'B_hard worker', 'B_smart worker', 'A_Management', 'A_Technical', 'Interested subjects_code',
-            'Interested Type of Books_code', 'certifications_code', 'workshops_code', 'Type of company want to settle in?_code',
-            'interested career area _code'
-        ])
-
-        # Predict button
-        st.markdown("---")
-        col_predict, col_reset = st.columns([3, 1])
-        
-        with col_predict:
-            if st.button("🔍 Predict My Career Path", use_container_width=True):
-                with st.spinner("🤖 Analyzing your profile..."):
-                    prediction = model.predict(input_data)[0]
-                    
-                    # Save prediction if user is logged in
-                    if st.session_state.authenticated:
-                        save_prediction(st.session_state.user_info['id'], prediction, input_data.to_dict())
-                    
-                    st.balloons()
-                    st.success(f"✅ **Recommended Job Role: {prediction}**")
+def show_similar_profiles(similar):
+    """Display the roles of the most similar real profiles in the training data"""
+    import pandas as pd
+    
+    st.markdown("### 👥 Profiles Like You")
+    st.caption(f"The {similar['k']} of {similar['profiles_indexed']:,} real profiles that share the most answers "
+               f"with yours, and the roles they were given:")
+    roles_df = pd.DataFrame(similar['roles']).set_index('role')
+    st.bar_chart(roles_df['share'])
+    with st.expander("See the similar profiles"):
+        st.dataframe(
+            pd.DataFrame([{
+                'Role': p['role'],
+                'Matching Answers': f"{p['matching']}/{p['matching'] + len(p['differences'])}",
+                'Answered Differently': ", ".join(f"{d['answer']}: {d['value']}" for d in p['differences']),
+            } for p in similar['profiles']]),
+            use_container_width=True, hide_index=True
+        )
+
+def submit_feedback(user_id, prediction_id):
+    """Save the role picked in the feedback form (a callback, so it runs before the rerun)"""
+    save_feedback(user_id, prediction_id, st.session_state[f"feedback_role_{prediction_id}"])
+
+def show_feedback_form(prediction, prediction_id):
+    """Let the user confirm the predicted role or pick the one that fits (learned by refresh_model.py)"""
+    user_id = st.session_state.user_info['id']
+    roles = get_prediction_scheduler().classes
+    saved = get_feedback(user_id, prediction_id)
+    
+    st.markdown("### 🗳️ Was This Prediction Right?")
+    with st.form(f"feedback_{prediction_id}"):
+        current = saved or prediction
+        st.selectbox("The role that fits you best", roles, index=roles.index(current) if current in roles else 0,
+                     key=f"feedback_role_{prediction_id}")
+        st.form_submit_button("💾 Save Feedback", on_click=submit_feedback, args=(user_id, prediction_id))
+    if saved == prediction:
+        st.caption(f"✅ Thanks! You confirmed **{prediction}**. Your answer helps improve future predictions.")
+    elif saved:
+        st.caption(f"✅ Thanks! You chose **{saved}** instead. Your answer helps improve future predictions.")
+
+@st.fragment
+@timed_fragment('prediction_results', on_finish=store_rerun_timings)
+def show_prediction_results(result):
+    """Display the predicted role, profile summary, why the model chose it and related career guides"""
+    openai_available = get_openai_client() is not None
+    prediction = result['prediction']
+    explanation, sensitivity, similar = result['explanation'], result['sensitivity'], result['similar']
+    prediction_id = result['prediction_id']
+    logical_quotient, coding_skills, hackathons, public_speaking = result['features'][:4]
+    
+    # Balloons for a new prediction only, not when it is re-rendered
+    if not result['celebrated']:
+        st.balloons()
+        result['celebrated'] = True
+    st.success(f"✅ **Recommended Job Role: {prediction}**")
                     
-                    # Show additional insights
-                    st.markdown("### 📊 Your Profile Summary")
-                    col_a, col_b, col_c, col_d = st.columns(4)
+    # Show additional insights
+    st.markdown("### 📊 Your Profile Summary")
+    col_a, col_b, col_c, col_d = st.columns(4)
                     
-                    with col_a:
-                        st.metric("Logic Rating", f"{Logical_quotient_rating}/10")
-                    with col_b:
-                        st.metric("Coding Skills", f"{coding_skills_rating}/10")
-                    with col_c:
-                        st.metric("Hackathons", hackathons)
-                    with col_d:
-                        st.metric("Public Speaking", f"{public_speaking_points}/10")
+    with col_a:
+        st.metric("Logic Rating", f"{logical_quotient}/10")
+    with col_b:
+        st.metric("Coding Skills", f"{coding_skills}/10")
+    with col_c:
+        st.metric("Hackathons", hackathons)
+    with col_d:
+        st.metric("Public Speaking", f"{public_speaking}/10")
+    
+    if explanation and explanation['role'] == prediction:
+        show_prediction_explanation(explanation)
+    
+    if sensitivity:
+        show_what_if(sensitivity)
+    
+    if similar and similar['profiles']:
+        show_similar_profiles(similar)
+    
+    if prediction_id is not None:
+        show_feedback_form(prediction, prediction_id)
                     
-                    # Show Related Career Fields
-                    st.markdown("---")
-                    st.markdown("### 🎯 Related Career Fields You Can Explore")
+    # Show Related Career Fields
+    st.markdown("---")
+    st.markdown("### 🎯 Related Career Fields You Can Explore")
                     
-                    if prediction in RELATED_CAREERS:
-                        related_careers = RELATED_CAREERS[prediction]
-                        
-                        st.info(f"💡 Based on your predicted role **{prediction}**, here are 3 related career paths you can also consider:")
+    related_careers = get_related_careers(prediction)
+    if related_careers:
+        st.info(f"💡 Based on your predicted role **{prediction}**, here are {len(related_careers)} related career paths you can also consider:")
                         
-                        # Display related careers in columns
-                        col1, col2, col3 = st.columns(3)
+        # Display related careers in columns
+        for column, career, (icon, gradient) in zip(st.columns(len(related_careers)), related_careers, RELATED_CARD_STYLES):
+            with column:
+                st.markdown(f"""
+                <div style="background: linear-gradient(135deg, {gradient}); 
+                            padding: 1rem; border-radius: 10px; text-align: center; color: white; margin: 0.5rem 0;">
+                    <h4>{icon} {career}</h4>
+                </div>
+                """, unsafe_allow_html=True)
                         
-                        with col1:
-                            st.markdown(f"""
-                            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                                        padding: 1rem; border-radius: 10px; text-align: center; color: white; margin: 0.5rem 0;">
-                                <h4>🚀 {related_careers[0]}</h4>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col2:
-                            st.markdown(f"""
-                            <div style="background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
-                                        padding: 1rem; border-radius: 10px; text-align: center; color: white; margin: 0.5rem 0;">
-                                <h4>💻 {related_careers[1]}</h4>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        with col3:
-                            st.markdown(f"""
-                            <div style="background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); 
-                                        padding: 1rem; border-radius: 10px; text-align: center; color: white; margin: 0.5rem 0;">
-                                <h4>⚡ {related_careers[2]}</h4>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        # Career Roadmaps Section
-                        st.markdown("---")
-                        st.markdown("### 🗺️ Comprehensive Career Development Guide")
-                        
-                        if not OPENAI_AVAILABLE:
-                            st.info("💡 **Note**: Using built-in roadmaps. For AI-generated personalized roadmaps, configure your OpenAI API key for detailed, industry-specific guidance.")
-                        else:
-                            st.success("🤖 **AI-Powered**: Generating personalized, detailed roadmaps with current industry insights and specific resources.")
-                        
-                        # Create tabs for each career with comprehensive content
-                        tab1, tab2, tab3 = st.tabs([
-                            f"🎯 {related_careers[0]}", 
-                            f"💻 {related_careers[1]}", 
-                            f"⚡ {related_careers[2]}"
-                        ])
+        # Career Roadmaps Section
+        st.markdown("---")
+        st.markdown("### 🗺️ Comprehensive Career Development Guide")
                         
-                        with tab1:
-                            st.markdown(f"# 🎯 Complete Guide: {related_careers[0]}")
-                            
-                            # Create sub-tabs for different aspects
-                            subtab1, subtab2, subtab3 = st.tabs(["📚 Learning Roadmap", "🛠️ Project Ideas", "📖 Resources"])
-                            
-                            with subtab1:
-                                if OPENAI_AVAILABLE:
-                                    with st.spinner(f"🤖 Generating comprehensive roadmap for {related_careers[0]}..."):
-                                        roadmap1 = get_career_roadmap(related_careers[0])
-                                        st.markdown(roadmap1)
-                                else:
-                                    roadmap1 = get_career_roadmap(related_careers[0])
-                                    st.markdown(roadmap1)
-                            
-                            with subtab2:
-                                if OPENAI_AVAILABLE:
-                                    with st.spinner(f"🛠️ Generating project ideas for {related_careers[0]}..."):
-                                        projects1 = get_project_ideas(related_careers[0])
-                                        st.markdown(projects1)
-                                else:
-                                    projects1 = get_project_ideas(related_careers[0])
-                                    st.markdown(projects1)
-                            
-                            with subtab3:
-                                if OPENAI_AVAILABLE:
-                                    with st.spinner(f"📖 Generating learning resources for {related_careers[0]}..."):
-                                        resources1 = get_learning_resources(related_careers[0])
-                                        st.markdown(resources1)
-                                else:
-                                    resources1 = get_learning_resources(related_careers[0])
-                                    st.markdown(resources1)
+        if not openai_available:
+            st.info("💡 **Note**: Using built-in roadmaps. For AI-generated personalized roadmaps, configure your OpenAI API key for detailed, industry-specific guidance.")
+        else:
+            st.success("🤖 **AI-Powered**: Generating personalized, detailed roadmaps with current industry insights and specific resources.")
                         
-                        with tab2:
-                            st.markdown(f"# 💻 Complete Guide: {related_careers[1]}")
-                            
-                            # Create sub-tabs for different aspects
-                            subtab1, subtab2, subtab3 = st.tabs(["📚 Learning Roadmap", "🛠️ Project Ideas", "📖 Resources"])
-                            
-                            with subtab1:
-                                if OPENAI_AVAILABLE:
-                                    with st.spinner(f"🤖 Generating comprehensive roadmap for {related_careers[1]}..."):
-                                        roadmap2 = get_career_roadmap(related_careers[1])
-                                        st.markdown(roadmap2)
-                                else:
-                                    roadmap2 = get_career_roadmap(related_careers[1])
-                                    st.markdown(roadmap2)
-                            
-                            with subtab2:
-                                if OPENAI_AVAILABLE:
-                                    with st.spinner(f"🛠️ Generating project ideas for {related_careers[1]}..."):
-                                        projects2 = get_project_ideas(related_careers[1])
-                                        st.markdown(projects2)
-                                else:
-                                    projects2 = get_project_ideas(related_careers[1])
-                                    st.markdown(projects2)
-                            
-                            with subtab3:
-                                if OPENAI_AVAILABLE:
-                                    with st.spinner(f"📖 Generating learning resources for {related_careers[1]}..."):
-                                        resources2 = get_learning_resources(related_careers[1])
-                                        st.markdown(resources2)
-                                else:
-                                    resources2 = get_learning_resources(related_careers[1])
-                                    st.markdown(resources2)
+        # Create tabs for each career with comprehensive content
+        tabs = st.tabs([f"{icon} {career}" for career, (icon, _) in zip(related_careers, RELATED_CARD_STYLES)])
                         
-                        with tab3:
-                            st.markdown(f"# ⚡ Complete Guide: {related_careers[2]}")
-                            
-                            # Create sub-tabs for different aspects
-                            subtab1, subtab2, subtab3 = st.tabs(["📚 Learning Roadmap", "🛠️ Project Ideas", "📖 Resources"])
-                            
-                            with subtab1:
-                                if OPENAI_AVAILABLE:
-                                    with st.spinner(f"🤖 Generating comprehensive roadmap for {related_careers[2]}..."):
-                                        roadmap3 = get_career_roadmap(related_careers[2])
-                                        st.markdown(roadmap3)
-                                else:
-                                    roadmap3 = get_career_roadmap(related_careers[2])
-                                    st.markdown(roadmap3)
-                            
-                            with subtab2:
-                                if OPENAI_AVAILABLE:
-                                    with st.spinner(f"🛠️ Generating project ideas for {related_careers[2]}..."):
-                                        projects3 = get_project_ideas(related_careers[2])
-                                        st.markdown(projects3)
-                                else:
-                                    projects3 = get_project_ideas(related_careers[2])
-                                    st.markdown(projects3)
-                            
-                            with subtab3:
-                                if OPENAI_AVAILABLE:
-                                    with st.spinner(f"📖 Generating learning resources for {related_careers[2]}..."):
-                                        resources3 = get_learning_resources(related_careers[2])
-                                        st.markdown(resources3)
-                                else:
-                                    resources3 = get_learning_resources(related_careers[2])
-                                    st.markdown(resources3)
+        sections = [
+            ('roadmap', get_career_roadmap, get_fallback_roadmap, "🤖 Generating comprehensive roadmap for {}..."),
+            ('projects', get_project_ideas, get_fallback_projects, "🛠️ Generating project ideas for {}..."),
+            ('resources', get_learning_resources, get_fallback_resources,
+             "📖 Generating learning resources for {}..."),
+        ]
+        for tab, career, (icon, _) in zip(tabs, related_careers, RELATED_CARD_STYLES):
+            with tab:
+                st.markdown(f"# {icon} Complete Guide: {career}")
+                                
+                # Create sub-tabs for different aspects
+                subtabs = st.tabs(["📚 Learning Roadmap", "🛠️ Project Ideas", "📖 Resources"])
+                
+                # Generated once per prediction; later reruns render the copy kept in the session
+                guide = result['guides'].setdefault(career, {})
+                generated = False
+                for subtab, (section, generate, _, message) in zip(subtabs, sections):
+                    with subtab:
+                        if section not in guide:
+                            if openai_available:
+                                with st.spinner(message.format(career)):
+                                    guide[section] = generate(career)
+                            else:
+                                guide[section] = generate(career)
+                            generated = True
+                        st.markdown(guide[section])
+                
+                # Only guides the LLM wrote count as cached for CAREERPATH_RELATED_CACHED_ONLY
+                if generated and openai_available and all(
+                        guide[section] != fallback(career) for section, _, fallback, _ in sections):
+                    get_generated_guides().add(career)
                         
-                        # Additional Career Guidance
-                        st.markdown("---")
-                        st.markdown("### 💡 Next Steps")
-                        st.info("""
-                        **🎯 How to Use This Information:**
-                        1. **Primary Path**: Focus on your predicted role - **{}**
-                        2. **Explore Options**: Consider the 3 related career fields based on your interests
-                        3. **Follow Roadmaps**: Use the detailed learning paths above to build required skills
-                        4. **Start Learning**: Begin with Foundation level skills and progress step by step
-                        5. **Build Projects**: Apply your learning through hands-on projects
-                        """.format(prediction))
+        # Additional Career Guidance
+        st.markdown("---")
+        st.markdown("### 💡 Next Steps")
+        st.info("""
+        **🎯 How to Use This Information:**
+        1. **Primary Path**: Focus on your predicted role - **{}**
+        2. **Explore Options**: Consider the {} related career fields based on your interests
+        3. **Follow Roadmaps**: Use the detailed learning paths above to build required skills
+        4. **Start Learning**: Begin with Foundation level skills and progress step by step
+        5. **Build Projects**: Apply your learning through hands-on projects
+        """.format(prediction, len(related_careers)))
                         
-                    else:
-                        st.warning("Related career recommendations not available for this role.")
+    else:
+        st.warning("Related career recommendations not available for this role.")
                         
-                    # Final motivation message
-                    st.markdown("---")
-                    st.success("🌟 **Remember**: Your career journey is unique. Use this as a guide, but don't limit yourself to these suggestions. Keep learning and exploring! 🚀")
-        
-        with col_reset:
-            if st.button("🔄 Reset", use_container_width=True):
-                st.rerun()
+    # Final motivation message
+    st.markdown("---")
+    st.success("🌟 **Remember**: Your career journey is unique. Use this as a guide, but don't limit yourself to these suggestions. Keep learning and exploring! 🚀")
 
 def show_dashboard():
     """Display user dashboard"""
@@ -1556,6 +1224,10 @@ def show_dashboard():
             st.rerun()
     with col_nav2:
         st.write(f"**Logged in as: {user['username']}**")
+        if is_admin(user):
+            if st.button("🛠️ Admin Reports", key="dashboard_admin"):
+                st.session_state.page = 'admin'
+                st.rerun()
     with col_nav3:
         if st.button("🚪 Logout", key="dashboard_logout"):
             st.session_state.authenticated = False
@@ -1573,7 +1245,9 @@ def show_dashboard():
     """, unsafe_allow_html=True)
     
     # Dashboard metrics
-    predictions = get_user_predictions(user['id'])
+    stats = get_user_stats(user['id'])
+    role_counts = stats['role_counts']
+    top_role = max(role_counts, key=role_counts.get) if role_counts else "—"
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -1584,46 +1258,78 @@ def show_dashboard():
             <h2>{}</h2>
             <p>Total Predictions</p>
         </div>
-        """.format(len(predictions)), unsafe_allow_html=True)
+        """.format(stats['total_predictions']), unsafe_allow_html=True)
     
     with col2:
         st.markdown("""
         <div class="metric-card">
-            <h3>👤</h3>
+            <h3>🧭</h3>
             <h2>{}</h2>
-            <p>Profile Score</p>
+            <p>Roles Explored</p>
         </div>
-        """.format("95%"), unsafe_allow_html=True)
+        """.format(len(role_counts)), unsafe_allow_html=True)
     
     with col3:
         st.markdown("""
         <div class="metric-card">
-            <h3>📈</h3>
+            <h3>🔥</h3>
             <h2>{}</h2>
-            <p>Growth Rate</p>
+            <p>Day Streak (best {})</p>
         </div>
-        """.format("+12%"), unsafe_allow_html=True)
+        """.format(stats['current_streak'], stats['longest_streak']), unsafe_allow_html=True)
     
     with col4:
         st.markdown("""
         <div class="metric-card">
             <h3>🏆</h3>
-            <h2>{}</h2>
-            <p>Accuracy</p>
+            <h2 style="font-size: 1.1rem;">{}</h2>
+            <p>Most Predicted Role</p>
         </div>
-        """.format("98%"), unsafe_allow_html=True)
+        """.format(top_role), unsafe_allow_html=True)
+    
+    if role_counts:
+        import pandas as pd
+        st.caption(f"Predicting since {stats['first_prediction_at'][:10]} · last prediction {stats['last_prediction_at'][:10]}")
+        st.bar_chart(pd.Series(role_counts, name="Predictions").sort_values(ascending=False))
     
-    # Recent predictions
-    if predictions:
-        st.markdown("### 📊 Recent Predictions")
-        for i, (prediction, date) in enumerate(predictions[:5]):
-            with st.expander(f"Prediction #{i+1} - {prediction} ({date[:10]})"):
-                st.write(f"**Result:** {prediction}")
-                st.write(f"**Date:** {date}")
+    # Prediction history, loaded a page at a time
+    if stats['total_predictions']:
+        show_prediction_history(user['id'], stats['total_predictions'])
     
     # Main prediction interface
     show_prediction_interface(show_nav=False)
 
+def load_next_history_page(user_id):
+    """Append the page after the loaded ones (button callback, runs before the fragment rerun)"""
+    more, cursor = get_prediction_page(user_id, st.session_state.history_cursor)
+    st.session_state.history_rows = st.session_state.history_rows + more
+    st.session_state.history_cursor = cursor
+
+@st.fragment
+def show_prediction_history(user_id, total):
+    """The user's predictions, newest first; more pages load on request and answers when opened"""
+    import pandas as pd
+    
+    # Pages already loaded stay in the session until a new prediction changes the history
+    if st.session_state.get('history_key') != (user_id, total):
+        rows, cursor = get_prediction_page(user_id)
+        st.session_state.history_key = (user_id, total)
+        st.session_state.history_rows = rows
+        st.session_state.history_cursor = cursor
+    
+    rows = st.session_state.history_rows
+    st.markdown("### 📊 Prediction History")
+    st.caption(f"Showing {len(rows)} of {total} predictions")
+    for prediction_id, prediction, date in rows:
+        with st.expander(f"{prediction} ({date[:16]})"):
+            if st.toggle("Show my answers", key=f"history_answers_{prediction_id}"):
+                answers = get_prediction_inputs(user_id, prediction_id)
+                st.dataframe(pd.DataFrame(answers, columns=["Question", "Answer"]),
+                             use_container_width=True, hide_index=True)
+    
+    if st.session_state.history_cursor:
+        st.button("⬇️ Load older predictions", key="history_more", on_click=load_next_history_page, args=(user_id,))
+
 def show_demo_mode():
     """Display demo mode"""
     st.markdown('<h1 class="main-header">👁️ Demo Mode</h1>', unsafe_allow_html=True)
@@ -1649,23 +1355,266 @@ def show_demo_mode():
     
     show_prediction_interface()
 
-# Navigation buttons moved to main content area
+def show_llm_usage_report():
+    """Display LLM latency and token spend per section and per role"""
+    days = st.selectbox("Time window", [1, 7, 30, 90], index=2,
+                        format_func=lambda d: f"Last {d} days", key="llm_usage_days")
+    telemetry_df = load_telemetry(days)
+    
+    if telemetry_df.empty:
+        st.info("No LLM calls recorded in this time window yet.")
+        return
+    
+    generated = telemetry_df[(telemetry_df['cache_hit'] == 0) & telemetry_df['fallback_reason'].isna()]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Calls", len(telemetry_df))
+    with col2:
+        st.metric("Cache Hit Rate", f"{telemetry_df['cache_hit'].mean():.0%}")
+    with col3:
+        p50 = generated['latency_ms'].quantile(0.5) if not generated.empty else 0
+        p95 = generated['latency_ms'].quantile(0.95) if not generated.empty else 0
+        st.metric("Latency p50 / p95", f"{p50 / 1000:.1f}s / {p95 / 1000:.1f}s")
+    with col4:
+        tokens = generated['prompt_tokens'].sum() + generated['completion_tokens'].sum()
+        st.metric("Tokens", f"{int(tokens):,}")
+    
+    st.markdown("#### 📑 Per Section")
+    st.dataframe(summarize(telemetry_df, 'section'), use_container_width=True)
+    
+    st.markdown("#### 🎯 Per Role")
+    st.dataframe(summarize(telemetry_df, 'role'), use_container_width=True)
+    
+    fallbacks = telemetry_df['fallback_reason'].value_counts()
+    if not fallbacks.empty:
+        st.markdown("#### ⚠️ Fallback Reasons")
+        st.bar_chart(fallbacks)
 
-# Main content routing
-if st.session_state.page == 'landing':
-    show_landing_page()
-elif st.session_state.page == 'login':
-    show_login_page()
-elif st.session_state.page == 'register':
-    show_register_page()
-elif st.session_state.page == 'dashboard' and st.session_state.authenticated:
-    show_dashboard()
-elif st.session_state.page == 'demo':
-    show_demo_mode()
-else:
-    # Default to landing if something goes wrong
-    st.session_state.page = 'landing'
-    show_landing_page()
+def show_shadow_report():
+    """Display how often the candidate model agrees with the live model, per predicted role"""
+    days = st.selectbox("Time window", [1, 7, 30, 90], index=2,
+                        format_func=lambda d: f"Last {d} days", key="shadow_days")
+    init_database()
+    shadow_df = load_shadow_results(days)
+    
+    if shadow_df.empty:
+        st.info("No shadow comparisons recorded in this time window. "
+                "Set CAREERPATH_SHADOW_MODEL_PATH to a candidate model to start shadow evaluation.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Compared Predictions", f"{len(shadow_df):,}")
+    with col2:
+        st.metric("Agreement", f"{shadow_df['agree'].mean():.1%}")
+    with col3:
+        st.metric("Live Batch p50", f"{shadow_df['live_ms'].quantile(0.5):.1f} ms")
+    with col4:
+        st.metric("Candidate Batch p50", f"{shadow_df['shadow_ms'].quantile(0.5):.1f} ms")
+    
+    candidates = shadow_df['candidate'].unique()
+    st.caption(f"Candidate model: {', '.join(candidates)}")
+    
+    st.markdown("#### 🎯 Disagreement by Live Role")
+    st.dataframe(summarize_disagreement(shadow_df), use_container_width=True)
+    
+    disagreements = shadow_df[shadow_df['agree'] == 0]
+    if not disagreements.empty:
+        st.markdown("#### 🔀 Most Common Switches")
+        switches = disagreements.groupby(['live_role', 'shadow_role']).size().sort_values(ascending=False).head(10)
+        st.dataframe(switches.rename('predictions').reset_index(), use_container_width=True, hide_index=True)
+
+def show_drift_report():
+    """Display how far live prediction inputs have drifted from the training data, per feature"""
+    from drift import PSI_WARN, PSI_ALERT, MIN_ROWS, init_drift_table, drift_report, feature_shares
+    from features import FEATURE_FIELDS, FEATURE_LABELS
+    
+    hours = st.selectbox("Time window", [1, 24, 168, 720], index=1,
+                         format_func=lambda h: f"Last {h} hours" if h < 24 else f"Last {h // 24} days",
+                         key="drift_hours")
+    # Created here and by the monitor rather than in init_database, which must not import numpy
+    init_drift_table()
+    # Counts of this process not written yet; other processes add theirs every flush interval
+    monitor = get_drift_monitor()
+    if monitor is not None:
+        monitor.flush()
+    since = (utcnow() - datetime.timedelta(hours=hours)).strftime('%Y-%m-%d %H')
+    reference = get_drift_reference()
+    conn = get_db_connection()
+    try:
+        report = drift_report(conn, since, reference)
+    finally:
+        conn.close()
+    
+    if not report['live_rows'].any():
+        st.info("No live inputs recorded in this time window. "
+                "Inputs are counted when CAREERPATH_DRIFT_MONITOR is on (the default).")
+        return
+    
+    alerts = report.index[report['status'] == 'alert'].tolist()
+    warned = report.index[report['status'] == 'warn'].tolist()
+    if alerts:
+        st.error(f"🚨 Drift alert (PSI ≥ {PSI_ALERT}): {', '.join(FEATURE_LABELS[f] for f in alerts)}")
+    elif warned:
+        st.warning(f"⚠️ Drift warning (PSI ≥ {PSI_WARN}): {', '.join(FEATURE_LABELS[f] for f in warned)}")
+    elif report['status'].eq('too few rows').all():
+        st.info(f"Fewer than {MIN_ROWS} live inputs in this time window; drift is not scored yet.")
+    else:
+        st.success("✅ Live inputs match the training distribution")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Live Inputs", f"{int(report['live_rows'].max()):,}")
+    with col2:
+        st.metric("Features in Alert", len(alerts))
+    with col3:
+        st.metric("Training Rows", f"{reference['rows']:,}")
+    st.caption(f"PSI ≥ {PSI_WARN} warns and ≥ {PSI_ALERT} alerts, once a feature has {MIN_ROWS} live inputs")
+    
+    st.markdown("#### 📊 Drift by Feature")
+    table = report.rename(index=FEATURE_LABELS).round({'psi': 4, 'kl': 4})
+    st.dataframe(table, use_container_width=True)
+    
+    field = st.selectbox("Compare answers", FEATURE_FIELDS, index=FEATURE_FIELDS.index(report.index[0]),
+                         format_func=FEATURE_LABELS.get, key="drift_feature")
+    conn = get_db_connection()
+    try:
+        shares = feature_shares(conn, field, since, reference)
+    finally:
+        conn.close()
+    st.markdown(f"#### 🔍 {FEATURE_LABELS[field]}: Live vs Training")
+    st.bar_chart(shares)
+
+def show_analytics_report():
+    """Display role distribution over time and by cohort, and answer trends, from the rollup tables"""
+    import time
+    import pandas as pd
+    from analytics import roles_by_day, roles_by_cohort, feature_by_day
+    from features import FEATURE_FIELDS, FEATURE_LABELS
+    
+    days = st.selectbox("Time window", [7, 30, 90, 365], index=1,
+                        format_func=lambda d: f"Last {d} days", key="analytics_days")
+    field = st.selectbox("Answer trend", FEATURE_FIELDS, format_func=FEATURE_LABELS.get, key="analytics_feature")
+    since = (utcnow() - datetime.timedelta(days=days)).strftime('%Y-%m-%d')
+    
+    started = time.perf_counter()
+    conn = get_db_connection()
+    try:
+        daily = roles_by_day(conn, since)
+        cohorts = roles_by_cohort(conn, since)
+        trend = feature_by_day(conn, field, since)
+    finally:
+        conn.close()
+    query_ms = (time.perf_counter() - started) * 1000
+    
+    if daily.empty:
+        st.info("No predictions saved in this time window yet.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Predictions", f"{int(daily.to_numpy().sum()):,}")
+    with col2:
+        st.metric("Most Predicted Role", daily.sum().idxmax())
+    with col3:
+        st.metric("Active Days", len(daily))
+    st.caption(f"Read from the rollup tables in {query_ms:.1f} ms")
+    
+    st.markdown("#### 📅 Predicted Roles per Day")
+    daily.index = pd.to_datetime(daily.index)
+    st.area_chart(daily)
+    
+    st.markdown("#### 👥 Role Share by Registration Cohort")
+    st.dataframe(cohorts, use_container_width=True)
+    
+    st.markdown(f"#### 📈 {FEATURE_LABELS[field]} over Time")
+    if trend.empty:
+        st.info("No answers recorded for this question in this time window.")
+    else:
+        trend.index = pd.to_datetime(trend.index)
+        if 'mean' in trend.columns:
+            st.line_chart(trend)
+        else:
+            st.bar_chart(trend)
+
+def show_admin_page():
+    """Display admin reports"""
+    user = st.session_state.user_info
+    
+    # Admin navigation
+    col_nav1, col_nav2, col_nav3 = st.columns([1, 1, 1])
+    with col_nav1:
+        if st.button("📊 Dashboard", key="admin_dashboard"):
+            st.session_state.page = 'dashboard'
+            st.rerun()
+    with col_nav2:
+        st.write(f"**Logged in as: {user['username']}** (admin)")
+    with col_nav3:
+        if st.button("🚪 Logout", key="admin_logout"):
+            st.session_state.authenticated = False
+            st.session_state.user_info = None
+            st.session_state.page = 'landing'
+            st.rerun()
+    
+    st.markdown("---")
+    st.markdown('<h1 class="main-header">🛠️ Admin Reports</h1>', unsafe_allow_html=True)
+    
+    tab_analytics, tab_llm, tab_shadow, tab_drift = st.tabs(
+        ["📈 Prediction Analytics", "⏱️ LLM Usage", "🕶️ Shadow Model", "🌊 Input Drift"])
+    
+    with tab_analytics:
+        show_analytics_report()
+    
+    with tab_llm:
+        show_llm_usage_report()
+    
+    with tab_shadow:
+        show_shadow_report()
+    
+    with tab_drift:
+        show_drift_report()
+
+# Navigation buttons moved to main content area
 
+def show_timing_panel():
+    """Display the timings of the previous rerun in the sidebar"""
+    import pandas as pd
+    
+    timings = st.session_state.get('last_rerun_timings')
+    with st.sidebar.expander("⏱️ Rerun Timings", expanded=True):
+        if not timings:
+            st.write("Timings appear after the first rerun.")
+            return
+        st.metric("Previous rerun", f"{timings['total_ms']:.1f} ms", help=f"Page: {timings['page']}")
+        st.write({kind: f"{ms:.1f} ms" for kind, ms in sorted(timings['by_kind'].items(), key=lambda kv: -kv[1])})
+        st.write(f"Untracked: {timings['untracked_ms']:.1f} ms")
+        st.dataframe(pd.DataFrame(timings['spans']), use_container_width=True, hide_index=True)
 
+if TIMINGS_ENABLED:
+    show_timing_panel()
 
+# Main content routing
+current_page = st.session_state.page
+try:
+    with span(f"page:{current_page}"):
+        if st.session_state.page == 'landing':
+            show_landing_page()
+        elif st.session_state.page == 'login':
+            show_login_page()
+        elif st.session_state.page == 'register':
+            show_register_page()
+        elif st.session_state.page == 'dashboard' and st.session_state.authenticated:
+            show_dashboard()
+        elif st.session_state.page == 'admin' and st.session_state.authenticated and is_admin(st.session_state.user_info):
+            show_admin_page()
+        elif st.session_state.page == 'demo':
+            show_demo_mode()
+        else:
+            # Default to landing if something goes wrong
+            st.session_state.page = 'landing'
+            show_landing_page()
+finally:
+    rerun_timings = end_rerun(current_page)
+    if rerun_timings:
+        store_rerun_timings(rerun_timings)
@@ -0,0 +1,104 @@
+# Per-user dashboard statistics, maintained on the prediction write path.
+#
+# One user_stats row per user holds everything the dashboard shows: total predictions, a histogram
+# of predicted roles, first and last prediction time and the daily streaks (consecutive UTC days
+# with at least one prediction). save_prediction() in ui.py updates the row in the same
+# transaction as the user_predictions insert, so the dashboard reads one row however long the
+# history grows. When the table is first created it is backfilled from user_predictions.
+
+import json
+import sqlite3
+import datetime
+
+from clock import utcnow
+
+DB_PATH = 'career_predictor.db'
+
+COLUMNS = ('user_id', 'total_predictions', 'role_counts', 'first_prediction_at', 'last_prediction_at',
+           'current_streak', 'longest_streak')
+
+def init_user_stats_table(db_path=DB_PATH):
+    """Create the user_stats table, backfilling it from user_predictions when it is new"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_stats'").fetchone()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS user_stats (
+        user_id INTEGER PRIMARY KEY,
+        total_predictions INTEGER NOT NULL DEFAULT 0,
+        role_counts TEXT NOT NULL DEFAULT '{}',
+        first_prediction_at TIMESTAMP,
+        last_prediction_at TIMESTAMP,
+        current_streak INTEGER NOT NULL DEFAULT 0,
+        longest_streak INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+    if not exists:
+        rebuild_user_stats(cursor)
+
+    conn.commit()
+    conn.close()
+
+def _day(timestamp):
+    return datetime.date.fromisoformat(str(timestamp)[:10])
+
+def _updated(stats, role, created_at):
+    """The stats after one more prediction (stats is None for a user without any)"""
+    if stats is None:
+        return {'total_predictions': 1, 'role_counts': {role: 1}, 'first_prediction_at': created_at,
+                'last_prediction_at': created_at, 'current_streak': 1, 'longest_streak': 1}
+    stats = dict(stats, role_counts=dict(stats['role_counts']))
+    stats['role_counts'][role] = stats['role_counts'].get(role, 0) + 1
+    stats['total_predictions'] += 1
+    gap = (_day(created_at) - _day(stats['last_prediction_at'])).days
+    if gap == 1:
+        stats['current_streak'] += 1
+    elif gap > 1:
+        stats['current_streak'] = 1
+    stats['longest_streak'] = max(stats['longest_streak'], stats['current_streak'])
+    stats['last_prediction_at'] = max(stats['last_prediction_at'], created_at)
+    return stats
+
+def _read(cursor, user_id):
+    row = cursor.execute(f"SELECT {', '.join(COLUMNS[1:])} FROM user_stats WHERE user_id = ?", (user_id,)).fetchone()
+    if row is None:
+        return None
+    stats = dict(zip(COLUMNS[1:], row))
+    stats['role_counts'] = json.loads(stats['role_counts'])
+    return stats
+
+def _write(cursor, user_id, stats):
+    values = [user_id] + [json.dumps(stats['role_counts']) if c == 'role_counts' else stats[c] for c in COLUMNS[1:]]
+    cursor.execute(f"INSERT OR REPLACE INTO user_stats ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})",
+                   values)
+
+def record_prediction(cursor, user_id, role, created_at):
+    """Fold one new prediction into the user's stats row; call inside the transaction that inserts it"""
+    _write(cursor, user_id, _updated(_read(cursor, user_id), role, created_at))
+
+def rebuild_user_stats(cursor):
+    """Recompute every user's stats from the full prediction history"""
+    cursor.execute('DELETE FROM user_stats')
+    history = cursor.execute('''
+        SELECT user_id, prediction_result, created_at FROM user_predictions
+        WHERE user_id IS NOT NULL ORDER BY user_id, created_at, id
+    ''').fetchall()
+    stats = {}
+    for user_id, role, created_at in history:
+        stats[user_id] = _updated(stats.get(user_id), role, str(created_at))
+    for user_id, user_stats in stats.items():
+        _write(cursor, user_id, user_stats)
+
+def load_user_stats(conn, user_id, today=None):
+    """The user's stats row, with the current streak at 0 once a whole day has passed without predictions"""
+    stats = _read(conn.cursor(), user_id)
+    if stats is None:
+        return {'total_predictions': 0, 'role_counts': {}, 'first_prediction_at': None,
+                'last_prediction_at': None, 'current_streak': 0, 'longest_streak': 0}
+    today = today or utcnow().date()
+    if (today - _day(stats['last_prediction_at'])).days > 1:
+        stats['current_streak'] = 0
+    return stats